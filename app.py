@@ -4,17 +4,76 @@
 # ==============================================
 
 import os
-import re
 import json
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
 
+from cpenn import logs
+from cpenn.background import PRIORITY_SHEETS, LoadTicket, background_loader
+from cpenn.cache import cache_stats, clear_sheet_cache
+from cpenn.catalog import slate_catalog
+from cpenn.columns import all_columns, materialize, missing_columns
+from cpenn.charts import (
+    cached_figure,
+    figure_cache,
+    is_mlb_context,
+    is_nascar_context,
+    is_nfl_projections_context,
+    is_stacks_context,
+    mask_digest,
+    mlb_bat_order_vs_proj,
+    mlb_salary_vs_kproj,
+    mlb_teamimp_vs_proj,
+    nascar_opt_vs_own,
+    pick_column,
+    nascar_qual_vs_proj,
+    nascar_salary_vs_proj,
+    nfl_pos_box,
+    nfl_position_summary,
+    nfl_proj_vs_own,
+    nfl_salary_vs_proj,
+    nfl_val_vs_proj,
+    stacks_opt_vs_own,
+    stacks_total_hist,
+    stacks_total_vs_imptot,
+    stacks_total_vs_salary,
+)
+from cpenn.display import (
+    EXPORT_FORMATS,
+    PAGE_MODE_MIN_ROWS,
+    PAGE_SIZES,
+    column_specs,
+    display_frame,
+    export_cache,
+    lazy_export,
+    sorted_positions,
+)
+from cpenn.loading import ingest_parallel
+from cpenn.registry import dataset_registry
+from cpenn.schema import (
+    DESIRED_MLB_BATTERS,
+    DESIRED_MLB_PITCHERS,
+    DESIRED_MLB_STACKS,
+    DESIRED_NASCAR_BETTING,
+    DESIRED_NASCAR_PROJECTIONS,
+    compact_frame,
+    frame_nbytes,
+    numeric_col,
+)
+from cpenn.search import NameIndex, filter_engine, name_column
+from cpenn.trace import Trace, span, tracing, waterfall_rows
+from cpenn.watch import slate_watcher
+
+# Slate frames are shared read-only across sessions; derived frames must never write through
+try:
+    pd.set_option("mode.copy_on_write", True)
+except Exception:
+    pass
+
 # ----------------------------
 # STREAMLIT PAGE CONFIGURATION
 # ----------------------------
@@ -92,6 +151,30 @@ DEFAULT_SPORTS = {
     ],
 }
 
+# Folders scanned for more slates; every matching workbook is listed after the defaults above
+SLATE_DIRS = {
+    "NFL": [r"C:\Users\cpenn\Dropbox\Sports Models\NFL\*.xlsm"],
+    "NASCAR": [r"C:\Users\cpenn\Dropbox\Sports Models\2025 NASCAR\*.xlsm"],
+    "MLB": [r"C:\Users\cpenn\Dropbox\Sports Models\MLB\*.xlsm"],
+}
+
+def _slates(sport: str) -> List[dict]:
+    """
+    Every cataloged slate of a sport as a load job, defaults first (with their
+    labels and sheets), then the newest files. Comes from the catalog index;
+    no workbook is opened.
+    """
+    pinned = {os.path.abspath(item["path"]): (i, item) for i, item in enumerate(DEFAULT_SPORTS.get(sport, []))}
+    patterns = [item["path"] for item in DEFAULT_SPORTS.get(sport, [])] + SLATE_DIRS.get(sport, [])
+    sheets = list(dict.fromkeys(s for item in DEFAULT_SPORTS.get(sport, []) for s in item.get("sheets", [])))
+    entries = sorted(slate_catalog().slates(sport, patterns), key=lambda e: pinned.get(e["path"], (len(pinned),))[0])
+    jobs = []
+    for entry in entries:
+        item = pinned.get(entry["path"], (None, {}))[1]
+        jobs.append({"label": item.get("label", entry["label"]), "source": entry["path"],
+                     "sheets": item.get("sheets", sheets), "entry": entry})
+    return jobs
+
 # ----------------------------
 # UI logging (silencable)
 # ----------------------------
@@ -101,205 +184,26 @@ def ui_log(msg: str, level: str = "info"):
         return
     getattr(st, level, st.info)(msg)
 
-# ----------------------------
-# NASCAR TARGET COLUMN WHITELISTS
-# ----------------------------
-DESIRED_NASCAR_PROJECTIONS = [
-    "Driver",
-    "Qual",
-    "DK Sal", "FD Sal",
-    "DK Proj", "DK Val", "FD Proj", "FD Val",
-    "Proj Fin",
-    "pLL", "pFL",
-    "DK PP", "DK Dom", "FD PP", "FD Dom",
-    "DK Floor", "DK Ceiling", "FD Floor", "FD Ceiling",
-    "DK pOWN%", "FD pOWN%",
-    "DK Opt%", "FD Opt%",
-    "DK Lev%", "FD Lev%",
-    "DK Rtg", "FD Rtg"
-]
-DESIRED_NASCAR_BETTING = [
-    "Driver", "Proj Fin", "Win%", "T3%", "T5%", "T10%", "Win", "T3", "T5", "T10"
-]
-
-# ----------------------------
-# MLB TARGET COLUMN WHITELISTS (UPDATED to your headers)
-# ----------------------------
-DESIRED_MLB_PITCHERS = [
-    "V", "H", "Player", "DK Sal", "FD Sal", "Team", "Opp",
-    "IP", "ER", "K", "H", "BB", "HR", "W",
-    "DK Proj", "DK Val", "DK pOWN",
-    "FD Proj", "FD Val", "FD pOWN",
-    "DK F", "DK C", "FD F", "FD C",
-    "DK Rtg", "FD Rtg",
-]
-
-DESIRED_MLB_BATTERS = [
-    "BO", "H", "Pos", "V", "Player", "DK Sal", "FD Sal", "Team", "Opp",
-    "AB", "H", "1B", "2B", "3B", "HR", "RBI", "R", "SB", "BB", "K",
-    "DK Proj", "DK Val", "DK pOWN",
-    "FD Proj", "FD Val", "FD pOWN",
-    "DK F", "DK C", "FD F", "FD C",
-    "DK Rtg", "FD Rtg",
-]
-
-# Stacks sheet (kept flexible but aligned to your short labels)
-DESIRED_MLB_STACKS = [
-    "Team", "DK Sal", "FD Sal", "Total", "Park", "Opp", "Opp Pitcher", "H",
-    "DK Proj", "Val", "Own%", "Tstack%", "vStack%", "Lev%",
-    "FD Proj", "FD Val", "FD Own%", "FD Tstack%", "FD vStack%", "FD Lev%",
-]
-
-# ----------------------------
-# HEADER / ALIAS HANDLING
-# ----------------------------
-def _norm(s: str) -> str:
-    return re.sub(r"[^a-z0-9]+", "", str(s).lower())
-
-_NASCAR_ALIAS = {
-    "Driver":      ["Driver","driver","Player Name","Player","Name"],
-    "Qual":        ["Qual","Start Pos","Start","Starting","Qualifying"],
-    "Proj Fin":    ["Proj Fin","ProjFinish","Proj Finish","Projected Finish","ProjFinish."],
-    "pLL":         ["pLL","LL","Place Laps Led","Prob LL"],
-    "pFL":         ["pFL","FL","Fast Laps Prob"],
-    "DK Sal":      ["DK Sal","DK Salary","DraftKings Salary"],
-    "DK Proj":     ["DK Proj","DK Proj.","DK Projection","DK Pro"],
-    "DK Val":      ["DK Val","DK Value"],
-    "DK pOWN%":    ["DK pOWN%","DK Own%","DK Ownership%","DK Ownership","pOWN% (DK)"],
-    "DK Opt%":     ["DK Opt%","DK Optimal%","DK Optimal"],
-    "DK Lev%":     ["DK Lev%","DK Leverage%","DK Leverage"],
-    "DK Rtg":      ["DK Rtg","DK RTG","DraftKings Rating"],
-    "DK PP":       ["DK PP","DK Pts/P$","DK Points per $"],
-    "DK Dom":      ["DK Dom","DK Dominator"],
-    "DK Floor":    ["DK Floor"],
-    "DK Ceiling":  ["DK Ceiling","DK Ceil"],
-    "FD Sal":      ["FD Sal","FD Salary","FanDuel Salary"],
-    "FD Proj":     ["FD Proj","FD Proj.","FD Projection","FD Pro"],
-    "FD Val":      ["FD Val","FD Value"],
-    "FD pOWN%":    ["FD pOWN%","FD Own%","FD Ownership%","FD Ownership","pOWN% (FD)"],
-    "FD Opt%":     ["FD Opt%","FD Optimal%","FD Optimal"],
-    "FD Lev%":     ["FD Lev%","FD Leverage%","FD Leverage"],
-    "FD Rtg":      ["FD Rtg","FD RTG","FanDuel Rating"],
-    "FD PP":       ["FD PP","FD Pts/P$","FD Points per $"],
-    "FD Dom":      ["FD Dom","FD Dominator"],
-    "FD Floor":    ["FD Floor"],
-    "FD Ceiling":  ["FD Ceiling","FD Ceil","FD Ceilig"],
-    "Win%":        ["Win%","Win %","Prob Win","P(Win)","Race Win %"],
-    "T3%":         ["T3%","Top 3 %","Prob T3","P(Top 3)","Top3%"],
-    "T5%":         ["T5%","Top 5 %","Prob T5","P(Top 5)","Top5%"],
-    "T10%":        ["T10%","Top 10 %","Prob T10","P(Top 10)","Top10%"],
-    "Win":         ["Win","Winner Odds","Race Winner","Best Win Odds","Win ML","Win Price"],
-    "T3":          ["T3","Top 3","Top 3 Odds","Best Top 3 Odds"],
-    "T5":          ["T5","Top 5","Top 5 Odds","Best Top 5 Odds"],
-    "T10":         ["T10","Top 10","Top 10 Odds","Best Top 10 Odds"],
-}
-
-# ----------------------------
-# MLB HEADER / ALIAS HANDLING (UPDATED)
-# ----------------------------
-_MLB_ALIAS = {
-    # Canonical short display labels (left) ← acceptable variants (right)
-
-    # Shared / identity
-    "Player": ["Player", "player", "Player Name", "Name"],
-    "Pos": ["Pos", "Position"],
-    "Team": ["Team", "Tm"],
-    "Opp": ["Opp", "Opponent"],
-    "BO": ["BO", "Bat Order", "Order"],
-    "H": ["H"],  # heat/conditional helper or Hits (handled by position of column)
-
-    # Implied total (column is literally 'V' in your files)
-    "V": ["V", "Imp Tot", "Imp. Tot", "Implied Total", "Team Imp. Tot", "Team Total", "Vegas Team Total", "TTTL", "IR"],
-
-    # Salaries
-    "DK Sal": ["DK Sal", "DK Salary", "DraftKings Salary", "DK Price", "DK$"],
-    "FD Sal": ["FD Sal", "FD Salary", "FanDuel Salary", "FD Price", "FD$"],
-
-    # Projections / Values
-    "DK Proj": ["DK Proj", "DK Projection", "DK Proj.", "DK Points"],
-    "FD Proj": ["FD Proj", "FD Projection", "FD Proj.", "FD Points"],
-    "DK Val":  ["DK Val", "DK Value", "Value (DK)"],
-    "FD Val":  ["FD Val", "FD Value", "Value (FD)"],
-
-    # Ownership (no % in your short labels)
-    "DK pOWN": ["DK pOWN", "DK pOWN%", "DK Own%", "DK Ownership%", "Ownership% (DK)", "pOWN% (DK)"],
-    "FD pOWN": ["FD pOWN", "FD pOWN%", "FD Own%", "FD Ownership%", "Ownership% (FD)", "pOWN% (FD)"],
-
-    # Floors/Ceilings (short)
-    "DK F": ["DK F", "DK Floor"],
-    "DK C": ["DK C", "DK Ceiling", "DK Ceil"],
-    "FD F": ["FD F", "FD Floor"],
-    "FD C": ["FD C", "FD Ceiling", "FD Ceil"],
-
-    # Ratings
-    "DK Rtg": ["DK Rtg", "DK RTG", "DraftKings Rating"],
-    "FD Rtg": ["FD Rtg", "FD RTG", "FanDuel Rating"],
-
-    # Pitcher detailed stats
-    "IP": ["IP", "IP Proj", "Innings Proj", "Projected IP"],
-    "ER": ["ER"],
-    "K":  ["K", "K Proj", "K Projection", "Proj K", "Ks Proj"],
-    "BB": ["BB"],
-    "HR": ["HR", "HR/9"],  # if you carry HR/9 separately, it’ll just be ignored here
-    "W":  ["W", "Win%", "P(Win)", "Win Prob"],
-
-    # Batter counting stats
-    "AB": ["AB"], "1B": ["1B"], "2B": ["2B"], "3B": ["3B"],
-    "RBI": ["RBI"], "R": ["R"], "SB": ["SB"],
-}
-
-def _apply_aliases(df: pd.DataFrame, alias_map: Dict[str, List[str]]) -> pd.DataFrame:
-    if df is None or df.empty:
-        return df
-    inv = {}
-    for canon, alist in alias_map.items():
-        for a in alist:
-            inv[_norm(a)] = canon
-    ren = {}
-    for c in df.columns:
-        cn = _norm(c)
-        if cn in inv:
-            ren[c] = inv[cn]
-    if ren:
-        df = df.rename(columns=ren)
-    return df
+# cpenn package messages land in the page, gated by the same switch
+logs.set_log_sink(ui_log)
 
-# ----------------------------
-# GENERIC CLEANUP CONSTANTS
-# ----------------------------
-NUMERIC_KEYS = {
-    "DK Sal", "FD Sal", "DK Proj", "FD Proj", "DK Val", "FD Val",
-    "DK pOWN%", "FD pOWN%", "DK Opt%", "FD Opt%", "DK Lev%", "FD Lev%",
-    "DK Rtg", "FD Rtg", "DK Pro", "FD Pro",
-    "Comp%", "Pa Yards", "Pa Attempts", "Pa Comp", "Pa TD", "Int",
-    "Ru Attempts", "Ru Yards", "Ru TD", "Rec", "Rec Yards", "Rec TD",
-    "DK%", "FD%",
-    "Qual", "Start Pos", "Proj Finish", "Proj Fin", "pLL", "Fast Laps", "PD",
-    "DK PP", "FD PP", "DK Dom", "FD Dom", "DK Floor", "DK Ceiling", "FD Floor", "FD Ceilig",
-}
+def _session_id() -> str:
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx()
+        return ctx.session_id if ctx else "local"
+    except Exception:
+        return "local"
 
-EXCLUDE_PATTERNS = [
-    re.compile(r"^unnamed", re.I),
-    re.compile(r"opto import$", re.I),
-    re.compile(r"^_?\d+(?:\.\d+)?$"),
-]
+def column_config(specs: Dict[str, dict]) -> dict:
+    """st.column_config objects from the package's UI-agnostic number-column specs."""
+    return {col: st.column_config.NumberColumn(col, **spec) for col, spec in specs.items()}
 
-POSITION_COLORS = {
-    "QB": "#FF6B6B",
-    "RB": "#4ECDC4",
-    "WR": "#45B7D1",
-    "TE": "#96CEB4",
-    "K": "#FFEAA7",
-    "DST": "#DDA0DD",
-}
+def build_column_config(df: pd.DataFrame) -> dict:
+    return column_config(column_specs(df))
 
 PRESET_FILE = Path(__file__).with_name("column_presets.json")
 
-# ----------------------------
-# MLB rate stats that need 3-dec display (NEW)
-# ----------------------------
-MLB_THREE_DEC_STATS = {"ba", "avg", "obp", "slg", "ops", "woba", "xwoba"}
-
 # ----------------------------
 # PRESET HELPERS
 # ----------------------------
@@ -317,1001 +221,18 @@ def _save_preset_store(store: Dict[str, Dict[str, List[str]]]) -> None:
     except Exception:
         pass
 
-# ----------------------------
-# GENERIC COLUMN STANDARDIZATION (NFL/general)
-# ----------------------------
-def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
-    renames: Dict[str, str] = {}
-    cols_lower = {c: str(c).strip().lower() for c in df.columns}
-    for c, lc in cols_lower.items():
-        if lc in ("player", "name", "playername", "player name"):
-            renames[c] = "Player Name"
-        elif lc in ("position", "pos."):
-            renames[c] = "Pos"
-        elif lc in ("opponent", "opp."):
-            renames[c] = "Opp"
-        elif lc == "teamname":
-            renames[c] = "Team"
-    if renames:
-        df = df.rename(columns=renames)
-    return df
-
-def clean_columns(df: pd.DataFrame) -> pd.DataFrame:
-    if df.empty:
-        return df
-    keep = [c for c in df.columns if not any(rx.search(str(c)) for rx in EXCLUDE_PATTERNS)]
-    df = df[keep].copy()
-    df.columns = [str(c).strip() for c in df.columns]
-    df = standardize_columns(df)
-    for col in df.columns:
-        if col in NUMERIC_KEYS:
-            try:
-                series = df[col].astype(str).str.replace(r"[%$,]", "", regex=True)
-                df[col] = pd.to_numeric(series, errors="coerce")
-            except Exception:
-                pass
-    empty_cols = [c for c in df.columns if df[c].isna().all() or (df[c].astype(str).str.strip() == "").all()]
-    if empty_cols:
-        df = df.drop(columns=empty_cols)
-    return df
-
-# ----------------------------
-# FAST NASCAR SHEET READER
-# ----------------------------
-@st.cache_data(show_spinner=False, ttl=60)
-def _fast_read_nascar_sheet(path_or_file, sheet_name: str,
-                            desired_columns: List[str]) -> Optional[pd.DataFrame]:
-    try:
-        from openpyxl import load_workbook
-        wb = load_workbook(path_or_file, read_only=True, data_only=True)
-        if sheet_name not in wb.sheetnames:
-            return None
-        ws = wb[sheet_name]
-
-        header_row_ix, header_vals = None, None
-        for r_idx, row in enumerate(ws.iter_rows(min_row=1, max_row=10, values_only=True), start=1):
-            if not row or not any(row):
-                continue
-            lows = {_norm(str(v)) for v in row if v is not None}
-            hints = {"driver","playername","player","projfin","projfinish","win","t3","t5","t10","odds","qual","start","dk","fd"}
-            if any(h in "".join(lows) for h in hints):
-                header_row_ix, header_vals = r_idx, list(row)
-                break
-        if header_row_ix is None or not header_vals:
-            for r_idx, row in enumerate(ws.iter_rows(min_row=1, max_row=5, values_only=True), start=1):
-                if row and any(v is not None for v in row):
-                    header_row_ix, header_vals = r_idx, list(row)
-                    break
-        if header_row_ix is None or not header_vals:
-            return None
-
-        actual_map = {str(v).strip(): i for i, v in enumerate(header_vals) if v is not None and str(v).strip()}
-        desired_to_actual, indices = {}, []
-        for canonical in desired_columns:
-            alias_list = _NASCAR_ALIAS.get(canonical, [canonical])
-            want_norms = {_norm(a) for a in alias_list}
-            for actual, idx in actual_map.items():
-                if _norm(actual) in want_norms:
-                    desired_to_actual[canonical] = actual
-                    indices.append(idx)
-                    break
-
-        if not indices:
-            return None
-
-        df = pd.read_excel(
-            path_or_file,
-            sheet_name=sheet_name,
-            engine="openpyxl",
-            header=header_row_ix - 1,
-            usecols=sorted(set(indices)),
-        )
-
-        df = df.rename(columns={v: k for k, v in desired_to_actual.items()})
-
-        if "Driver" not in df.columns:
-            for cand in ["Player Name", "Player", "Name"]:
-                if cand in df.columns:
-                    df = df.rename(columns={cand: "Driver"})
-                    break
-
-        # de-dupe headers
-        df.columns = pd.Index([f"{col}_{i}" if list(df.columns).count(col) > 1 and list(df.columns)[:i].count(col) > 0 else col 
-                              for i, col in enumerate(df.columns)])
-
-        safe_columns = []
-        for col in desired_columns:
-            if col in df.columns:
-                safe_columns.append(col)
-            else:
-                safe_columns.append(col)
-        df = df.reindex(columns=safe_columns)
-
-        for c in df.columns:
-            if c == "Driver":
-                continue
-            df[c] = pd.to_numeric(
-                pd.Series(df[c]).astype(str).str.replace(r"[%$,]", "", regex=True),
-                errors="coerce"
-            )
-
-        if "Qual" in df.columns and "Proj Fin" in df.columns and "PD" not in df.columns:
-            try:
-                df["PD"] = pd.to_numeric(df["Qual"], errors="coerce") - pd.to_numeric(df["Proj Fin"], errors="coerce")
-            except Exception:
-                pass
-
-        return df
-    except Exception as e:
-        ui_log(f"Error reading NASCAR sheet {sheet_name}: {str(e)}", "error")
-        return None
-
-# ----------------------------
-# SHEET RESOLUTION / RAW READERS
-# ----------------------------
-def resolve_allowed_sheets(path_or_file, desired: Optional[List[str]]) -> List[str]:
-    try:
-        xls = pd.ExcelFile(path_or_file, engine="openpyxl")
-        actual = xls.sheet_names
-        if desired is None:
-            return actual
-        if isinstance(desired, str):
-            desired_list = [desired]
-        elif hasattr(desired, "tolist"):
-            desired_list = list(desired.tolist())
-        elif isinstance(desired, (list, tuple, set)):
-            desired_list = list(desired)
-        else:
-            desired_list = [str(desired)]
-        if len(desired_list) == 0:
-            return actual
-        matched = []
-        desired_lower = [str(s).strip().lower() for s in desired_list]
-        actual_lower_map = {s.strip().lower(): s for s in actual}
-        for d_lower in desired_lower:
-            if d_lower in actual_lower_map:
-                matched.append(actual_lower_map[d_lower])
-        if not matched:
-            for d_lower in desired_lower:
-                for actual_sheet in actual:
-                    if d_lower in actual_sheet.strip().lower() or actual_sheet.strip().lower() in d_lower:
-                        if actual_sheet not in matched:
-                            matched.append(actual_sheet)
-        if not matched:
-            matched = actual
-        return matched
-    except Exception as e:
-        ui_log(f"Error resolving sheets: {str(e)}", "error")
-        return []
-
-def _read_excel_raw(path_or_file, sheet_names: List[str], header) -> Dict[str, pd.DataFrame]:
-    try:
-        data = pd.read_excel(path_or_file, sheet_name=sheet_names, engine="openpyxl", header=header)
-        if isinstance(data, pd.DataFrame):
-            data = {sheet_names[0]: data}
-        return data
-    except Exception as e:
-        ui_log(f"Error reading Excel sheets: {str(e)}", "error")
-        return {}
-
-# ----------------------------
-# NASCAR CLEANER (FALLBACK)
-# ----------------------------
-def clean_columns_nascar(df: pd.DataFrame, sheet_name: str) -> pd.DataFrame:
-    if df is None or df.empty:
-        return pd.DataFrame()
-    try:
-        df = pd.DataFrame(df)
-
-        def score_header(row_vals: List[str]) -> int:
-            try:
-                vals = [str(x).strip() for x in row_vals if pd.notna(x)]
-                if not vals:
-                    return -1
-                s = 0
-                low = [v.lower() for v in vals]
-                if any(v == "driver" for v in low): s += 5
-                if any(("dk" in v) and ("sal" in v or "pro" in v or "proj" in v) for v in low): s += 3
-                if any(("fd" in v) and ("sal" in v or "pro" in v or "proj" in v) for v in low): s += 3
-                if any(("qual" in v) or ("start" in v) for v in low): s += 2
-                s -= sum(v.startswith("unnamed") for v in low)
-                s += sum(v and not v.startswith("unnamed") for v in low)//2
-                return s
-            except:
-                return -1
-
-        best_idx, best_score = None, -10
-        max_scan = min(8, len(df))
-        for i in range(max_scan):
-            try:
-                row_data = df.iloc[i].tolist()
-                sc = score_header(row_data)
-                if sc > best_score:
-                    best_idx, best_score = i, sc
-            except:
-                continue
-
-        if best_idx is None or best_score < 1:
-            best_idx, best_fill = 0, -1
-            for i in range(max_scan):
-                try:
-                    vals = [str(x).strip() for x in df.iloc[i].tolist() if pd.notna(x)]
-                    fill = sum(v and not v.lower().startswith("unnamed") for v in vals)
-                    if fill > best_fill:
-                        best_idx, best_fill = i, fill
-                except:
-                    continue
-
-        try:
-            header_vals = [str(x).strip() for x in df.iloc[best_idx].tolist()]
-            df = df.iloc[best_idx + 1:].copy()
-            df.columns = header_vals
-        except Exception:
-            return pd.DataFrame()
-
-        valid_columns = [c for c in df.columns if c and not str(c).lower().startswith("unnamed") and str(c).strip()]
-        if not valid_columns:
-            return pd.DataFrame()
-        df = df.loc[:, valid_columns]
-
-        renames = {
-            "Qual": "Start Pos",
-            "qual": "Start Pos",
-            "Start": "Start Pos",
-            "DK Pro": "DK Proj",
-            "FD Pro": "FD Proj",
-            "DK Proj.": "DK Proj",
-            "FD Proj.": "FD Proj",
-            "Proj Finish": "Proj Fin",
-            "ProjFin": "Proj Fin",
-            "LL": "pLL",
-            "DK Salary": "DK Sal",
-            "FD Salary": "FD Sal",
-        }
-        df = df.rename(columns={c: renames.get(c, c) for c in df.columns})
-
-        if "Driver" not in df.columns:
-            for cand in ["Player Name", "Player", "Name"]:
-                if cand in df.columns:
-                    df = df.rename(columns={cand: "Driver"})
-                    break
-
-        keep = [c for c in df.columns if not any(rx.search(str(c)) for rx in EXCLUDE_PATTERNS)]
-        df = df[keep].copy()
-        df.columns = [str(c).strip() for c in df.columns]
-
-        new_columns, seen = [], {}
-        for col in df.columns:
-            if col in seen:
-                seen[col] += 1
-                new_columns.append(f"{col}_{seen[col]}")
-            else:
-                seen[col] = 0
-                new_columns.append(col)
-        df.columns = new_columns
-
-        for col in df.columns:
-            try:
-                cl = col.lower()
-                if col in NUMERIC_KEYS or any(k in cl for k in ["proj", "sal", "own", "val", "finish", "laps"]):
-                    series_data = df[col].astype(str).str.replace(r"[%$,]", "", regex=True)
-                    series_data = series_data.replace(['', 'nan', 'None'], np.nan)
-                    df[col] = pd.to_numeric(series_data, errors="coerce")
-            except Exception:
-                continue
-
-        return df
-    except Exception as e:
-        ui_log(f"Error cleaning NASCAR columns: {str(e)}", "error")
-        return pd.DataFrame()
-    
-def _mlb_find_header_row(df: pd.DataFrame) -> int:
-    """
-    Scan the first ~8 rows and pick the row that looks like the real MLB header.
-    Targets short labels like V, BO, Player, DK Sal, FD Sal, Team, Opp, DK Proj, FD Proj, DK F, DK C, etc.
-    Returns 0-based row index to use as header.
-    """
-    if df is None or df.empty:
-        return 0
-
-    target_tokens = {
-        "v","bo","player","pos","dk sal","fd sal","team","opp",
-        "dk proj","fd proj","dk val","fd val","dk pown","fd pown",
-        "dk f","dk c","fd f","fd c","dk rtg","fd rtg",
-        # pitchers/batters
-        "ip","er","k","bb","hr","w","ab","1b","2b","3b","rbi","r","sb","h"
-    }
-
-    def score(row_vals):
-        vals = [str(x).strip().lower() for x in row_vals if str(x).strip()]
-        if not vals: 
-            return -10
-        s = 0
-        for v in vals:
-            if v in target_tokens: s += 3
-            if "dk" in v or "fd" in v: s += 1
-            if v.startswith("unnamed"): s -= 2
-        return s
-
-    best_idx, best_score = 0, -10
-    scan = min(8, len(df))
-    for i in range(scan):
-        sc = score(df.iloc[i].tolist())
-        if sc > best_score:
-            best_idx, best_score = i, sc
-    return best_idx
-
-
-# ----------------------------
-# DATA LOADING (CACHED)
-# ----------------------------
-@st.cache_data(show_spinner=False, ttl=60)
-def load_data_for_sport(sport: str, path_or_file, only_sheets: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
-    try:
-        name = getattr(path_or_file, "name", str(path_or_file))
-        ext = os.path.splitext(name)[1].lower()
-
-        if ext == ".csv" or ext == "":
-            df = pd.read_csv(path_or_file)
-            return {"Data": clean_columns(df)}
-
-        sheet_names = resolve_allowed_sheets(path_or_file, only_sheets)
-        if not sheet_names:
-            ui_log(f"No sheets found in {name}", "warning")
-            return {}
-
-        ui_log(f"Found sheets: {sheet_names}", "info")
-        out: Dict[str, pd.DataFrame] = {}
-
-        if sport == "NASCAR":
-            for sheet in sheet_names:
-                ui_log(f"Processing sheet: {sheet}", "info")
-                s = sheet.strip().lower()
-                fast_df = None
-                try:
-                    if "betting" in s or "dashboard" in s:
-                        fast_df = _fast_read_nascar_sheet(path_or_file, sheet, DESIRED_NASCAR_BETTING)
-                    elif "proj" in s:
-                        fast_df = _fast_read_nascar_sheet(path_or_file, sheet, DESIRED_NASCAR_PROJECTIONS)
-                except Exception as e:
-                    ui_log(f"Fast read failed for {sheet}: {str(e)}", "warning")
-
-                if fast_df is not None and not fast_df.empty:
-                    out[sheet] = fast_df
-                    ui_log(f"Successfully loaded {sheet} using fast reader", "success")
-                    continue
-
-                try:
-                    raw = _read_excel_raw(path_or_file, [sheet], header=None)
-                    if not raw or sheet not in raw:
-                        ui_log(f"Could not read raw data for sheet: {sheet}", "warning")
-                        continue
-                    cleaned = clean_columns_nascar(raw[sheet], sheet)
-
-                    if "betting" in s or "dashboard" in s:
-                        if "Driver" not in cleaned.columns:
-                            for cand in ["Player Name", "Player", "Name"]:
-                                if cand in cleaned.columns:
-                                    cleaned = cleaned.rename(columns={cand: "Driver"})
-                                    break
-                        cleaned = cleaned.rename(columns={"Proj Finish": "Proj Fin", "ProjFin": "Proj Fin"})
-                        available_betting_cols = [col for col in DESIRED_NASCAR_BETTING if col in cleaned.columns]
-                        cleaned = cleaned.reindex(columns=available_betting_cols)
-
-                    elif "proj" in s:
-                        if "Driver" not in cleaned.columns:
-                            for cand in ["Player Name", "Player", "Name"]:
-                                if cand in cleaned.columns:
-                                    cleaned = cleaned.rename(columns={cand: "Driver"})
-                                    break
-                        cleaned = cleaned.rename(columns={"Proj Finish": "Proj Fin", "ProjFin": "Proj Fin"})
-                        available_proj_cols = [col for col in DESIRED_NASCAR_PROJECTIONS if col in cleaned.columns]
-                        cleaned = cleaned.reindex(columns=available_proj_cols)
-
-                    if not cleaned.empty:
-                        out[sheet] = cleaned
-                        ui_log(f"Successfully loaded {sheet} using fallback method", "success")
-                    else:
-                        ui_log(f"Sheet {sheet} resulted in empty DataFrame", "warning")
-                except Exception as e:
-                    ui_log(f"Failed to process sheet {sheet}: {str(e)}", "error")
-            return out
-
-            # ----------------------------
-            # MLB loader (NEW)
-            # ----------------------------
-            if sport == "MLB":
-                # Your real headers are on Excel row 2 → header=1 (0-indexed)
-                raw = _read_excel_raw(path_or_file, sheet_names, header=1)
-                out = {}
-                for sheet, raw_df in raw.items():
-                    dfc = clean_columns(raw_df)
-                    dfc = _apply_aliases(dfc, _MLB_ALIAS)
-
-                    s = sheet.strip().lower()
-
-                    if "pitch" in s:
-                        desired = [c for c in DESIRED_MLB_PITCHERS if c in dfc.columns]
-                        if desired:
-                            dfc = dfc.reindex(columns=desired)
-
-                    elif "batter" in s or "hit" in s:
-                        desired = [c for c in DESIRED_MLB_BATTERS if c in dfc.columns]
-                        if desired:
-                            dfc = dfc.reindex(columns=desired)
-
-                    elif "stack" in s:
-                        desired = [c for c in DESIRED_MLB_STACKS if c in dfc.columns]
-                        if desired:
-                            dfc = dfc.reindex(columns=desired)
-
-                    out[sheet] = dfc
-                return out
-
-
-        # Fallback: NFL/general
-        raw = _read_excel_raw(path_or_file, sheet_names, header=0)
-        for sheet, raw_df in raw.items():
-            out[sheet] = clean_columns(raw_df)
-        return out
-
-    except Exception as e:
-        ui_log(f"Error loading data: {str(e)}", "error")
-        return {}
-
-# ----------------------------
-# FORMATTING HELPERS
-# ----------------------------
-def format_currency(x):
-    if pd.isna(x):
-        return ""
-    try:
-        return f"${int(float(x)):,}"
-    except (ValueError, TypeError):
-        return str(x)
-
-def format_percentage(x):
-    if pd.isna(x):
-        return ""
-    try:
-        val = float(x)
-        return f"{val*100:.1f}%" if abs(val) <= 1 else f"{val:.1f}%"
-    except (ValueError, TypeError):
-        return str(x)
-
-def format_number(x):
-    if pd.isna(x):
-        return ""
-    try:
-        val = float(x)
-        return f"{int(val)}" if val == int(val) else f"{val:.1f}"
-    except (ValueError, TypeError):
-        return str(x)
-
-def get_formatters(df: pd.DataFrame):
-    fmt = {}
-    numeric_like = {"o/u", "spread", "imp. tot", "qb", "rb", "wr", "te", "dst", "total"}
-    for col in df.columns:
-        col_lower = col.lower()
-        if col_lower.endswith(" sal"):
-            fmt[col] = format_currency
-            continue
-        if ("%" in col) or any(k in col_lower for k in ["own", "pown", "ownership", "tgt share"]):
-            fmt[col] = format_percentage
-            continue
-        if (
-            col_lower in numeric_like
-            or any(col_lower.endswith(suf) for suf in ("proj", "val", "rtg", "floor", "ceiling", "pp", "dom"))
-            or pd.api.types.is_numeric_dtype(df[col])
-        ):
-            fmt[col] = format_number
-    return fmt
-
-def _round_numeric_for_display(df_in: pd.DataFrame) -> pd.DataFrame:
-    if df_in is None or not isinstance(df_in, pd.DataFrame):
-        return pd.DataFrame()
-    if df_in.empty:
-        return df_in.copy()
-
-    df_out = df_in.copy()
-
-    keep_int = {"Win", "T3", "T5", "T10"}
-    percent_markers = ("%", "own", "pown", "ownership", "tgt share", "opt", "lev")
-    TEXT_NAME_GUARDS = {
-        "driver", "player name", "player", "name",
-        "wr1", "wr2", "wr3", "qb", "rb", "te",
-        "bringback", "bring back", "stack", "stack team",
-        "team", "opp", "wr", "wr1 name", "wr2 name", "wr3 name"
-    }
-
-    for c in df_out.columns:
-        cl = str(c).lower()
-
-        # --- SALARIES: scrub → numeric float → no NaN/∞ → round 0 ---
-        if cl.endswith(" sal") or "salary" in cl or "price" in cl:
-            s = (
-                pd.Series(df_out[c])
-                .astype(str)
-                .str.replace(r"[^\d\.\-]", "", regex=True)   # drop $, commas, spaces
-            )
-            s = pd.to_numeric(s, errors="coerce")            # to float
-            s = s.replace([np.inf, -np.inf], np.nan)         # remove infinities
-            s = s.fillna(0.0).astype("float64").round(0)     # clean float dtype
-            df_out[c] = s
-            continue
-
-        # keep certain columns as ints (Win, T3, T5, T10)
-        if c in keep_int:
-            df_out[c] = pd.to_numeric(df_out[c], errors="coerce").fillna(0).round(0).astype(float)
-            continue
-
-        # PERCENTS: coerce → auto-scale to 0–100 if needed → round 1
-        if any(marker in cl for marker in percent_markers):
-            vals = pd.to_numeric(df_out[c], errors="coerce")
-            if pd.notna(vals).any() and vals.max(skipna=True) <= 1:
-                vals = vals * 100.0
-            df_out[c] = vals.fillna(0).astype(float).round(1)
-            continue
-
-        # Skip obvious text columns
-        if any(token in cl for token in TEXT_NAME_GUARDS):
-            continue
-
-        # Generic numeric rounding (keep float dtype)
-        if pd.api.types.is_numeric_dtype(df_out[c]):
-            df_out[c] = pd.to_numeric(df_out[c], errors="coerce").fillna(0).astype(float).round(1)
-
-    return df_out
-# ----------------------------
-# Streamlit column config helper
-# ----------------------------
-# ----------------------------
-# Streamlit column config helper
-# ----------------------------
-def build_column_config(df: pd.DataFrame) -> dict:
-    import streamlit as st
-    cfg = {}
-
-    def is_money(col: str) -> bool:
-        cl = str(col).lower()
-        # treat any "* Sal" or "* Salary"/"Price" as salary
-        return cl.endswith(" sal") or "salary" in cl or "price" in cl
-
-    def is_percent(col: str) -> bool:
-        cl = str(col).lower()
-        return ("%" in col) or any(k in cl for k in ["own", "pown", "ownership", "opt", "lev", "tgt share"])
-
-    for col in df.columns:
-        try:
-            if is_money(col):
-                # plain integer (no $ or commas)
-                cfg[col] = st.column_config.NumberColumn(
-                    col,
-                    format="%.0f",
-                    step=100.0,   # tweak if you prefer different step size
-                    min_value=0.0
-                )
-            elif is_percent(col) and pd.api.types.is_numeric_dtype(df[col]):
-                cfg[col] = st.column_config.NumberColumn(col, format="%.1f%%")
-            elif pd.api.types.is_numeric_dtype(df[col]):
-                cfg[col] = st.column_config.NumberColumn(col, format="%.1f")
-        except Exception:
-            pass
-    return cfg
-
-def _format_for_display(df_in: pd.DataFrame) -> pd.DataFrame:
-    if df_in is None or not isinstance(df_in, pd.DataFrame):
-        return pd.DataFrame()
-    if df_in.empty:
-        return df_in.copy()
-
-    df = df_in.copy()
-    for col in df.columns:
-        cl = str(col).lower()
-        try:
-            if cl.endswith(" sal") or cl.endswith(" salary") or ("salary" in cl) or ("price" in cl):
-                df[col] = df[col].apply(format_currency)
-            elif ("%" in col) or any(k in cl for k in ["own", "pown", "ownership", "tgt share", "opt%"]):
-                df[col] = df[col].apply(format_percentage)
-            elif any(tok in cl for tok in MLB_THREE_DEC_STATS):
-                df[col] = pd.to_numeric(df[col], errors="coerce").apply(lambda v: "" if pd.isna(v) else f"{v:.3f}")
-            elif pd.api.types.is_numeric_dtype(df[col]):
-                df[col] = df[col].apply(format_number)
-        except Exception:
-            pass
-    return df
-
-# Tiny extra format helpers (used in Position Summary)
-def _fmt_currency0(x):
-    x = pd.to_numeric(x, errors="coerce")
-    return "" if pd.isna(x) else f"{int(round(x))}"
-
-def _fmt_number1(x):
-    x = pd.to_numeric(x, errors="coerce")
-    return "" if pd.isna(x) else f"{x:.1f}"
-
-def _fmt_percent1(x):
-    x = pd.to_numeric(x, errors="coerce")
-    if pd.isna(x): return ""
-    if abs(x) <= 1: x *= 100
-    return f"{x:.1f}%"
-
-# ======================================================
-# CONTEXT + COLUMN HELPERS & CHART BUILDERS
-# ======================================================
-def _lc_set(cols): return {str(c).strip().lower() for c in cols}
-
-def is_nascar_context(sport: str, sheet_name: str, df: pd.DataFrame) -> bool:
-    if sport.upper() == "NASCAR":
-        return True
-    hints = {"driver", "proj fin", "qual", "win%", "t3%", "t5%", "t10%", "dk dom", "fd dom"}
-    return any(h in _lc_set(df.columns) for h in hints)
-
-def is_stacks_context(sheet_name: str, df: pd.DataFrame) -> bool:
-    s = str(sheet_name).strip().lower()
-    if "stack" in s:
-        return True
-    role_cols = {"qb", "wr", "wr1", "wr2", "te", "rb", "bringback", "bring back", "stack", "stack team", "team"}
-    return len(_lc_set(df.columns).intersection(role_cols)) >= 2
-
-def is_nfl_projections_context(sport: str, sheet_name: str, df: pd.DataFrame) -> bool:
-    return (sport.upper() == "NFL") and (not is_stacks_context(sheet_name, df))
-
-# MLB context (NEW)
-def is_mlb_context(sport: str, sheet_name: str, df: pd.DataFrame) -> bool:
-    if sport.upper() == "MLB":
-        return True
-    hints = {"bat order","bats","pitcher hand","k proj","ip proj","xfip","woba","ops","team imp. tot"}
-    cols = _lc_set(df.columns)
-    return any(h in cols for h in hints)
-
-def coalesce(df: pd.DataFrame, *cands: str) -> Optional[str]:
-    cols = list(df.columns)
-    lowers = {str(c).strip().lower(): c for c in cols}
-    for c in cands:
-        lc = c.strip().lower()
-        if lc in lowers:
-            return lowers[lc]
-        for col in cols:
-            if str(col).strip().lower() == lc:
-                return col
-    return None
-
-def exists_all(df: pd.DataFrame, *cols: str) -> bool:
-    present = _lc_set(df.columns)
-    return all(c.strip().lower() in present for c in cols)
-
-# --- Trend helper ---
-def _add_linear_trend(fig: go.Figure, x: pd.Series, y: pd.Series, name: str = "Trend") -> None:
-    try:
-        xv = pd.to_numeric(x, errors="coerce")
-        yv = pd.to_numeric(y, errors="coerce")
-        use = pd.DataFrame({"x": xv, "y": yv}).dropna()
-        if len(use) < 3:
-            return
-        z = np.polyfit(use["x"].values, use["y"].values, 1)
-        p = np.poly1d(z)
-        xs = np.linspace(use["x"].min(), use["x"].max(), 50)
-        fig.add_trace(go.Scatter(x=xs, y=p(xs), mode="lines", name=name, line=dict(dash="dot")))
-    except Exception:
-        pass
-
-# ----------------------------
-# NASCAR CHARTS
-# ----------------------------
-def nascar_salary_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
-    sal = coalesce(df, f"{site} Sal")
-    proj = coalesce(df, f"{site} Proj")
-    if not sal or not proj:
-        return go.Figure()
-    use = df[[sal, proj] + [c for c in ["Driver"] if c in df.columns]].dropna()
-    if use.empty:
-        return go.Figure()
-    fig = px.scatter(
-        use, x=sal, y=proj, hover_name="Driver" if "Driver" in use.columns else None,
-        title=f"NASCAR — {site} Salary vs {site} Projection",
-        labels={sal:"Salary ($)", proj:"Projection"}
-    )
-    _add_linear_trend(fig, use[sal], use[proj])
-    fig.update_layout(height=460)
-    return fig
-
-def nascar_qual_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
-    qual = coalesce(df, "Qual")
-    proj = coalesce(df, f"{site} Proj")
-    if not qual or not proj:
-        return go.Figure()
-    use = df[[qual, proj] + [c for c in ["Driver"] if c in df.columns]].dropna()
-    if use.empty:
-        return go.Figure()
-    fig = px.scatter(
-        use, x=qual, y=proj, hover_name="Driver" if "Driver" in use.columns else None,
-        title=f"NASCAR — Qualifying Position vs {site} Projection",
-        labels={qual:"Qualifying (Start)", proj:"Projection"}
-    )
-    _add_linear_trend(fig, use[qual], use[proj])
-    fig.update_layout(height=460)
-    return fig
-
-def nascar_opt_vs_own(df: pd.DataFrame, site: str) -> go.Figure:
-    opt = coalesce(df, f"{site} Opt%")
-    own = coalesce(df, f"{site} pOWN%")
-    if not opt or not own:
-        return go.Figure()
-    keep = [opt, own] + [c for c in ["Driver", f"{site} Proj"] if c in df.columns]
-    use = df[keep].dropna()
-    if use.empty:
-        return go.Figure()
-    hdata = {own:":.1f", opt:":.1f"}
-    if f"{site} Proj" in use.columns:
-        hdata[f"{site} Proj"] = ":.1f"
-    fig = px.scatter(
-        use, x=own, y=opt, hover_name="Driver" if "Driver" in use.columns else None,
-        hover_data=hdata,
-        title=f"NASCAR — {site} Optimal% vs {site} pOWN%",
-        labels={own:f"{site} pOWN%", opt:f"{site} Optimal%"},
-    )
-    fig.update_layout(height=460)
-    return fig
-
-# ----------------------------
-# NFL PLAYER-LEVEL CHARTS
-# ----------------------------
-def nfl_salary_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
-    sal, proj = coalesce(df, f"{site} Sal"), coalesce(df, f"{site} Proj")
-    if not sal or not proj: return go.Figure()
-    extras = [c for c in ["Pos", "Player Name", "Team", "Opp"] if c in df.columns]
-    use = df[[sal, proj] + extras].dropna()
-    if use.empty: return go.Figure()
-    fig = px.scatter(
-        use, x=sal, y=proj, color="Pos" if "Pos" in use.columns else None,
-        hover_name="Player Name" if "Player Name" in use.columns else None,
-        title=f"NFL — {site} Salary vs Projection",
-        labels={sal:"Salary ($)", proj:"Projection"},
-        color_discrete_map=POSITION_COLORS if "Pos" in use.columns else None
-    )
-    _add_linear_trend(fig, use[sal], use[proj])
-    fig.update_layout(height=460, showlegend="Pos" in use.columns)
-    return fig
-
-def nfl_proj_vs_own(df: pd.DataFrame, site: str) -> go.Figure:
-    proj, own = coalesce(df, f"{site} Proj"), coalesce(df, f"{site} pOWN%")
-    val = coalesce(df, f"{site} Val")
-    if not proj or not own: return go.Figure()
-    keep = [proj, own] + [c for c in ["Pos", "Player Name", "Team", val] if c]
-    use = df[keep].dropna()
-    if use.empty: return go.Figure()
-    size = (use[val] if val else pd.Series([8]*len(use))).abs().clip(1, None)
-    fig = px.scatter(
-        use, x=proj, y=own, size=size,
-        color="Pos" if "Pos" in use.columns else None,
-        hover_name="Player Name" if "Player Name" in use.columns else None,
-        title=f"NFL — {site} Projection vs {site} pOWN%",
-        labels={proj:"Projection", own:"pOWN%"},
-        color_discrete_map=POSITION_COLORS if "Pos" in use.columns else None
-    )
-    fig.update_traces(marker=dict(line=dict(width=0)))
-    _add_linear_trend(fig, use[proj], use[own])
-    fig.update_layout(height=460, showlegend="Pos" in use.columns)
-    return fig
-
-def nfl_val_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
-    val, proj = coalesce(df, f"{site} Val"), coalesce(df, f"{site} Proj")
-    if not val or not proj: return go.Figure()
-    use = df[[val, proj] + [c for c in ["Pos", "Player Name"] if c in df.columns]].dropna()
-    if use.empty: return go.Figure()
-    fig = px.scatter(
-        use, x=val, y=proj,
-        color="Pos" if "Pos" in use.columns else None,
-        hover_name="Player Name" if "Player Name" in use.columns else None,
-        title=f"NFL — {site} Value vs {site} Projection",
-        labels={val:"Value", proj:"Projection"},
-        color_discrete_map=POSITION_COLORS if "Pos" in use.columns else None
-    )
-    _add_linear_trend(fig, use[val], use[proj])
-    fig.update_layout(height=460, showlegend="Pos" in use.columns)
-    return fig
-
-def nfl_pos_box(df: pd.DataFrame, site: str, metric: str = "Proj") -> go.Figure:
-    mcol = coalesce(df, f"{site} {metric}")
-    if "Pos" not in df.columns or not mcol: return go.Figure()
-    use = df[["Pos", mcol]].dropna()
-    if use.empty: return go.Figure()
-    fig = px.box(use, x="Pos", y=mcol, points="suspectedoutliers",
-                 title=f"NFL — {site} {metric} by Position", labels={mcol:metric})
-    fig.update_layout(height=460)
-    return fig
-
-# ----------------------------
-# MLB CHARTS (NEW)
-# ----------------------------
-def mlb_bat_order_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
-    order = coalesce(df, "Bat Order")
-    proj  = coalesce(df, f"{site} Proj")
-    if not order or not proj: return go.Figure()
-    use = df[[order, proj] + [c for c in ["Player Name", "Team", "Pos"] if c in df.columns]].dropna()
-    if use.empty: return go.Figure()
-    jitter = (np.random.rand(len(use)) - 0.5) * 0.08
-    fig = px.scatter(use, x=pd.to_numeric(use[order], errors="coerce")+jitter, y=proj,
-                     color="Pos" if "Pos" in use.columns else None,
-                     hover_name="Player Name" if "Player Name" in use.columns else None,
-                     title=f"MLB — Bat Order vs {site} Projection",
-                     labels={order:"Bat Order", proj:"Projection"})
-    fig.update_layout(height=420, showlegend="Pos" in use.columns)
-    return fig
-
-def mlb_teamimp_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
-    imp  = coalesce(df, "Team Imp. Tot")
-    proj = coalesce(df, f"{site} Proj")
-    if not imp or not proj: return go.Figure()
-    use = df[[imp, proj] + [c for c in ["Player Name","Team"] if c in df.columns]].dropna()
-    if use.empty: return go.Figure()
-    fig = px.scatter(use, x=imp, y=proj,
-                     hover_name="Player Name" if "Player Name" in use.columns else None,
-                     color="Team" if "Team" in use.columns else None,
-                     title=f"MLB — Team Implied Total vs {site} Projection",
-                     labels={imp:"Team Implied Total", proj:"Projection"})
-    _add_linear_trend(fig, use[imp], use[proj])
-    fig.update_layout(height=420, showlegend="Team" in use.columns)
-    return fig
-
-def mlb_salary_vs_kproj(df: pd.DataFrame, site: str) -> go.Figure:
-    sal = coalesce(df, f"{site} Sal")
-    kp  = coalesce(df, "K Proj")
-    if not sal or not kp: return go.Figure()
-    use = df[[sal, kp] + [c for c in ["Player Name","Team"] if c in df.columns]].dropna()
-    if use.empty: return go.Figure()
-    fig = px.scatter(use, x=sal, y=kp,
-                     hover_name="Player Name" if "Player Name" in use.columns else None,
-                     color="Team" if "Team" in use.columns else None,
-                     title=f"MLB — {site} Salary vs K Proj",
-                     labels={sal:"Salary ($)", kp:"K Proj"})
-    _add_linear_trend(fig, use[sal], use[kp])
-    fig.update_layout(height=420, showlegend="Team" in use.columns)
-    return fig
-
-# ----------------------------
-# NFL STACKS CHARTS (with TOTAL)
-# ----------------------------
-def stacks_find_cols(df: pd.DataFrame, site: str):
-    team = coalesce(df, "Team", "team", "Stack Team", "StackTeam")
-
-    # Total (overall stack projection total)
-    total = coalesce(
-        df, "Total", "Stack Total", "Team Total", "Total Proj",
-        "Total Projection", "Sum Proj", "Sum Projection", "Total Proj"
-    )
-
-    # Implied total (Vegas)
-    imp_tot = coalesce(
-        df, "Imp. Tot", "Imp Tot", "Implied Total", "Team Implied",
-        "Vegas Team Total", "Vegas Total", "Team Imp. Tot"
-    )
-
-    # Projection (fallbacks)
-    proj = coalesce(
-        df,
-        "Stack Proj", "Stack Projection", "Team Stack Proj", "Team Stack Projection",
-        f"{site} Stack Proj",
-        "Total Stack Proj", "Total Stack Projection",
-        f"{site} Proj", "Proj", "Projection",
-        total
-    )
-
-    own = coalesce(
-        df,
-        f"{site} Stack pOWN%", f"{site} pOWN%", "Stack pOWN%", "pOWN%",
-        "Ownership%", "Own%", "Ownership"
-    )
-    opt = coalesce(
-        df,
-        f"{site} Stack Opt%", f"{site} Opt%", "Stack Opt%", "Opt%", "Optimal%", "Optimal %"
-    )
-    salary = coalesce(
-        df,
-        "Stack Salary", f"{site} Stack Salary", f"{site} Sal", f"{site} Stack Sal",
-        "Salary", "Stack Price", "Total Salary", "Price", "Total Price",
-        f"{site} Stack Salary"
-    )
-    return team, proj, own, opt, salary, total, imp_tot
-
-def stacks_total_hist(df: pd.DataFrame) -> go.Figure:
-    total = coalesce(df, "Total", "Stack Total", "Total Proj", "Total Projection", "Sum Proj", "Total Proj")
-    if not total: return go.Figure()
-    use = df[[total]].dropna()
-    if use.empty: return go.Figure()
-    fig = px.histogram(use, x=total, nbins=30, title="Stacks — Total Projection Distribution", labels={total:"Total Projection"})
-    fig.update_layout(height=420)
-    return fig
-
-def stacks_total_vs_salary(df: pd.DataFrame, site: str) -> go.Figure:
-    _, _, _, _, salary, total, _ = stacks_find_cols(df, site)
-    if not total or not salary: return go.Figure()
-    keep = [total, salary] + [c for c in ["Team"] if c in df.columns]
-    use = df[keep].dropna()
-    if use.empty: return go.Figure()
-    fig = px.scatter(
-        use, x=salary, y=total, color="Team" if "Team" in use.columns else None,
-        title=f"Stacks — {site} Stack Salary vs TOTAL Projection",
-        labels={salary:"Stack Salary ($)", total:"Total Projection"},
-    )
-    _add_linear_trend(fig, use[salary], use[total])
-    fig.update_layout(height=460, showlegend="Team" in use.columns)
-    return fig
-
-def stacks_total_vs_imptot(df: pd.DataFrame) -> go.Figure:
-    total = coalesce(df, "Total", "Stack Total", "Total Proj", "Total Projection", "Sum Proj", "Total Proj")
-    imp   = coalesce(df, "Imp. Tot", "Imp Tot", "Implied Total", "Team Implied", "Vegas Team Total", "Vegas Total", "Team Imp. Tot")
-    if not total or not imp: return go.Figure()
-    use = df[[total, imp] + [c for c in ["Team"] if c in df.columns]].dropna()
-    if use.empty: return go.Figure()
-    fig = px.scatter(
-        use, x=imp, y=total, color="Team" if "Team" in use.columns else None,
-        title="Stacks — TOTAL Projection vs Implied Total",
-        labels={imp:"Implied Total", total:"Total Projection"},
-    )
-    _add_linear_trend(fig, use[imp], use[total])
-    fig.update_layout(height=460, showlegend="Team" in use.columns)
-    return fig
-
-def stacks_total_vs_own(df: pd.DataFrame, site: str) -> go.Figure:
-    total = coalesce(df, "Total", "Stack Total", "Total Proj", "Total Projection", "Sum Proj", "Total Proj")
-    own   = coalesce(df, f"{site} Stack pOWN%", f"{site} pOWN%", "Stack pOWN%", "pOWN%", "Own%")
-    if not total or not own: return go.Figure()
-    keep = [total, own] + [c for c in ["Team"] if c in df.columns]
-    use = df[keep].dropna()
-    if use.empty: return go.Figure()
-    fig = px.scatter(
-        use, x=own, y=total, color="Team" if "Team" in use.columns else None,
-        title=f"Stacks — TOTAL Projection vs {site} pOWN%",
-        labels={own:f"{site} pOWN%", total:"Total Projection"},
-    )
-    fig.update_layout(height=460, showlegend="Team" in use.columns)
-    return fig
-
-def stacks_opt_vs_own(df: pd.DataFrame, site: str) -> go.Figure:
-    team, proj, own, opt, salary, _, _ = stacks_find_cols(df, site)
-    if not own or not opt: return go.Figure()
-    keep = [own, opt] + [c for c in [proj, team, salary] if c]
-    use = df[keep].dropna()
-    if use.empty: return go.Figure()
-    hdata = {own:":.1f", opt:":.1f"}
-    if proj:   hdata[proj] = ":.1f"
-    if salary: hdata[salary] = ":,.0f"
-    fig = px.scatter(
-        use, x=own, y=opt, color=team if team else None,
-        hover_data=hdata,
-        title=f"Stacks — {site} Stack Optimal% vs {site} Stack pOWN%",
-        labels={own:f"{site} pOWN%", opt:f"{site} Optimal%"},
-    )
-    fig.update_layout(height=460, showlegend=bool(team))
-    return fig
-
-def stacks_table(df: pd.DataFrame, site: str) -> pd.DataFrame:
-    team, proj, own, opt, salary, total, _ = stacks_find_cols(df, site)
-    cols = [c for c in [team, total or proj, own, opt, salary] if c]
-    if not cols: return pd.DataFrame()
-    out = df[cols].copy()
-    ren = {}
-    if team: ren[team] = "Team"
-    if total or proj: ren[total or proj] = "Total Proj" if total else "Proj"
-    if own:  ren[own]  = f"{site} pOWN%"
-    if opt:  ren[opt]  = f"{site} Opt%"
-    if salary: ren[salary] = "Stack Salary"
-    out = out.rename(columns=ren)
-    if f"{site} Opt%" in out.columns and f"{site} pOWN%" in out.columns:
-        out[f"{site} Lev%"] = out[f"{site} Opt%"] - out[f"{site} pOWN%"]
-    sort_col = "Total Proj" if "Total Proj" in out.columns else ("Proj" if "Proj" in out.columns else None)
-    if sort_col:
-        out = out.sort_values(sort_col, ascending=False)
-    return out
-
 # ----------------------------
 # ANALYTICS RENDERER (UNIFORM DK/FD) — with MLB
 # ----------------------------
-def render_analytics_auto(df: pd.DataFrame, selected_sport: str, selected_sheet: str, site_filter: str):
+def render_analytics_auto(df: pd.DataFrame, selected_sport: str, selected_sheet: str, site_filter: str,
+                          cache_key: Optional[tuple] = None):
     sites = ["DK", "FD"] if site_filter == "Both" else [site_filter]
 
+    def chart(builder, df: pd.DataFrame, site: Optional[str] = None, **kw) -> go.Figure:
+        args = (df,) if site is None else (df, site)
+        chart_id = builder.__name__ + "".join(f"|{k}={v}" for k, v in sorted(kw.items()))
+        return cached_figure(cache_key, site, chart_id, lambda: builder(*args, **kw))
+
     # MLB
     if is_mlb_context(selected_sport, selected_sheet, df):
         st.subheader("📈 MLB Analytics")
@@ -1319,24 +240,24 @@ def render_analytics_auto(df: pd.DataFrame, selected_sport: str, selected_sheet:
             st.markdown(f"**{site}**")
             c1, c2 = st.columns(2)
             with c1:
-                fig = nfl_salary_vs_proj(df, site)   # shared pattern
+                fig = chart(nfl_salary_vs_proj, df, site)   # shared pattern
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
             with c2:
-                fig = nfl_proj_vs_own(df, site)      # shared pattern
+                fig = chart(nfl_proj_vs_own, df, site)      # shared pattern
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
 
             c3, c4 = st.columns(2)
             with c3:
-                fig = nfl_val_vs_proj(df, site)      # shared pattern
+                fig = chart(nfl_val_vs_proj, df, site)      # shared pattern
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
             with c4:
                 sname = selected_sheet.strip().lower()
                 if "pitch" in sname:
-                    fig = mlb_salary_vs_kproj(df, site)
+                    fig = chart(mlb_salary_vs_kproj, df, site)
                 else:
-                    fig = mlb_bat_order_vs_proj(df, site)
+                    fig = chart(mlb_bat_order_vs_proj, df, site)
                     if not fig.data:
-                        fig = mlb_teamimp_vs_proj(df, site)
+                        fig = chart(mlb_teamimp_vs_proj, df, site)
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
         return
 
@@ -1346,14 +267,14 @@ def render_analytics_auto(df: pd.DataFrame, selected_sport: str, selected_sheet:
         for site in sites:
             c1, c2 = st.columns(2)
             with c1:
-                fig = nascar_salary_vs_proj(df, site)
+                fig = chart(nascar_salary_vs_proj, df, site)
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
             with c2:
-                fig = nascar_qual_vs_proj(df, site)
+                fig = chart(nascar_qual_vs_proj, df, site)
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
             c3, _ = st.columns(2)
             with c3:
-                fig = nascar_opt_vs_own(df, site)
+                fig = chart(nascar_opt_vs_own, df, site)
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
         return
 
@@ -1363,20 +284,20 @@ def render_analytics_auto(df: pd.DataFrame, selected_sport: str, selected_sheet:
         # Global (site-agnostic)
         a1, a2 = st.columns(2)
         with a1:
-            fig = stacks_total_hist(df)
+            fig = chart(stacks_total_hist, df)
             if fig.data: st.plotly_chart(fig, use_container_width=True)
         with a2:
-            fig = stacks_total_vs_imptot(df)
+            fig = chart(stacks_total_vs_imptot, df)
             if fig.data: st.plotly_chart(fig, use_container_width=True)
         # Per-site
         for site in sites:
             st.markdown(f"**{site}**")
             b1, b2 = st.columns(2)
             with b1:
-                fig = stacks_total_vs_salary(df, site)
+                fig = chart(stacks_total_vs_salary, df, site)
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
             with b2:
-                fig = stacks_opt_vs_own(df, site)
+                fig = chart(stacks_opt_vs_own, df, site)
                 if fig.data: st.plotly_chart(fig, use_container_width=True)
         return
 
@@ -1386,91 +307,20 @@ def render_analytics_auto(df: pd.DataFrame, selected_sport: str, selected_sheet:
         st.markdown(f"**{site}**")
         c1, c2 = st.columns(2)
         with c1:
-            fig = nfl_salary_vs_proj(df, site)
+            fig = chart(nfl_salary_vs_proj, df, site)
             if fig.data: st.plotly_chart(fig, use_container_width=True)
         with c2:
-            fig = nfl_proj_vs_own(df, site)
+            fig = chart(nfl_proj_vs_own, df, site)
             if fig.data: st.plotly_chart(fig, use_container_width=True)
 
         c3, c4 = st.columns(2)
         with c3:
-            fig = nfl_val_vs_proj(df, site)
+            fig = chart(nfl_val_vs_proj, df, site)
             if fig.data: st.plotly_chart(fig, use_container_width=True)
         with c4:
-            fig = nfl_pos_box(df, site, metric="Proj")
+            fig = chart(nfl_pos_box, df, site, metric="Proj")
             if fig.data: st.plotly_chart(fig, use_container_width=True)
 
-# ----------------------------
-# NFL-ONLY POSITION SUMMARY (unchanged)
-# ----------------------------
-def nfl_position_summary(df: pd.DataFrame, site: str) -> pd.DataFrame:
-    if "Pos" not in df.columns:
-        return pd.DataFrame()
-
-    base_cols = {
-        "Sal": f"{site} Sal",
-        "Proj": f"{site} Proj",
-        "Val": f"{site} Val",
-        "Own": f"{site} pOWN%",
-    }
-    have = {k: v for k, v in base_cols.items() if v in df.columns}
-    if not have:
-        return pd.DataFrame()
-
-    d = df[["Pos"] + list(have.values())].copy()
-
-    for col in have.values():
-        d[col] = pd.Series(d[col]).astype(str).str.replace(r"[%$,]", "", regex=True)
-        d[col] = pd.to_numeric(d[col], errors="coerce")
-
-    g = d.groupby("Pos").agg({v: ["count", "mean", "std"] for v in have.values()})
-    g.columns = [f"{orig}_{stat}" for orig, stat in g.columns]
-    out = g.reset_index()
-
-    cols_display = ["Pos"]
-    rows = []
-
-    for _, row in out.iterrows():
-        r = {"Pos": row["Pos"]}
-
-        if base_cols.get("Sal") and f"{base_cols['Sal']}_count" in out.columns:
-            r["Count"] = int(row[f"{base_cols['Sal']}_count"])
-            mean_sal = row.get(f"{base_cols['Sal']}_mean", pd.NA)
-            std_sal  = row.get(f"{base_cols['Sal']}_std", pd.NA)
-            r[f"{site} Sal (mean)"] = _fmt_currency0(mean_sal)
-            r[f"{site} Sal (std)"]  = _fmt_currency0(std_sal)
-            if "Count" not in cols_display:
-                cols_display.extend(["Count", f"{site} Sal (mean)", f"{site} Sal (std)"])
-
-        if base_cols.get("Proj") and f"{base_cols['Proj']}_mean" in out.columns:
-            r[f"{site} Proj (mean)"] = _fmt_number1(row[f"{base_cols['Proj']}_mean"])
-            r[f"{site} Proj (std)"]  = _fmt_number1(row[f"{base_cols['Proj']}_std"])
-            if f"{site} Proj (mean)" not in cols_display:
-                cols_display.extend([f"{site} Proj (mean)", f"{site} Proj (std)"])
-
-        if base_cols.get("Val") and f"{base_cols['Val']}_mean" in out.columns:
-            r[f"{site} Val (mean)"] = _fmt_number1(row[f"{base_cols['Val']}_mean"])
-            r[f"{site} Val (std)"]  = _fmt_number1(row[f"{base_cols['Val']}_std"])
-            if f"{site} Val (mean)" not in cols_display:
-                cols_display.extend([f"{site} Val (mean)", f"{site} Val (std)"])
-
-        if base_cols.get("Own") and f"{base_cols['Own']}_mean" in out.columns:
-            r[f"{site} pOWN% (mean)"] = _fmt_percent1(row[f"{base_cols['Own']}_mean"])
-            r[f"{site} pOWN% (std)"]  = _fmt_percent1(row[f"{base_cols['Own']}_std"])
-            if f"{site} pOWN% (mean)" not in cols_display:
-                cols_display.extend([f"{site} pOWN% (mean)", f"{site} pOWN% (std)"])
-
-        rows.append(r)
-
-    disp = pd.DataFrame(rows, columns=cols_display)
-
-    sort_key = f"{site} Proj (mean)"
-    if sort_key in disp.columns:
-        tmp = pd.to_numeric(disp[sort_key].str.replace(r"[^\d.]", "", regex=True), errors="coerce")
-        disp = disp.iloc[tmp.sort_values(ascending=False).index].reset_index(drop=True)
-
-    return disp
-
 # ======================================================
 # UI
 # ======================================================
@@ -1479,19 +329,46 @@ def nfl_position_summary(df: pd.DataFrame, site: str) -> pd.DataFrame:
 st.sidebar.header("🎛️ Controls")
 st.sidebar.markdown("---")
 st.sidebar.checkbox("Show load logs", value=False, key="show_logs")
+st.sidebar.checkbox(
+    "Compact memory mode", value=False, key="compact_mode",
+    help="Store sheets with categoricals, float32 and small ints. Applies to datasets loaded or kept while enabled.",
+)
 
 SPORTS = list(DEFAULT_SPORTS.keys())
 selected_sport = st.sidebar.selectbox("🏅 Sport", SPORTS, index=0)
 
 # Data status (tidy)
-with st.expander("📊 Data Status", expanded=False):
+data_status = st.expander("📊 Data Status", expanded=False)
+with data_status:
+    _listed = {job["source"] for job in _slates(selected_sport)}
     for item in DEFAULT_SPORTS.get(selected_sport, []):
-        path = item["path"]; sheets = item.get("sheets", [])
-        exists = os.path.exists(path)
-        status_icon = "✅" if exists else "❌"
-        st.markdown(f"{status_icon} **{item['label']}**")
-        st.markdown(f"   📁 Path: {path}")
-        st.markdown(f"   📋 Sheets (expected): {sheets}")
+        if os.path.abspath(item["path"]) not in _listed:
+            st.markdown(f"❌ **{item['label']}**")
+            st.markdown(f"   📁 Path: {item['path']}")
+    for job in _slates(selected_sport):
+        entry = job["entry"]
+        st.markdown(f"{'⚠️' if entry['error'] else '✅'} **{job['label']}**")
+        st.markdown(f"   📁 Path: {entry['path']} · {entry['size'] / 1e6:.1f} MB · "
+                    f"modified {pd.Timestamp.fromtimestamp(entry['mtime_ns'] / 1e9):%Y-%m-%d %H:%M}")
+        st.markdown(f"   📋 Sheets: {', '.join(f'{s} ({k})' for s, k in entry['kinds'].items()) or entry['error']}")
+    if st.button("🔄 Rescan slate folders", help=", ".join(SLATE_DIRS.get(selected_sport, []))):
+        slate_catalog().forget()
+        st.rerun()
+
+    _cs = cache_stats()
+    st.markdown(
+        f"🗄️ Parsed-sheet cache: {_cs['entries']} entries, "
+        f"{_cs['bytes'] / 1e6:.1f} MB of {_cs['limit'] / 1e6:.0f} MB"
+    )
+    if st.button("🧹 Clear cache", help="Delete cached Parquet sheets and re-parse workbooks"):
+        freed = clear_sheet_cache()
+        dataset_registry().release_session(_session_id())
+        figure_cache().clear()
+        export_cache().clear()
+        background_loader().forget_done()
+        st.session_state.pop("datasets", None)
+        st.session_state.pop("name_index", None)
+        st.success(f"Cleared {freed / 1e6:.1f} MB of cached sheets")
 
 # State init
 if "datasets" not in st.session_state:
@@ -1505,23 +382,205 @@ if "presets" not in st.session_state:
 if selected_sport not in st.session_state.datasets:
     st.session_state.datasets[selected_sport] = {}
 
-for item in DEFAULT_SPORTS.get(selected_sport, []):
-    label, path = item["label"], item["path"]
-    desired_sheets = item.get("sheets", [])
-    if os.path.exists(path) and label not in st.session_state.datasets[selected_sport]:
-        with st.spinner(f"Loading {selected_sport} — {label}..."):
-            try:
-                data = load_data_for_sport(selected_sport, path, only_sheets=desired_sheets)
-                if data:
-                    st.session_state.datasets[selected_sport][label] = {
-                        "data": data,
-                        "allowed": set(data.keys()) if (desired_sheets is not None and len(list(desired_sheets)) > 0) else None,
-                    }
-                    ui_log(f"Loaded {label} with sheets: {list(data.keys())}", "success")
-                else:
-                    ui_log(f"{label}: No matching sheets found or failed to load", "warning")
-            except Exception as e:
-                ui_log(f"Failed to load {label}: {str(e)}", "error")
+if "load_report" not in st.session_state:
+    st.session_state.load_report = {}
+if "load_traces" not in st.session_state:
+    st.session_state.load_traces = []
+
+# Timing traces kept per session for the "Show load logs" waterfall
+MAX_LOAD_TRACES = 20
+
+def _keep_trace(trace: Trace) -> None:
+    st.session_state.load_traces = (st.session_state.load_traces + [trace.to_dict()])[-MAX_LOAD_TRACES:]
+if "name_index" not in st.session_state:
+    st.session_state.name_index = NameIndex()
+
+def _index_names(label: str, data: Dict[str, pd.DataFrame]) -> None:
+    """(Re)index a dataset's name columns in this session's cross-sport name index."""
+    idx = st.session_state.name_index
+    idx.remove(lambda tag: tag[:2] == (selected_sport, label))
+    for sheet, frame in data.items():
+        col = name_column(frame) if isinstance(frame, pd.DataFrame) else None
+        if col:
+            idx.add(frame[col], (selected_sport, label, sheet))
+
+def _store_dataset(label: str, data: Dict[str, pd.DataFrame], allowed, key: Optional[str],
+                   loading: bool = False) -> None:
+    """Keep a session reference to the shared (optionally compact) copy of a slate."""
+    registry, sid = dataset_registry(), _session_id()
+    before = sum(frame_nbytes(d) for d in data.values())
+    compact = bool(st.session_state.get("compact_mode"))
+    rkey = None if key is None else (f"{key}|compact" if compact else key)
+
+    shared = registry.get(rkey) if rkey else None
+    if shared is None:
+        shared = {k: compact_frame(v) for k, v in data.items()} if compact else data
+    if rkey:
+        shared = registry.acquire(rkey, sid, shared)
+
+    with span(f"index {label}", compact=compact):
+        for frame in shared.values():
+            filter_engine(frame)
+        _index_names(label, shared)
+
+    old = st.session_state.datasets[selected_sport].get(label)
+    if old and old.get("key") and old["key"] != rkey:
+        registry.release(old["key"], sid)
+    st.session_state.datasets[selected_sport][label] = {
+        "data": shared, "allowed": allowed, "compact": compact, "key": rkey, "source_key": key, "loading": loading,
+        "bytes": {"before": before, "after": sum(frame_nbytes(d) for d in shared.values()) if compact else before},
+    }
+
+def _run_ingestion(jobs: List[dict], allowed_from_sheets: bool) -> None:
+    """Parse jobs in parallel, storing each file in session state as soon as it finishes."""
+    if not jobs:
+        return
+    wanted = {j["label"]: j.get("sheets") for j in jobs}
+    progress = st.progress(0.0, text=f"Loading {selected_sport} — {len(jobs)} file(s)...")
+
+    def on_progress(frac: float, what: str) -> None:
+        progress.progress(min(frac, 1.0), text=f"Loaded {what}")
+
+    def on_file_done(label: str, data: Dict[str, pd.DataFrame], rep: dict) -> None:
+        st.session_state.load_report[f"{selected_sport} — {label}"] = rep
+        if not data:
+            ui_log(f"{label}: No matching sheets found or failed to load", "warning")
+            return
+        desired_sheets = wanted.get(label)
+        allowed = None
+        if allowed_from_sheets and desired_sheets is not None and len(list(desired_sheets)) > 0:
+            allowed = set(data.keys())
+        _store_dataset(label, data, allowed, rep.get("key"))
+        ui_log(f"Loaded {label} with sheets: {list(data.keys())}" + (" (cache)" if rep["cached"] else ""), "success")
+
+    trace = Trace(f"Load {selected_sport} ({len(jobs)} file(s))", sport=selected_sport)
+    try:
+        with tracing(trace):
+            ingest_parallel(selected_sport, jobs, on_file_done=on_file_done, on_progress=on_progress,
+                            shared=dataset_registry())
+    except Exception as e:
+        ui_log(f"Parallel load failed: {str(e)}", "error")
+    finally:
+        progress.empty()
+        _keep_trace(trace)
+
+# ----------------------------
+# BACKGROUND LOADING (cataloged slates)
+# ----------------------------
+# The selected slate parses on a background worker: the first sheet renders as soon
+# as it is ready, the rest fill in on later reruns, and the other sports' default
+# slates are prefetched once this one has finished. Other slates wait until picked.
+LOAD_POLL_SECONDS = 0.75
+RELOAD_POLL_SECONDS = 2.0
+FIRST_SHEET_WAIT_SECONDS = 30.0
+
+if "bg_seen" not in st.session_state:
+    st.session_state.bg_seen = {}
+
+def _preset_columns(sport: str, label: str) -> Dict[str, List[str]]:
+    """Columns of every saved preset, by sheet; they load up front with the core columns."""
+    out: Dict[str, List[str]] = {}
+    for key_id, presets in st.session_state.presets.items():
+        parts = key_id.split("::", 2)
+        if len(parts) == 3 and parts[0] == sport and parts[1] == label:
+            out[parts[2]] = sorted({c for cols in presets.values() for c in cols})
+    return out
+
+def _load_job(sport: str, slate: dict) -> dict:
+    return {"label": slate["label"], "source": slate["source"], "sheets": slate["sheets"],
+            "columns": _preset_columns(sport, slate["label"])}
+
+def _claim_background(ticket: LoadTicket) -> None:
+    """Store whatever a background load has published since this session last looked."""
+    seen = (id(ticket), ticket.version)
+    if st.session_state.bg_seen.get((selected_sport, ticket.label)) == seen:
+        return
+    st.session_state.bg_seen[(selected_sport, ticket.label)] = seen
+    report = ticket.report
+    data = ticket.frames()
+    if report is not None:
+        for msg, level in ticket.messages:
+            ui_log(msg, level)
+        st.session_state.load_report[f"{selected_sport} — {ticket.label}"] = report
+        _keep_trace(ticket.trace)
+        if not data:
+            ui_log(f"{ticket.label}: No matching sheets found or failed to load", "warning")
+            return
+    if not data:
+        return
+    _store_dataset(ticket.label, data, set(data.keys()), report.get("key") if report else None,
+                   loading=report is None)
+    if report is not None:
+        ui_log(f"Loaded {ticket.label} with sheets: {list(data.keys())}" + (" (cache)" if report["cached"] else "")
+               + (f" ({len(report['reused'])} unchanged sheet(s) reused)" if report.get("reused") else ""),
+               "success")
+
+# The dataset picker further down keeps its choice here; until then the first slate is selected
+_catalog_slates = _slates(selected_sport)
+_picked = st.session_state.get("dataset_pick")
+if _picked not in {s["label"] for s in _catalog_slates} and _picked not in st.session_state.datasets[selected_sport]:
+    _picked = _catalog_slates[0]["label"] if _catalog_slates else None
+_bg_tickets = [
+    background_loader().submit(selected_sport, _load_job(selected_sport, slate))
+    for slate in _catalog_slates
+    if (slate["label"] == _picked and slate["label"] not in st.session_state.datasets[selected_sport])
+    or st.session_state.datasets[selected_sport].get(slate["label"], {}).get("loading")
+]
+_picked_ticket = next((t for t in _bg_tickets if t.label == _picked), None)
+if _picked_ticket is not None and _picked not in st.session_state.datasets[selected_sport]:
+    with st.spinner(f"Loading {selected_sport} — {_picked_ticket.label}..."):
+        _picked_ticket.wait(PRIORITY_SHEETS.get(selected_sport), FIRST_SHEET_WAIT_SECONDS)
+for _ticket in _bg_tickets:
+    _claim_background(_ticket)
+
+@st.fragment(run_every=LOAD_POLL_SECONDS)
+def _watch_background(tickets: List[LoadTicket]) -> None:
+    """Rerun the page whenever a background load publishes another sheet."""
+    seen = st.session_state.bg_seen
+    if any(seen.get((selected_sport, t.label)) != (id(t), t.version) for t in tickets):
+        st.rerun()
+    st.caption(f"⏳ Loading {', '.join(t.label for t in tickets)} in the background...")
+
+# Loaded slates are watched on disk: a save reloads just its changed sheets in the background
+_loaded_slates = [
+    s for s in _catalog_slates
+    if not st.session_state.datasets[selected_sport].get(s["label"], {"loading": True}).get("loading")
+]
+for _slate in _loaded_slates:
+    slate_watcher().watch(selected_sport, _load_job(selected_sport, _slate))
+
+def _unclaimed_reloads() -> List[LoadTicket]:
+    seen = st.session_state.bg_seen
+    return [
+        t for t in slate_watcher().reloads(selected_sport)
+        if t.done and t.label in st.session_state.datasets[selected_sport]
+        and seen.get((selected_sport, t.label)) != (id(t), t.version)
+    ]
+
+for _ticket in _unclaimed_reloads():
+    _claim_background(_ticket)
+
+@st.fragment(run_every=RELOAD_POLL_SECONDS)
+def _watch_reloads() -> None:
+    """Rerun the page once a watched slate has been reloaded after a save."""
+    if _unclaimed_reloads():
+        st.rerun()
+
+_bg_pending = [
+    t for t in _bg_tickets
+    if not t.done or st.session_state.bg_seen.get((selected_sport, t.label)) != (id(t), t.version)
+]
+if _bg_pending:
+    _watch_background(_bg_pending)
+else:
+    if _loaded_slates:
+        _watch_reloads()
+    for _sport in SPORTS:
+        if _sport != selected_sport:
+            background_loader().prefetch(_sport, [
+                _load_job(_sport, slate) for slate in _slates(_sport)[:1]
+                if slate["label"] not in st.session_state.datasets.get(_sport, {})
+            ])
 
 # Uploads
 with st.expander("📤 Upload Additional Files"):
@@ -1532,28 +591,128 @@ with st.expander("📤 Upload Additional Files"):
         help="Upload additional data files to analyze",
     )
     if uploaded_files:
-        for file in uploaded_files:
-            base_name = os.path.splitext(file.name)[0]
-            if base_name not in st.session_state.datasets[selected_sport]:
-                try:
-                    data = load_data_for_sport(selected_sport, file, only_sheets=None)
-                    if data:
-                        st.session_state.datasets[selected_sport][base_name] = {"data": data, "allowed": None}
-                        ui_log(f"Uploaded {file.name}", "success")
-                    else:
-                        ui_log(f"Failed to process {file.name}", "warning")
-                except Exception as e:
-                    ui_log(f"Error uploading {file.name}: {str(e)}", "error")
+        _run_ingestion(
+            [
+                {"label": os.path.splitext(file.name)[0], "source": file, "sheets": None}
+                for file in uploaded_files
+                if os.path.splitext(file.name)[0] not in st.session_state.datasets[selected_sport]
+            ],
+            allowed_from_sheets=False,
+        )
+
+# Compact datasets that were loaded before compact mode was switched on
+if st.session_state.get("compact_mode"):
+    for _label, _entry in list(st.session_state.datasets[selected_sport].items()):
+        if not _entry.get("compact"):
+            _store_dataset(_label, _entry["data"], _entry.get("allowed"), _entry.get("source_key"),
+                           loading=bool(_entry.get("loading")))
+
+# Refresh this session's references to shared slates; drop ones nobody uses anymore
+for _sets in st.session_state.datasets.values():
+    for _entry in _sets.values():
+        if _entry.get("key"):
+            # picks up sheets another session widened (registry entries are replaced, never mutated)
+            _entry["data"] = dataset_registry().acquire(_entry["key"], _session_id(), _entry["data"])
+dataset_registry().evict_stale()
+
+# Memory footprint per dataset
+with data_status:
+    _foot = [
+        {
+            "Dataset": label,
+            "Sheets": len(entry["data"]),
+            "Loaded (MB)": round(entry.get("bytes", {}).get("before", 0) / 1e6, 2),
+            "Stored (MB)": round(entry.get("bytes", {}).get("after", 0) / 1e6, 2),
+            "Compact": bool(entry.get("compact")),
+        }
+        for label, entry in st.session_state.datasets[selected_sport].items()
+    ]
+    if _foot:
+        st.markdown("💾 Memory footprint")
+        st.dataframe(pd.DataFrame(_foot), use_container_width=True, hide_index=True)
+    _rs = dataset_registry().stats()
+    st.markdown(
+        f"🔗 Shared slates: {_rs['entries']} in memory, {_rs['bytes'] / 1e6:.1f} MB, "
+        f"referenced by {_rs['sessions']} session(s)"
+    )
+
+# Per-file load report (errors stay visible without the log switch)
+_report = {k: v for k, v in st.session_state.load_report.items() if k.startswith(f"{selected_sport} — ")}
+if _report:
+    _bad = [k for k, v in _report.items() if v["status"] != "ok"]
+    with st.expander(f"🧾 Load report{' — ' + str(len(_bad)) + ' issue(s)' if _bad else ''}", expanded=bool(_bad)):
+        st.dataframe(
+            pd.DataFrame([
+                {
+                    "File": k.split(" — ", 1)[1], "Status": v["status"], "Sheets": len(v["sheets"]),
+                    "Seconds": v["seconds"], "Cached": v["cached"], "Errors": "; ".join(v["errors"]),
+                }
+                for k, v in _report.items()
+            ]),
+            use_container_width=True,
+            hide_index=True,
+        )
+
+# Stage timings (filled at the end of the run so this render's spans are complete)
+_timings_box = st.container()
+
+def _show_timings(render: Optional[Trace] = None) -> None:
+    """Waterfall of a recent load (or this render) plus a JSON download, when load logs are on."""
+    if not st.session_state.get("show_logs"):
+        return
+    traces = list(st.session_state.load_traces) + ([render.to_dict()] if render is not None else [])
+    if not traces:
+        return
+    with _timings_box.expander("⏱️ Load & render timings"):
+        labels = [f"{t['started']} — {t['name']} · {t['total_ms']:,.0f} ms" for t in traces]
+        pick = st.selectbox("Trace", list(range(len(traces))), index=len(traces) - 1,
+                            format_func=lambda i: labels[i], key="trace_pick")
+        st.dataframe(pd.DataFrame(waterfall_rows(traces[pick])), use_container_width=True, hide_index=True)
+        st.download_button("⬇️ Download timings (JSON)", data=json.dumps(traces, indent=1, default=str),
+                           file_name="cpenn_timings.json", mime="application/json")
+
+# Find a player across every loaded sheet, dataset and sport
+with st.expander("🔎 Find player everywhere"):
+    _who = st.text_input("Player / driver name", key="global_search", placeholder="e.g. mahomes")
+    if _who:
+        _hits = []
+        for _name, (_sport, _label, _sheet), _rows in st.session_state.name_index.find(_who):
+            _frame = st.session_state.datasets.get(_sport, {}).get(_label, {}).get("data", {}).get(_sheet)
+            if _frame is None:
+                continue
+            _row = _frame.iloc[int(_rows[0])]
+            _hits.append({
+                "Name": _name, "Sport": _sport, "Dataset": _label, "Sheet": _sheet, "Rows": len(_rows),
+                "Team": _row.get("Team"), "Pos": _row.get("Pos"),
+                "DK Sal": _row.get("DK Sal"), "DK Proj": _row.get("DK Proj"),
+            })
+        if _hits:
+            st.dataframe(pd.DataFrame(_hits), use_container_width=True, hide_index=True)
+        else:
+            st.info("No loaded sheet has a matching name.")
 
 # Guard
-if not st.session_state.datasets.get(selected_sport):
+_loaded = st.session_state.datasets[selected_sport]
+dataset_options = list(dict.fromkeys([s["label"] for s in _catalog_slates] + list(_loaded)))
+if not dataset_options:
     st.warning(f"⚠️ No {selected_sport} datasets available. Check file paths or upload files.")
+    _show_timings()
     st.stop()
 
-# Sidebar dataset/sheet pickers
-dataset_options = list(st.session_state.datasets[selected_sport].keys())
-selected_dataset = st.sidebar.selectbox("📊 Select Dataset", dataset_options)
-dataset_entry = st.session_state.datasets[selected_sport][selected_dataset]
+# Sidebar dataset/sheet pickers (cataloged slates load when picked)
+selected_dataset = st.sidebar.selectbox("📊 Select Dataset", dataset_options, key="dataset_pick",
+                                        format_func=lambda l: l if l in _loaded else f"{l} · not loaded")
+if selected_dataset not in _loaded:
+    # picked on this rerun, or its first sheet is still parsing
+    if selected_dataset != _picked:
+        st.rerun()
+    if _picked_ticket is not None and _picked_ticket.done:
+        st.warning(f"⚠️ {selected_dataset} could not be loaded; see the load report.")
+    else:
+        st.info(f"⏳ {selected_dataset} is loading; it will appear here shortly.")
+    _show_timings()
+    st.stop()
+dataset_entry = _loaded[selected_dataset]
 sheet_options = list(dataset_entry["data"].keys())
 
 # Force MLB sheet order
@@ -1564,25 +723,56 @@ if selected_sport == "MLB":
     sheet_options = preferred_present + extras
 
 selected_sheet = st.sidebar.selectbox("📋 Select Sheet", sheet_options)
+render_trace = Trace(f"Render {selected_dataset} — {selected_sheet}", sport=selected_sport)
+
+def _materialize(columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """The selected sheet with `columns` (all when None) read back from the sheet cache if not loaded yet."""
+    frame = dataset_entry["data"][selected_sheet]
+    for _ in range(3):
+        missing = missing_columns(frame, columns)
+        if not missing:
+            return frame
+        with render_trace.span("fetch columns", cols=len(missing)):
+            wide = materialize(frame, missing)
+            if wide is not frame and dataset_entry.get("compact"):
+                wide = compact_frame(wide)
+        if wide is frame:
+            return frame
+        # the shared sheet dict is read-only: publish a new one so other sessions get the columns too
+        data = dataset_registry().replace_sheet(dataset_entry["key"], selected_sheet, frame, wide) \
+            if dataset_entry.get("key") else None
+        if data is None:
+            data = {**dataset_entry["data"], selected_sheet: wide}
+        dataset_entry["data"] = data
+        if data[selected_sheet] is wide:
+            return wide
+        # another session widened the sheet first; fetch what is still missing from theirs
+        frame = data[selected_sheet]
+    return frame
 
 df = dataset_entry["data"].get(selected_sheet)
 if df is None or (isinstance(df, pd.DataFrame) and df.empty):
     st.warning("⚠️ Selected sheet is empty.")
+    _show_timings()
     st.stop()
 
+def _has_range(vals: Optional[pd.Series]) -> bool:
+    """A slider needs distinct ends; a constant column (e.g. one MLB pitcher's K) gets none."""
+    return vals is not None and vals.min() < vals.max()
+
 # Sidebar: advanced filters (DK) + MLB extras
 st.sidebar.markdown("---")
 st.sidebar.subheader("🔍 Advanced Filters")
-if "DK Sal" in df.columns and df["DK Sal"].notna().any():
-    _min_sal = int(pd.to_numeric(df["DK Sal"], errors="coerce").min())
-    _max_sal = int(pd.to_numeric(df["DK Sal"], errors="coerce").max())
+_dk_sal = numeric_col(df, "DK Sal")
+if _has_range(_dk_sal):
+    _min_sal, _max_sal = int(_dk_sal.min()), int(_dk_sal.max())
     min_sal, max_sal = st.sidebar.slider("DK Salary Range", min_value=_min_sal, max_value=_max_sal, value=(_min_sal, _max_sal))
 else:
     min_sal, max_sal = None, None
 
-if "DK Proj" in df.columns and df["DK Proj"].notna().any():
-    _min_proj = float(pd.to_numeric(df["DK Proj"], errors="coerce").min())
-    _max_proj = float(pd.to_numeric(df["DK Proj"], errors="coerce").max())
+_dk_proj = numeric_col(df, "DK Proj")
+if _has_range(_dk_proj):
+    _min_proj, _max_proj = float(_dk_proj.min()), float(_dk_proj.max())
     min_proj, max_proj = st.sidebar.slider("DK Projection Range", min_value=_min_proj, max_value=_max_proj, value=(_min_proj, _max_proj), step=0.5)
 else:
     min_proj, max_proj = None, None
@@ -1594,11 +784,16 @@ selected_pitch_hand = "All"
 k_min = k_max = None
 ip_min = ip_max = None
 
+# MLB sheets load with canonical short labels (BO, K, IP); uploads may carry the long ones
+bo_col = pick_column(tuple(df.columns), "BO", "Bat Order")
+k_col = pick_column(tuple(df.columns), "K", "K Proj")
+ip_col = pick_column(tuple(df.columns), "IP", "IP Proj")
+
 if selected_sport == "MLB":
-    if "Bat Order" in df.columns and df["Bat Order"].notna().any():
-        bo_series = pd.to_numeric(df["Bat Order"], errors="coerce").dropna()
-        if not bo_series.empty:
-            _min_bo, _max_bo = int(bo_series.min()), int(bo_series.max())
+    bo_series = numeric_col(df, bo_col) if bo_col else None
+    if _has_range(bo_series):
+        _min_bo, _max_bo = int(bo_series.min()), int(bo_series.max())
+        if max(1, _min_bo) < min(9, _max_bo):
             bat_min, bat_max = st.sidebar.slider("Bat Order", min_value=max(1, _min_bo), max_value=min(9, _max_bo), value=(max(1, _min_bo), min(9, _max_bo)))
     if "Bats" in df.columns:
         bats_options = ["All"] + sorted([b for b in df["Bats"].dropna().astype(str).unique()])
@@ -1606,29 +801,32 @@ if selected_sport == "MLB":
     if "Pitcher Hand" in df.columns:
         p_hand_options = ["All"] + sorted([b for b in df["Pitcher Hand"].dropna().astype(str).unique()])
         selected_pitch_hand = st.sidebar.selectbox("Pitcher Hand (vs)", p_hand_options)
-    if "K Proj" in df.columns and df["K Proj"].notna().any():
-        k_series = pd.to_numeric(df["K Proj"], errors="coerce").dropna()
-        if not k_series.empty:
-            kmin, kmax = float(k_series.min()), float(k_series.max())
-            k_min, k_max = st.sidebar.slider("K Proj Range", min_value=kmin, max_value=kmax, value=(kmin, kmax), step=0.5)
-    if "IP Proj" in df.columns and df["IP Proj"].notna().any():
-        ip_series = pd.to_numeric(df["IP Proj"], errors="coerce").dropna()
-        if not ip_series.empty:
-            ipmin, ipmax = float(ip_series.min()), float(ip_series.max())
-            ip_min, ip_max = st.sidebar.slider("IP Proj Range", min_value=ipmin, max_value=ipmax, value=(ipmin, ipmax), step=0.1)
-
-# Main tabs
-tab1, tab2, tab3 = st.tabs(["📊 Data Explorer", "📈 Analytics", "📋 Position Summary"])
+    k_series = numeric_col(df, k_col) if k_col else None
+    if _has_range(k_series):
+        kmin, kmax = float(k_series.min()), float(k_series.max())
+        k_min, k_max = st.sidebar.slider("K Proj Range", min_value=kmin, max_value=kmax, value=(kmin, kmax), step=0.5)
+    ip_series = numeric_col(df, ip_col) if ip_col else None
+    if _has_range(ip_series):
+        ipmin, ipmax = float(ip_series.min()), float(ip_series.max())
+        ip_min, ip_max = st.sidebar.slider("IP Proj Range", min_value=ipmin, max_value=ipmax, value=(ipmin, ipmax), step=0.1)
+
+# Main tabs (analytics bodies only run while their tab is open)
+chart_key = None
+try:
+    tab1, tab2, tab3 = st.tabs(["📊 Data Explorer", "📈 Analytics", "📋 Position Summary"],
+                               key="main_tab", on_change="rerun")
+except TypeError:  # Streamlit < 1.55 (no stateful tabs): every body runs
+    tab1, tab2, tab3 = st.tabs(["📊 Data Explorer", "📈 Analytics", "📋 Position Summary"])
 
 with tab1:
     col1, col2 = st.columns([3, 1])
     with col2:
         st.subheader("📈 Quick Stats")
         st.metric("Total Rows", len(df))
-        if "DK Sal" in df.columns and df["DK Sal"].notna().any():
-            st.metric("Avg DK Salary", f"${pd.to_numeric(df['DK Sal'], errors='coerce').mean():,.0f}")
-        if "DK Proj" in df.columns and df["DK Proj"].notna().any():
-            st.metric("Avg DK Projection", f"{pd.to_numeric(df['DK Proj'], errors='coerce').mean():.1f}")
+        if _dk_sal is not None:
+            st.metric("Avg DK Salary", f"${_dk_sal.mean():,.0f}")
+        if _dk_proj is not None:
+            st.metric("Avg DK Projection", f"{_dk_proj.mean():.1f}")
         if "Pos" in df.columns:
             positions = df["Pos"].value_counts()
             st.write("**Positions:**")
@@ -1650,18 +848,18 @@ with tab1:
         with filter_col4:
             site_filter = st.selectbox("💰 Site", ["Both", "DK", "FD"])
 
-        sheet_cols = list(df.columns)
+        sheet_cols = all_columns(df)
         key_id = f"{selected_sport}::{selected_dataset}::{selected_sheet}"
         sname = selected_sheet.strip().lower()
 
         # Default visible columns per sport/sheet
         if selected_sport == "MLB":
             if "pitch" in sname:
-                default_visible = [c for c in DESIRED_MLB_PITCHERS if c in sheet_cols]
+                default_visible = [c for c in dict.fromkeys(DESIRED_MLB_PITCHERS) if c in sheet_cols]
             elif "batter" in sname or "hit" in sname:
-                default_visible = [c for c in DESIRED_MLB_BATTERS if c in sheet_cols]
+                default_visible = [c for c in dict.fromkeys(DESIRED_MLB_BATTERS) if c in sheet_cols]
             elif "stack" in sname:
-                default_visible = [c for c in DESIRED_MLB_STACKS if c in sheet_cols]
+                default_visible = [c for c in dict.fromkeys(DESIRED_MLB_STACKS) if c in sheet_cols]
             else:
                 default_visible = sheet_cols
         elif selected_sport == "NASCAR" and ("betting" in sname or "dashboard" in sname):
@@ -1686,8 +884,8 @@ with tab1:
         visible_columns = st.multiselect(
             "👁️ Visible Columns",
             options=options_cols,
-            default=options_cols,
-            help="Select which columns to display",
+            default=[c for c in options_cols if c in df.columns],
+            help="Select which columns to display; columns not loaded yet are read from the sheet cache",
         )
 
         reset_clicked = st.button("↩️ Reset to all columns", help="Show every whitelisted column")
@@ -1712,41 +910,41 @@ with tab1:
             st.success(f"Deleted preset: {selected_preset_name}")
 
         st.session_state.visible_cols[key_id] = visible_columns or options_cols
-
-        # Apply filters
-        filtered_df = df.copy()
-        name_cols = [c for c in ["Driver", "Player Name"] if c in filtered_df.columns]
-        if search_query and name_cols:
-            ncol = "Driver" if "Driver" in name_cols else name_cols[0]
-            filtered_df = filtered_df[
-                filtered_df[ncol].astype(str).str.contains(search_query, case=False, na=False)
-            ]
-        if selected_pos != "All" and "Pos" in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df["Pos"].astype(str) == selected_pos]
-        if selected_team != "All" and "Team" in filtered_df.columns:
-            filtered_df = filtered_df[filtered_df["Team"].astype(str) == selected_team]
-        if min_sal is not None and "DK Sal" in filtered_df.columns and filtered_df["DK Sal"].notna().any():
-            ds = pd.to_numeric(filtered_df["DK Sal"], errors="coerce")
-            filtered_df = filtered_df[(ds >= min_sal) & (ds <= max_sal)]
-        if min_proj is not None and "DK Proj" in filtered_df.columns and filtered_df["DK Proj"].notna().any():
-            dp = pd.to_numeric(filtered_df["DK Proj"], errors="coerce")
-            filtered_df = filtered_df[(dp >= min_proj) & (dp <= max_proj)]
+        df = _materialize(visible_columns or options_cols)
+
+        # Apply filters: one cached mask per widget value, ANDed, frame indexed once
+        filter_specs = []
+        ncol = name_column(df)
+        if search_query and ncol:
+            filter_specs.append(("contains", ncol, search_query))
+        if selected_pos != "All" and "Pos" in df.columns:
+            filter_specs.append(("equals", "Pos", selected_pos))
+        if selected_team != "All" and "Team" in df.columns:
+            filter_specs.append(("equals", "Team", selected_team))
+        if min_sal is not None and "DK Sal" in df.columns:
+            filter_specs.append(("range", "DK Sal", (min_sal, max_sal)))
+        if min_proj is not None and "DK Proj" in df.columns:
+            filter_specs.append(("range", "DK Proj", (min_proj, max_proj)))
 
         # MLB-specific row filters
         if selected_sport == "MLB":
-            if bat_min is not None and "Bat Order" in filtered_df.columns:
-                bo = pd.to_numeric(filtered_df["Bat Order"], errors="coerce")
-                filtered_df = filtered_df[(bo >= bat_min) & (bo <= bat_max)]
-            if selected_bats != "All" and "Bats" in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df["Bats"].astype(str) == selected_bats]
-            if selected_pitch_hand != "All" and "Pitcher Hand" in filtered_df.columns:
-                filtered_df = filtered_df[filtered_df["Pitcher Hand"].astype(str) == selected_pitch_hand]
-            if k_min is not None and "K Proj" in filtered_df.columns:
-                kp = pd.to_numeric(filtered_df["K Proj"], errors="coerce")
-                filtered_df = filtered_df[(kp >= k_min) & (kp <= k_max)]
-            if ip_min is not None and "IP Proj" in filtered_df.columns:
-                ip = pd.to_numeric(filtered_df["IP Proj"], errors="coerce")
-                filtered_df = filtered_df[(ip >= ip_min) & (ip <= ip_max)]
+            if bat_min is not None and bo_col:
+                filter_specs.append(("range", bo_col, (bat_min, bat_max)))
+            if selected_bats != "All" and "Bats" in df.columns:
+                filter_specs.append(("equals", "Bats", selected_bats))
+            if selected_pitch_hand != "All" and "Pitcher Hand" in df.columns:
+                filter_specs.append(("equals", "Pitcher Hand", selected_pitch_hand))
+            if k_min is not None and k_col:
+                filter_specs.append(("range", k_col, (k_min, k_max)))
+            if ip_min is not None and ip_col:
+                filter_specs.append(("range", ip_col, (ip_min, ip_max)))
+
+        with render_trace.span("filter", rows=len(df), filters=len(filter_specs)) as _rec:
+            row_mask = filter_engine(df).combine(filter_specs)
+            filtered_df = df if row_mask is None or row_mask.all() else df[row_mask]
+            _rec["kept"] = len(filtered_df)
+        if dataset_entry.get("key"):
+            chart_key = (dataset_entry["key"], selected_sheet, mask_digest(row_mask))
 
         # Site filtering
         def filter_site(df_in: pd.DataFrame, site: str) -> pd.DataFrame:
@@ -1763,7 +961,6 @@ with tab1:
             final_cols = ["Driver"] + [c for c in final_cols if c != "Driver"]
 
         display_df = pruned_df[final_cols] if final_cols else pruned_df
-        display_df = _round_numeric_for_display(display_df)
 
 # ===============================
 # SAFE TABLE RENDER + CLEAN EXPORT
@@ -1788,56 +985,103 @@ else:
     shown_rows = len(display_df) if isinstance(display_df, pd.DataFrame) else 0
     st.markdown(f"**Showing {shown_rows} of {total_rows} rows**")
 
-# keep numbers numeric for correct sorting
-display_df_clean = _round_numeric_for_display(display_df)
-
-# normalize salary columns to integers for display/export
-for col in ["DK Sal", "FD Sal", "Stack Salary"]:
-    if col in display_df_clean.columns:
-        s = pd.to_numeric(display_df_clean[col], errors="coerce")
-        display_df_clean[col] = s.round(0).astype("Int64")  # plain integers, keeps NA support
-
-# force certain metrics to 1-decimal numeric (handles object dtypes like strings)
-ONE_DEC_COLS = ["pFL", "pLL", "DK PP", "FD PP", "DK Dom", "FD Dom", "Proj Fin"]
-for col in ONE_DEC_COLS:
-    if col in display_df_clean.columns:
-        display_df_clean[col] = pd.to_numeric(display_df_clean[col], errors="coerce").round(1)
-
-st.dataframe(
-    display_df_clean,
-    use_container_width=True,
-    height=420,
-    column_config=build_column_config(display_df_clean),
+paged = st.toggle(
+    "Server-side paging", value=len(display_df) > PAGE_MODE_MIN_ROWS,
+    help="Sort and page on the server; only the visible page is sent to the browser.",
 )
 
-# Export: numeric CSV (no $, %, etc.)
-try:
-    export_filename = f"{selected_sport}_{selected_dataset}_{selected_sheet}_filtered.csv".replace(" ", "_")
-    export_bytes = display_df_clean.to_csv(index=False).encode("utf-8")
-    st.download_button(
-        "📥 Export Filtered Data",
-        data=export_bytes,
-        file_name=export_filename,
-        mime="text/csv",
-        help="Download the filtered data as CSV",
+if paged and len(display_df):
+    p1, p2, p3, p4 = st.columns([3, 1, 1, 1])
+    with p1:
+        sort_col = st.selectbox("Sort by", ["(sheet order)"] + list(display_df.columns), key="page_sort_col")
+    with p2:
+        sort_desc = st.toggle("Descending", value=True, key="page_sort_desc")
+    with p3:
+        page_size = st.selectbox("Rows / page", PAGE_SIZES, index=1, key="page_size")
+    n_pages = max(1, -(-len(display_df) // page_size))
+    with p4:
+        page_no = st.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+
+    sort_col = None if sort_col == "(sheet order)" else sort_col
+    order = cached_figure(
+        chart_key, None, f"order|{sort_col}|{sort_desc}|{','.join(map(str, display_df.columns))}",
+        lambda: sorted_positions(display_df, sort_col, sort_desc),
     )
-except Exception as e:
-    st.warning(f"Could not generate export (CSV build failed): {e}")
+    start = (int(page_no) - 1) * page_size
+    page_df = display_df.iloc[order[start:start + page_size]]
+    st.caption(f"Rows {start + 1:,}–{start + len(page_df):,} of {len(display_df):,}")
+    with render_trace.span("display_frame", rows=len(page_df), cols=page_df.shape[1]):
+        page_clean, display_specs = display_frame(page_df)
+    with render_trace.span("send table", rows=len(page_clean), paged=True):
+        st.dataframe(page_clean, use_container_width=True, height=420, column_config=column_config(display_specs))
+else:
+    # keep numbers numeric for correct sorting; one classification gives values + column config
+    with render_trace.span("display_frame", rows=len(display_df), cols=display_df.shape[1]):
+        display_df_clean, display_specs = display_frame(display_df)
+
+    with render_trace.span("send table", rows=len(display_df_clean), paged=False):
+        st.dataframe(
+            display_df_clean,
+            use_container_width=True,
+            height=420,
+            column_config=column_config(display_specs),
+        )
+
+# Export: numeric values (no $, %, etc.), serialized only when downloaded
+exp_fmt_col, exp_btn_col = st.columns([1, 3])
+with exp_fmt_col:
+    export_fmt = st.selectbox("Export format", list(EXPORT_FORMATS), key="export_fmt", label_visibility="collapsed")
+export_ext, export_mime = EXPORT_FORMATS[export_fmt]
+export_order = order if paged and len(display_df) else None
+# the other sheets of an Excel export get the same filter specs (only those they have columns for)
+export_specs = filter_specs if "filter_specs" in locals() else []
+export_key = None if chart_key is None else tuple(chart_key) + (
+    site_filter, tuple(map(str, display_df.columns)),
+    (sort_col, sort_desc) if export_order is not None else None, export_fmt,
+    tuple(export_specs) if export_fmt == "Excel" else None,
+)
+export_data = lazy_export(
+    display_df, export_order, export_fmt, selected_sheet,
+    {n: f for n, f in dataset_entry["data"].items()
+     if n != selected_sheet and isinstance(f, pd.DataFrame) and not f.empty},
+    export_key, export_specs, site_filter,
+)
+with exp_btn_col:
+    try:
+        export_filename = f"{selected_sport}_{selected_dataset}_{selected_sheet}_filtered.{export_ext}".replace(" ", "_")
+        export_help = "Download the filtered data" + (" plus the dataset's other sheets, filtered the same way" if export_fmt == "Excel" else "")
+        try:
+            st.download_button("📥 Export Filtered Data", data=export_data, file_name=export_filename,
+                               mime=export_mime, help=export_help)
+        except Exception:
+            # Streamlit < 1.52 (no deferred downloads): build now (still served from the export cache)
+            st.download_button("📥 Export Filtered Data", data=export_data().read(), file_name=export_filename,
+                               mime=export_mime, help=export_help)
+    except Exception as e:
+        st.warning(f"Could not generate export ({export_fmt} build failed): {e}")
 
 with tab2:
-    st.subheader("📊 Advanced Analytics")
-    chart_df = pruned_df if "pruned_df" in locals() else df
-    render_analytics_auto(chart_df, selected_sport, selected_sheet, site_filter)
+    if getattr(tab2, "open", True) is not False:
+        st.subheader("📊 Advanced Analytics")
+        chart_df = pruned_df if "pruned_df" in locals() else df
+        with render_trace.span("analytics", rows=len(chart_df)):
+            render_analytics_auto(chart_df, selected_sport, selected_sheet, site_filter, cache_key=chart_key)
 
 with tab3:
-    if is_nfl_projections_context(selected_sport, selected_sheet, df) and "Pos" in df.columns:
+    if getattr(tab3, "open", True) is False:
+        pass
+    elif is_nfl_projections_context(selected_sport, selected_sheet, df) and "Pos" in df.columns:
         st.subheader("📋 Position Summary (NFL Projections)")
         sites = ["DK", "FD"] if site_filter == "Both" else ([site_filter] if site_filter in ["DK","FD"] else ["DK","FD"])
+        summary_df = pruned_df if "pruned_df" in locals() else df
         for site in sites:
-            sm = nfl_position_summary(pruned_df if "pruned_df" in locals() else df, site)
-            if sm.empty:
-                continue
-            st.markdown(f"**{site} Summary**")
-            st.dataframe(sm, use_container_width=True, column_config=build_column_config(sm))
+            with render_trace.span(f"position summary {site}"):
+                sm = cached_figure(chart_key, site, "nfl_position_summary", lambda: nfl_position_summary(summary_df, site))
+                if sm.empty:
+                    continue
+                st.markdown(f"**{site} Summary**")
+                st.dataframe(sm, use_container_width=True, column_config=build_column_config(sm))
     else:
         st.info("Position Summary is available only for NFL Projections sheets.")
+
+_show_timings(render_trace)
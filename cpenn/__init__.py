@@ -0,0 +1,55 @@
+"""
+Streamlit-free core of the Cpenn slate viewer: workbook ingestion, cleaning and
+typing, the on-disk sheet cache, search/filter indexes, display formatting and
+chart builders. `app.py` is only the UI on top of this package; the same code
+runs headless via `python -m cpenn preprocess`.
+"""
+
+from .logs import capture_logs, set_log_sink, ui_log
+from .workbook import WorkbookSession
+from .schema import (
+    SchemaResolver,
+    clean_columns,
+    compact_frame,
+    frame_nbytes,
+    numeric_col,
+    percent_scale,
+    schema_resolver,
+    sheet_kind,
+    type_frame,
+)
+from .headers import HeaderMatch, detect_header, find_header
+from .csvread import read_csv_typed
+from .cache import CACHE_DIR, cache_stats, cached_sheets, clear_sheet_cache, source_fingerprint
+from .columns import all_columns, column_plan, core_columns, materialize
+from .registry import DatasetRegistry, FigureCache, dataset_registry
+from .search import FilterEngine, NameIndex, filter_engine, name_column
+from .loading import ingest_parallel, load_data_for_sport
+from .background import BackgroundLoader, LoadTicket, background_loader
+from .catalog import SlateCatalog, slate_catalog
+from .watch import SlateWatcher, slate_watcher
+from .display import (
+    EXPORT_FORMATS,
+    column_specs,
+    display_frame,
+    export_bytes,
+    filter_sheet,
+    lazy_export,
+    sorted_positions,
+)
+
+__all__ = [
+    "capture_logs", "set_log_sink", "ui_log",
+    "WorkbookSession",
+    "SchemaResolver", "clean_columns", "compact_frame", "frame_nbytes", "numeric_col",
+    "percent_scale", "schema_resolver", "sheet_kind", "type_frame",
+    "HeaderMatch", "detect_header", "find_header", "read_csv_typed",
+    "CACHE_DIR", "cache_stats", "cached_sheets", "clear_sheet_cache", "source_fingerprint",
+    "all_columns", "column_plan", "core_columns", "materialize",
+    "DatasetRegistry", "FigureCache", "dataset_registry",
+    "FilterEngine", "NameIndex", "filter_engine", "name_column",
+    "ingest_parallel", "load_data_for_sport",
+    "BackgroundLoader", "LoadTicket", "background_loader",
+    "SlateCatalog", "slate_catalog", "SlateWatcher", "slate_watcher",
+    "EXPORT_FORMATS", "column_specs", "display_frame", "export_bytes", "filter_sheet", "lazy_export", "sorted_positions",
+]
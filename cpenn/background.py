@@ -0,0 +1,203 @@
+"""
+Background slate loading. A LoadTicket parses one workbook on a worker thread
+through `ingest_parallel`, publishing each sheet as soon as it is ready, with
+the sheet a user opens first (Projections / Pitcher Projections) submitted
+first. Tickets are shared by every session in the process; other sports'
+default slates are prefetched once no foreground load is running.
+"""
+
+import os
+import time
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from .loading import ingest_parallel
+from .logs import capture_logs
+from .registry import DatasetRegistry, dataset_registry
+from .trace import Trace, tracing
+
+# The sheet each sport's viewer opens on; it is parsed ahead of the others
+PRIORITY_SHEETS = {
+    "NFL": ["Projections"],
+    "NASCAR": ["Projections"],
+    "MLB": ["Pitcher Projections"],
+}
+# Finished tickets are served from memory this long, then loads go back to the caches
+TICKET_KEEP_SECONDS = float(os.environ.get("CPENN_TICKET_KEEP", "300"))
+PREFETCH_IDLE_SECONDS = 0.5
+
+class LoadTicket:
+    """One slate loading in the background; `frames()` fills in sheet by sheet until `done`."""
+
+    def __init__(self, sport: str, job: dict, prefetch: bool = False):
+        self.sport = sport
+        self.job = job
+        self.label = job["label"]
+        self.prefetch = prefetch
+        self.trace = Trace(f"{'Prefetch' if prefetch else 'Load'} {sport} — {self.label}",
+                           sport=sport, background=True)
+        self.messages: List[Tuple[str, str]] = []
+        self.report: Optional[dict] = None
+        self.version = 0
+        self.finished_at: Optional[float] = None
+        self.thread: Optional[threading.Thread] = None
+        self._frames: Dict[str, pd.DataFrame] = {}
+        self._cond = threading.Condition()
+
+    @property
+    def done(self) -> bool:
+        return self.report is not None
+
+    def frames(self) -> Dict[str, pd.DataFrame]:
+        """Sheets parsed so far, in the job's sheet order (workbook order once done)."""
+        with self._cond:
+            frames = dict(self._frames)
+            if self.done:
+                return frames
+        rank = {str(s).strip().lower(): i for i, s in enumerate(self.job.get("sheets") or [])}
+        return dict(sorted(frames.items(), key=lambda kv: rank.get(str(kv[0]).strip().lower(), len(rank))))
+
+    def wait(self, sheets: Optional[List[str]] = None, timeout: Optional[float] = None) -> bool:
+        """Block until one of `sheets` (any sheet when None) is ready or the load finished."""
+        wanted = {str(s).strip().lower() for s in sheets or []}
+
+        def ready() -> bool:
+            if self.done:
+                return True
+            if not wanted:
+                return bool(self._frames)
+            return any(str(s).strip().lower() in wanted for s in self._frames)
+
+        with self._cond:
+            return self._cond.wait_for(ready, timeout)
+
+    def _sheet_done(self, label: str, sheet: Optional[str], data: Dict[str, pd.DataFrame]) -> None:
+        with self._cond:
+            self._frames.update(data)
+            self.version += 1
+            self._cond.notify_all()
+
+    def _file_done(self, label: str, data: Dict[str, pd.DataFrame], report: dict) -> None:
+        with self._cond:
+            self._frames = dict(data)
+            self.report = report
+            self.finished_at = time.time()
+            self.version += 1
+            self._cond.notify_all()
+
+    def run(self, shared: Optional[DatasetRegistry] = None) -> None:
+        t0 = time.perf_counter()
+        with capture_logs(lambda msg, level: self.messages.append((msg, level))), tracing(self.trace):
+            try:
+                ingest_parallel(self.sport, [self.job], on_file_done=self._file_done, shared=shared,
+                                on_sheet_done=self._sheet_done, priority=PRIORITY_SHEETS.get(self.sport))
+            except Exception as e:
+                self.messages.append((f"Background load failed: {str(e)}", "error"))
+            finally:
+                if not self.done:
+                    self._file_done(self.label, {}, {
+                        "status": "error", "sheets": [], "errors": ["background load failed"],
+                        "seconds": round(time.perf_counter() - t0, 3), "cached": False, "key": None,
+                    })
+
+class BackgroundLoader:
+    """
+    Process-wide ticket table keyed by (sport, source, sheets, size/mtime), so
+    sessions asking for the same slate share one load. Foreground tickets start
+    at once; prefetch tickets wait on an idle thread until nothing else is loading.
+    """
+
+    def __init__(self, shared: Optional[DatasetRegistry] = None):
+        self.shared = shared
+        self._lock = threading.Lock()
+        self._tickets: Dict[tuple, LoadTicket] = {}
+        self._queue: Deque[LoadTicket] = deque()
+        self._idle: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _ident(sport: str, job: dict) -> tuple:
+        src = str(job["source"])
+        try:
+            stat = os.stat(src)
+            stamp = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            stamp = None
+        return (sport, os.path.abspath(src), tuple(job.get("sheets") or ()), stamp)
+
+    def _start(self, ticket: LoadTicket) -> None:
+        ticket.thread = threading.Thread(target=ticket.run, args=(self.shared,),
+                                         name=f"cpenn-load-{ticket.label}", daemon=True)
+        ticket.thread.start()
+
+    def _prune(self) -> None:
+        cutoff = time.time() - TICKET_KEEP_SECONDS
+        for ident, t in list(self._tickets.items()):
+            if t.finished_at is not None and t.finished_at < cutoff:
+                del self._tickets[ident]
+
+    def submit(self, sport: str, job: dict) -> LoadTicket:
+        """The ticket for `job`, starting it now (or promoting a queued prefetch) if it isn't running."""
+        ident = self._ident(sport, job)
+        with self._lock:
+            self._prune()
+            ticket = self._tickets.get(ident)
+            if ticket is None:
+                ticket = self._tickets[ident] = LoadTicket(sport, job)
+            if ticket.thread is None:
+                ticket.prefetch = False
+                self._start(ticket)
+            return ticket
+
+    def prefetch(self, sport: str, jobs: List[dict]) -> None:
+        """Queue jobs to load once no foreground ticket is running."""
+        with self._lock:
+            self._prune()
+            for job in jobs:
+                ident = self._ident(sport, job)
+                if ident not in self._tickets:
+                    ticket = self._tickets[ident] = LoadTicket(sport, job, prefetch=True)
+                    self._queue.append(ticket)
+            if self._queue and (self._idle is None or not self._idle.is_alive()):
+                self._idle = threading.Thread(target=self._idle_loop, name="cpenn-prefetch", daemon=True)
+                self._idle.start()
+
+    def busy(self) -> bool:
+        """True while a foreground (non-prefetch) ticket is still loading."""
+        return any(t.thread is not None and not t.done and not t.prefetch for t in list(self._tickets.values()))
+
+    def _idle_loop(self) -> None:
+        while True:
+            with self._lock:
+                if not self._queue:
+                    self._idle = None
+                    return
+                ticket = None if self.busy() else self._queue.popleft()
+                if ticket is not None:
+                    if ticket.thread is not None:
+                        continue  # promoted by submit() meanwhile
+                    ticket.thread = threading.current_thread()
+            if ticket is None:
+                time.sleep(PREFETCH_IDLE_SECONDS)
+                continue
+            ticket.run(self.shared)
+
+    def forget_done(self) -> None:
+        """Drop finished tickets (e.g. after the sheet cache was cleared)."""
+        with self._lock:
+            for ident, t in list(self._tickets.items()):
+                if t.done:
+                    del self._tickets[ident]
+
+_LOADER: Optional[BackgroundLoader] = None
+_loader_lock = threading.Lock()
+
+def background_loader() -> BackgroundLoader:
+    """The process-wide loader; slates already in the shared dataset registry resolve without parsing."""
+    global _LOADER
+    with _loader_lock:
+        if _LOADER is None:
+            _LOADER = BackgroundLoader(dataset_registry())
+        return _LOADER
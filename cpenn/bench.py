@@ -0,0 +1,214 @@
+"""
+Benchmark suite: times each loading/render stage on synthetic slates (see
+cpenn.synth) at several sizes, records peak traced memory per stage, and
+compares against a baseline file so regressions fail the run.
+
+    python -m cpenn bench                       # compare with bench_baseline.json
+    python -m cpenn bench --save-baseline       # record a new baseline
+    python -m cpenn bench --rows 40,5000,50000  # full sweep (slow: 50k-row workbooks)
+"""
+
+import gc
+import json
+import time
+import platform
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from . import cache
+from .cleaning import _read_excel_raw, clean_columns_nascar
+from .display import display_frame
+from .loading import _parse_source, load_data_for_sport
+from .logs import set_log_sink
+from .schema import clean_columns, type_frame
+from .search import FilterEngine, NameIndex, name_column
+from .synth import SYNTH_SPORTS, synth_slates
+from .workbook import WorkbookSession
+
+BASELINE_FILE = Path(__file__).resolve().parent.parent / "bench_baseline.json"
+DEFAULT_ROWS = (40, 5000)
+
+# A stage regresses when it is slower by more than TIME_TOLERANCE (relative) and
+# MIN_SECONDS (absolute), or uses more than MEM_TOLERANCE / MIN_MB more memory.
+TIME_TOLERANCE = 0.5
+MIN_SECONDS = 0.02
+MEM_TOLERANCE = 0.25
+MIN_MB = 1.0
+
+# The sheet each sport's per-stage numbers are taken from, and where its header sits
+_MAIN_SHEET = {"NFL": ("Projections", 0), "NASCAR": ("Projections", None), "MLB": ("Batter Projections", 1)}
+
+def _best_time(fn: Callable[[], object], repeat: int, budget: float) -> List[float]:
+    times: List[float] = []
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+        if sum(times) >= budget:
+            break
+    return times
+
+def measure(fn: Callable[[], object], repeat: int = 5, budget: float = 5.0) -> dict:
+    """Best-of-`repeat` wall time (fewer runs once `budget` seconds are spent), then one traced run for peak memory."""
+    times = _best_time(fn, repeat, budget)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {"seconds": round(min(times), 5), "peak_mb": round(peak / 2**20, 3), "runs": len(times)}
+
+def _calibration_work() -> None:
+    s = pd.Series(np.arange(200_000) % 977).astype(str)
+    pd.to_numeric(s.str.replace("7", "", regex=False), errors="coerce").sum()
+    sum(i * i for i in range(200_000))
+
+def calibrate(repeat: int = 7) -> float:
+    """Seconds for a fixed string/numeric workload; baselines are rescaled by it so a slower machine isn't a regression."""
+    return round(min(_best_time(_calibration_work, repeat, budget=10.0)), 5)
+
+def _filter_specs(df: pd.DataFrame) -> List[tuple]:
+    """The filter block as a user typically sets it: a name search, one category and a salary range."""
+    specs = []
+    ncol = name_column(df)
+    if ncol:
+        specs.append(("contains", ncol, "1"))
+    for col in ("Pos", "Team"):
+        if col in df.columns and df[col].notna().any():
+            specs.append(("equals", col, str(df[col].dropna().iloc[0])))
+            break
+    if "DK Sal" in df.columns and pd.api.types.is_numeric_dtype(df["DK Sal"]):
+        lo, hi = df["DK Sal"].quantile([0.25, 0.75]).tolist()
+        specs.append(("range", "DK Sal", (float(lo), float(hi))))
+    return specs
+
+def _raw_sheet(path: Path, sheet: str, header) -> pd.DataFrame:
+    with WorkbookSession(str(path)) as book:
+        return _read_excel_raw(book, [sheet], header=header).get(sheet, pd.DataFrame())
+
+def sport_stages(sport: str, path: Path) -> Dict[str, Callable[[], object]]:
+    """Named zero-argument callables, one per stage, for one synthetic workbook."""
+    sheet, header = _MAIN_SHEET[sport]
+    raw = _raw_sheet(path, sheet, header)
+    if sport == "NASCAR":
+        clean = lambda: clean_columns_nascar(raw, sheet)  # noqa: E731
+    else:
+        clean = lambda: clean_columns(raw)  # noqa: E731
+    cleaned = clean()
+    data = _parse_source(sport, str(path))
+    typed = data.get(sheet, type_frame(cleaned, sport, sheet))
+    specs = _filter_specs(typed)
+    engine = FilterEngine(typed)
+    ncol = name_column(typed)
+
+    def search():
+        idx = NameIndex()
+        if ncol:
+            idx.add(typed[ncol])
+        return idx.rows("1")
+
+    return {
+        "load_cold": lambda: _parse_source(sport, str(path)),
+        "load_cached": lambda: load_data_for_sport(sport, str(path)),
+        "read_excel": lambda: _raw_sheet(path, sheet, header),
+        "clean_columns_nascar" if sport == "NASCAR" else "clean_columns": clean,
+        "type_frame": lambda: type_frame(cleaned, sport, sheet),
+        "display_frame": lambda: display_frame(typed),
+        "filter": lambda: FilterEngine(typed).combine(specs),
+        "filter_cached": lambda: engine.combine(specs),
+        "search": search,
+    }
+
+def run_bench(
+    rows: List[int] = DEFAULT_ROWS,
+    sports=SYNTH_SPORTS,
+    repeat: int = 5,
+    budget: float = 5.0,
+    workdir: Optional[Path] = None,
+    seed: int = 0,
+    progress: Optional[Callable[[str], None]] = None,
+) -> Dict[str, dict]:
+    """
+    Results keyed "SPORT/rows/stage", plus "calibration" (see `calibrate`).
+    Synthetic workbooks are reused from `workdir` across runs.
+    """
+    workdir = Path(workdir or Path(tempfile.gettempdir()) / "cpenn_bench")
+    results: Dict[str, dict] = {}
+    saved_cache_dir = cache.CACHE_DIR
+    set_log_sink(lambda msg, level: None)
+    calib = calibrate()
+    try:
+        with tempfile.TemporaryDirectory(prefix="cpenn_bench_cache") as tmp:
+            cache.CACHE_DIR = Path(tmp)
+            for n in rows:
+                for sport, path in synth_slates(workdir, n, seed, sports).items():
+                    stages = sport_stages(sport, path)
+                    load_data_for_sport(sport, str(path))  # prime the cache for load_cached
+                    for stage, fn in stages.items():
+                        key = f"{sport}/{n}/{stage}"
+                        results[key] = measure(fn, repeat, budget)
+                        if progress:
+                            progress(f"{key}: {results[key]['seconds'] * 1000:.1f} ms · {results[key]['peak_mb']:.1f} MB")
+    finally:
+        cache.CACHE_DIR = saved_cache_dir
+        set_log_sink(None)
+    results["calibration"] = {"seconds": min(calib, calibrate()), "peak_mb": 0.0, "runs": 0}
+    return results
+
+def environment() -> dict:
+    return {
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+    }
+
+def save_baseline(results: Dict[str, dict], path: Path = BASELINE_FILE) -> None:
+    Path(path).write_text(json.dumps({"meta": environment(), "results": results}, indent=1, sort_keys=True),
+                          encoding="utf-8")
+
+def load_baseline(path: Path = BASELINE_FILE) -> Optional[Dict[str, dict]]:
+    try:
+        return json.loads(Path(path).read_text(encoding="utf-8"))["results"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+def compare(
+    results: Dict[str, dict],
+    baseline: Dict[str, dict],
+    time_tol: float = TIME_TOLERANCE,
+    mem_tol: float = MEM_TOLERANCE,
+) -> List[str]:
+    """Human-readable regressions (empty when everything is within tolerance)."""
+    out = []
+    scale = 1.0
+    if results.get("calibration") and baseline.get("calibration"):
+        scale = results["calibration"]["seconds"] / max(baseline["calibration"]["seconds"], 1e-9)
+    for key, cur in results.items():
+        base = baseline.get(key)
+        if not base or key == "calibration":
+            continue
+        t, bt = cur["seconds"], base["seconds"] * scale
+        if t > bt * (1 + time_tol) and t - bt > MIN_SECONDS:
+            out.append(f"{key}: {bt * 1000:.1f} ms → {t * 1000:.1f} ms (+{(t / bt - 1) * 100:.0f}%)")
+        m, bm = cur["peak_mb"], base["peak_mb"]
+        if m > bm * (1 + mem_tol) and m - bm > MIN_MB:
+            out.append(f"{key}: peak {bm:.1f} MB → {m:.1f} MB (+{(m / bm - 1) * 100:.0f}%)")
+    return out
+
+def format_table(results: Dict[str, dict], baseline: Optional[Dict[str, dict]] = None) -> str:
+    lines = [f"{'stage':<44}{'ms':>11}{'peak MB':>10}{'vs base':>10}"]
+    for key, cur in results.items():
+        base = (baseline or {}).get(key)
+        delta = f"{(cur['seconds'] / base['seconds'] - 1) * 100:+.0f}%" if base and base["seconds"] else ""
+        lines.append(f"{key:<44}{cur['seconds'] * 1000:>11.1f}{cur['peak_mb']:>10.1f}{delta:>10}")
+    return "\n".join(lines)
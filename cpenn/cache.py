@@ -0,0 +1,311 @@
+"""On-disk cache of parsed sheets keyed by source fingerprint."""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .logs import ui_log
+from .workbook import _as_sheet_list, _match_sheets
+
+# ----------------------------
+# PERSISTENT SHEET CACHE (Parquet on disk)
+# ----------------------------
+CACHE_DIR = Path(os.environ.get("CPENN_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cpenn_cache"))
+CACHE_MAX_BYTES = int(float(os.environ.get("CPENN_CACHE_MAX_MB", "512")) * 1024 * 1024)
+
+# Bump when loader/cleaning output changes so stale entries are never served.
+_CACHE_VERSION = 6
+_cache_lock = threading.Lock()
+_LOCK_NAME = "index.lock"
+
+try:
+    import fcntl
+
+    def _lock_file(fh) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+
+    def _unlock_file(fh) -> None:
+        fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+except ImportError:  # Windows
+    import msvcrt
+
+    def _lock_file(fh) -> None:
+        while True:
+            try:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                return
+            except OSError:
+                continue  # LK_LOCK gives up after ~10s; keep waiting
+
+    def _unlock_file(fh) -> None:
+        fh.seek(0)
+        msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+
+@contextmanager
+def _index_lock():
+    """
+    Guard a read-modify-write of index.json. The server processes, their pool
+    workers and `python -m cpenn preprocess` can share CACHE_DIR, so a thread
+    lock alone would lose updates; this also holds an OS lock on index.lock.
+    """
+    with _cache_lock:
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            fh = open(CACHE_DIR / _LOCK_NAME, "a+b")
+        except OSError:
+            yield  # read-only cache dir: nothing will be written anyway
+            return
+        with fh:
+            _lock_file(fh)
+            try:
+                yield
+            finally:
+                _unlock_file(fh)
+
+def _parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def _cache_index_path() -> Path:
+    return CACHE_DIR / "index.json"
+
+def _read_cache_index() -> dict:
+    try:
+        idx = json.loads(_cache_index_path().read_text(encoding="utf-8"))
+    except Exception:
+        idx = {}
+    idx.setdefault("entries", {})
+    idx.setdefault("digests", {})
+    return idx
+
+def _write_cache_index(idx: dict) -> None:
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = _cache_index_path().with_suffix(f".tmp{os.getpid()}")
+        tmp.write_text(json.dumps(idx), encoding="utf-8")
+        os.replace(tmp, _cache_index_path())
+    except Exception:
+        pass
+
+def _file_digest(path: str) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def source_fingerprint(path_or_file) -> dict:
+    """
+    Path, size, mtime and content digest of a workbook/CSV source.
+    Digests of local files are memoized by (path, size, mtime) in the cache
+    index, so an unchanged file is only hashed once.
+    """
+    name = getattr(path_or_file, "name", str(path_or_file))
+    if hasattr(path_or_file, "getvalue"):
+        raw = path_or_file.getvalue()
+        digest = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        return {"path": name, "size": len(raw), "mtime": 0, "digest": digest}
+
+    path = os.path.abspath(str(path_or_file))
+    stat = os.stat(path)
+    memo_key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+    with _index_lock():
+        digest = _read_cache_index()["digests"].get(memo_key)
+    if digest is None:
+        digest = _file_digest(path)
+        with _index_lock():
+            idx = _read_cache_index()
+            idx["digests"] = {k: v for k, v in idx["digests"].items() if not k.startswith(path + "|")}
+            idx["digests"][memo_key] = digest
+            _write_cache_index(idx)
+    return {"path": path, "size": stat.st_size, "mtime": stat.st_mtime_ns, "digest": digest}
+
+def _cache_key(fp: dict, sport: str, only_sheets: Optional[List[str]]) -> str:
+    sheets = None if only_sheets is None else [str(x) for x in _as_sheet_list(only_sheets)]
+    blob = json.dumps([_CACHE_VERSION, fp["path"], fp["size"], fp["mtime"], fp["digest"], sport, sheets])
+    return hashlib.blake2b(blob.encode("utf-8"), digest_size=16).hexdigest()
+
+# (sheet, every cached column) -> the columns to read now; the rest stay on disk
+ColumnPlan = Callable[[str, List[str]], List[str]]
+
+def _read_sheet_file(fpath: Path, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    if fpath.suffix == ".pkl":
+        df = pd.read_pickle(fpath)
+        return df if columns is None else df[[c for c in df.columns if c in set(columns)]]
+    return pd.read_parquet(fpath, columns=columns)
+
+def lazy_view(df: pd.DataFrame, key: str, sheet: str, keep: List[str]) -> pd.DataFrame:
+    """`df` narrowed to `keep`, remembering where the other columns can be read back from (see cpenn.columns)."""
+    all_cols = [str(c) for c in df.columns]
+    wanted = set(keep)
+    if all(c in wanted for c in all_cols):
+        return df
+    out = df[[c for c in df.columns if str(c) in wanted]]
+    out.attrs["lazy"] = {"key": key, "sheet": sheet, "columns": all_cols}
+    return out
+
+def _cache_get(key: str, columns: Optional[ColumnPlan] = None) -> Optional[Dict[str, pd.DataFrame]]:
+    entry_dir = CACHE_DIR / key
+    meta_path = entry_dir / "meta.json"
+    if not meta_path.exists():
+        return None
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        out = {}
+        for item in meta["sheets"]:
+            fpath = entry_dir / item["file"]
+            sheet, all_cols = item["sheet"], item.get("columns")
+            if columns is None or all_cols is None:
+                out[sheet] = _read_sheet_file(fpath)
+                continue
+            keep = set(columns(sheet, all_cols))
+            df = _read_sheet_file(fpath, [c for c in all_cols if c in keep])
+            if len(df.columns) < len(all_cols):
+                df.attrs["lazy"] = {"key": key, "sheet": sheet, "columns": all_cols}
+            out[sheet] = df
+    except Exception:
+        return None
+    with _index_lock():
+        idx = _read_cache_index()
+        if key in idx["entries"]:
+            idx["entries"][key]["last_used"] = time.time()
+            _write_cache_index(idx)
+    return out
+
+def cached_sheets(fp: dict, sport: str, only_sheets: Optional[List[str]],
+                  columns: Optional[ColumnPlan] = None) -> Optional[Dict[str, pd.DataFrame]]:
+    """
+    Exact cache hit, else the requested subset of a whole-workbook entry (e.g.
+    from `python -m cpenn preprocess`). With a `columns` plan only the planned
+    columns of each sheet are read.
+    """
+    hit = _cache_get(_cache_key(fp, sport, only_sheets), columns)
+    if hit is not None or only_sheets is None:
+        return hit
+    full = _cache_get(_cache_key(fp, sport, None), columns)
+    if not full:
+        return None
+    return {sheet: full[sheet] for sheet in _match_sheets(list(full), only_sheets)}
+
+def cached_columns(key: str, sheet: str, columns: List[str]) -> Optional[pd.DataFrame]:
+    """Just `columns` of one cached sheet (None when the entry is gone)."""
+    entry_dir = CACHE_DIR / key
+    try:
+        meta = json.loads((entry_dir / "meta.json").read_text(encoding="utf-8"))
+        item = next(i for i in meta["sheets"] if i["sheet"] == sheet)
+        return _read_sheet_file(entry_dir / item["file"], list(columns))
+    except Exception:
+        return None
+
+def reusable_sheets(fp: dict, sport: str, digests: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+    """
+    Sheets of earlier cache entries for the same source file whose content
+    digest still matches `digests` (see loading.sheet_digests), newest entry
+    first, so a saved workbook only re-parses the sheets that changed.
+    """
+    if not digests:
+        return {}
+    with _index_lock():
+        entries = _read_cache_index()["entries"]
+    found: Dict[str, pd.DataFrame] = {}
+    for key in sorted(entries, key=lambda k: entries[k].get("last_used", 0), reverse=True):
+        e = entries[key]
+        if e.get("source") != fp["path"] or e.get("sport") != sport or e.get("version") != _CACHE_VERSION:
+            continue
+        entry_dir = CACHE_DIR / key
+        try:
+            meta = json.loads((entry_dir / "meta.json").read_text(encoding="utf-8"))
+            for item in meta["sheets"]:
+                sheet = item["sheet"]
+                if sheet not in found and item.get("digest") and item["digest"] == digests.get(sheet):
+                    found[sheet] = _read_sheet_file(entry_dir / item["file"])
+        except Exception:
+            continue
+    return found
+
+def _cache_put(key: str, data: Dict[str, pd.DataFrame], fp: dict, sport: str,
+               digests: Optional[Dict[str, str]] = None) -> int:
+    """Store parsed sheets under `key` (with their source `digests`, if known); returns the bytes written (0 when skipped)."""
+    if not data or not _parquet_available():
+        return 0
+    entry_dir = CACHE_DIR / key
+    tmp_dir = CACHE_DIR / f"{key}.tmp{os.getpid()}_{threading.get_ident()}"
+    try:
+        tmp_dir.mkdir(parents=True, exist_ok=True)
+        sheets, total = [], 0
+        for i, (sheet, frame) in enumerate(data.items()):
+            fname = f"{i}.parquet"
+            try:
+                frame.to_parquet(tmp_dir / fname, index=False)
+            except Exception:
+                # mixed-type object columns don't map to Arrow; keep them verbatim
+                fname = f"{i}.pkl"
+                frame.to_pickle(tmp_dir / fname)
+            total += (tmp_dir / fname).stat().st_size
+            sheets.append({"sheet": sheet, "file": fname, "columns": [str(c) for c in frame.columns],
+                           "digest": (digests or {}).get(sheet)})
+        (tmp_dir / "meta.json").write_text(json.dumps({"sheets": sheets}), encoding="utf-8")
+        shutil.rmtree(entry_dir, ignore_errors=True)
+        os.replace(tmp_dir, entry_dir)
+    except Exception as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        ui_log(f"Cache write skipped for {os.path.basename(fp['path'])}: {str(e)}", "warning")
+        return 0
+
+    with _index_lock():
+        idx = _read_cache_index()
+        idx["entries"][key] = {
+            "source": fp["path"], "sport": sport, "bytes": total, "last_used": time.time(),
+            "version": _CACHE_VERSION,
+        }
+        _evict_cache(idx, keep=key)
+        _write_cache_index(idx)
+    return total
+
+def _evict_cache(idx: dict, keep: Optional[str] = None) -> None:
+    """Drop least-recently-used entries until the cache fits CACHE_MAX_BYTES (caller holds _index_lock)."""
+    entries = idx["entries"]
+    total = sum(e.get("bytes", 0) for e in entries.values())
+    for key in sorted(entries, key=lambda k: entries[k].get("last_used", 0)):
+        if total <= CACHE_MAX_BYTES:
+            break
+        if key == keep:
+            continue
+        total -= entries[key].get("bytes", 0)
+        shutil.rmtree(CACHE_DIR / key, ignore_errors=True)
+        del entries[key]
+
+def cache_stats() -> dict:
+    idx = _read_cache_index()
+    return {
+        "entries": len(idx["entries"]),
+        "bytes": sum(e.get("bytes", 0) for e in idx["entries"].values()),
+        "limit": CACHE_MAX_BYTES,
+    }
+
+def clear_sheet_cache() -> int:
+    """Remove every cached entry; returns bytes freed."""
+    with _index_lock():
+        freed = cache_stats()["bytes"]
+        # everything but the lock file other processes may be waiting on
+        for path in CACHE_DIR.iterdir() if CACHE_DIR.exists() else ():
+            if path.name == _LOCK_NAME:
+                continue
+            if path.is_dir():
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                path.unlink(missing_ok=True)
+    return freed
+
@@ -0,0 +1,130 @@
+"""
+Slate catalog. Configured directory patterns (e.g. `Sports Models/NFL/*.xlsm`)
+are scanned for workbooks, and each file's path, size, mtime, sheet names and
+sheet kinds are kept in a small JSON index next to the sheet cache. A rescan
+stats every file but re-reads the sheet list (xl/workbook.xml only) just for
+new or changed files, so listing slates never opens a workbook.
+"""
+
+import os
+import glob
+import json
+import time
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from . import cache
+from .loading import _workbook_sheet_names
+from .logs import ui_log
+from .schema import sheet_kind
+
+SLATE_EXTS = (".xlsx", ".xlsm", ".csv")
+# Listings are served from memory this long before the directories are stat'ed again
+CATALOG_RESCAN_SECONDS = float(os.environ.get("CPENN_CATALOG_RESCAN", "30"))
+_CATALOG_VERSION = 1
+
+def _catalog_path() -> Path:
+    return cache.CACHE_DIR / "catalog.json"
+
+def _is_slate(path: str) -> bool:
+    name = os.path.basename(path)
+    return os.path.splitext(name)[1].lower() in SLATE_EXTS and not name.startswith("~$")
+
+def _describe(sport: str, path: str, stat: os.stat_result) -> dict:
+    """A catalog entry for one file: its sheet names come from the workbook's directory, not its sheets."""
+    entry = {
+        "path": path, "sport": sport, "label": os.path.splitext(os.path.basename(path))[0],
+        "size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "scanned": time.time(),
+        "sheets": [], "kinds": {}, "error": None,
+    }
+    try:
+        sheets = ["Data"] if path.lower().endswith(".csv") else _workbook_sheet_names(path)
+        entry["sheets"] = list(sheets)
+        entry["kinds"] = {s: sheet_kind(sport, s) for s in sheets}
+    except Exception as e:
+        entry["error"] = str(e)
+        ui_log(f"Could not list sheets of {os.path.basename(path)}: {str(e)}", "warning")
+    return entry
+
+class SlateCatalog:
+    """
+    Persistent, incrementally updated index of slate files, keyed by absolute
+    path. `slates()` answers from memory within CATALOG_RESCAN_SECONDS.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listed: Dict[tuple, Tuple[float, List[dict]]] = {}
+
+    def _read(self) -> dict:
+        try:
+            idx = json.loads(_catalog_path().read_text(encoding="utf-8"))
+            if idx.get("version") == _CATALOG_VERSION:
+                return idx
+        except Exception:
+            pass
+        return {"version": _CATALOG_VERSION, "slates": {}}
+
+    def _write(self, idx: dict) -> None:
+        try:
+            path = _catalog_path()
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(idx), encoding="utf-8")
+            os.replace(tmp, path)
+        except Exception as e:
+            ui_log(f"Could not write slate catalog: {str(e)}", "warning")
+
+    def scan(self, sport: str, patterns: List[str]) -> List[dict]:
+        """Rescan `patterns` now: new or changed files are described, vanished ones dropped. Newest first."""
+        files = sorted({
+            os.path.abspath(p)
+            for pattern in patterns
+            for p in glob.glob(os.path.expanduser(pattern))
+            if os.path.isfile(p) and _is_slate(p)
+        })
+        with self._lock:
+            idx = self._read()
+            slates = idx["slates"]
+            changed = False
+            for path in files:
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                old = slates.get(path)
+                if (old is None or old["sport"] != sport or old["size"] != stat.st_size
+                        or old["mtime_ns"] != stat.st_mtime_ns):
+                    slates[path] = _describe(sport, path, stat)
+                    changed = True
+            for path in [p for p, e in slates.items() if e["sport"] == sport and not os.path.exists(p)]:
+                del slates[path]
+                changed = True
+            if changed:
+                self._write(idx)
+            found = sorted((slates[p] for p in files if p in slates), key=lambda e: e["mtime_ns"], reverse=True)
+            self._listed[(sport, tuple(patterns))] = (time.monotonic(), found)
+            return found
+
+    def slates(self, sport: str, patterns: List[str], max_age: float = CATALOG_RESCAN_SECONDS) -> List[dict]:
+        """Catalog entries for `patterns`, rescanning only when the last listing is older than `max_age`."""
+        listed = self._listed.get((sport, tuple(patterns)))
+        if listed is not None and time.monotonic() - listed[0] < max_age:
+            return listed[1]
+        return self.scan(sport, patterns)
+
+    def forget(self) -> None:
+        """Drop in-memory listings so the next `slates()` call rescans."""
+        with self._lock:
+            self._listed.clear()
+
+_CATALOG: Optional[SlateCatalog] = None
+_catalog_lock = threading.Lock()
+
+def slate_catalog() -> SlateCatalog:
+    global _CATALOG
+    with _catalog_lock:
+        if _CATALOG is None:
+            _CATALOG = SlateCatalog()
+        return _CATALOG
@@ -0,0 +1,602 @@
+"""Chart builders, position summaries and the figure cache."""
+
+import os
+import hashlib
+import functools
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from .registry import FigureCache
+from .schema import percent_scale
+
+POSITION_COLORS = {
+    "QB": "#FF6B6B",
+    "RB": "#4ECDC4",
+    "WR": "#45B7D1",
+    "TE": "#96CEB4",
+    "K": "#FFEAA7",
+    "DST": "#DDA0DD",
+}
+
+# Tiny extra format helpers (used in Position Summary)
+def _fmt_currency0(x):
+    x = pd.to_numeric(x, errors="coerce")
+    return "" if pd.isna(x) else f"{int(round(x))}"
+
+def _fmt_number1(x):
+    x = pd.to_numeric(x, errors="coerce")
+    return "" if pd.isna(x) else f"{x:.1f}"
+
+def _fmt_percent1(x, scale: int = 100):
+    """`scale` is the column's recorded percent scale (schema.percent_scale): 1 means fractions."""
+    x = pd.to_numeric(x, errors="coerce")
+    if pd.isna(x): return ""
+    if scale == 1: x *= 100
+    return f"{x:.1f}%"
+
+# ======================================================
+# CONTEXT + COLUMN HELPERS & CHART BUILDERS
+# ======================================================
+def _lc_set(cols): return {str(c).strip().lower() for c in cols}
+
+def is_nascar_context(sport: str, sheet_name: str, df: pd.DataFrame) -> bool:
+    if sport.upper() == "NASCAR":
+        return True
+    hints = {"driver", "proj fin", "qual", "win%", "t3%", "t5%", "t10%", "dk dom", "fd dom"}
+    return any(h in _lc_set(df.columns) for h in hints)
+
+def is_stacks_context(sheet_name: str, df: pd.DataFrame) -> bool:
+    s = str(sheet_name).strip().lower()
+    if "stack" in s:
+        return True
+    role_cols = {"qb", "wr", "wr1", "wr2", "te", "rb", "bringback", "bring back", "stack", "stack team", "team"}
+    return len(_lc_set(df.columns).intersection(role_cols)) >= 2
+
+def is_nfl_projections_context(sport: str, sheet_name: str, df: pd.DataFrame) -> bool:
+    return (sport.upper() == "NFL") and (not is_stacks_context(sheet_name, df))
+
+# MLB context (NEW)
+def is_mlb_context(sport: str, sheet_name: str, df: pd.DataFrame) -> bool:
+    if sport.upper() == "MLB":
+        return True
+    hints = {"bat order","bats","pitcher hand","k proj","ip proj","xfip","woba","ops","team imp. tot"}
+    cols = _lc_set(df.columns)
+    return any(h in cols for h in hints)
+
+@functools.lru_cache(maxsize=512)
+def _column_lookup(cols: tuple) -> Dict[str, str]:
+    lookup: Dict[str, str] = {}
+    for c in cols:
+        lookup.setdefault(str(c).strip().lower(), c)
+    return lookup
+
+def pick_column(cols: tuple, *cands: Optional[str]) -> Optional[str]:
+    """First candidate present in `cols` (case/space-insensitive); the lookup is memoized per column set."""
+    lookup = _column_lookup(cols)
+    for c in cands:
+        if c and c.strip().lower() in lookup:
+            return lookup[c.strip().lower()]
+    return None
+
+def coalesce(df: pd.DataFrame, *cands: Optional[str]) -> Optional[str]:
+    return pick_column(tuple(df.columns), *cands)
+
+def exists_all(df: pd.DataFrame, *cols: str) -> bool:
+    present = _lc_set(df.columns)
+    return all(c.strip().lower() in present for c in cols)
+
+def _plot_frame(df: pd.DataFrame, cols: List[str]) -> pd.DataFrame:
+    """Rows complete for `cols`; compact float32 columns are widened so hovers show clean values."""
+    use = df[cols].dropna()
+    for c in use.columns.unique():
+        if use[c].dtype == np.float32:
+            use[c] = use[c].astype("float64").round(4)
+    return use
+
+# --- Large-chart helpers ---
+WEBGL_MIN_POINTS = int(os.environ.get("CPENN_WEBGL_MIN_POINTS", "1000"))
+SCATTER_MAX_POINTS = int(os.environ.get("CPENN_SCATTER_MAX_POINTS", "4000"))
+OUTLIERS_PER_METRIC = 25
+
+def _render_mode(n: int) -> str:
+    """Scattergl above WEBGL_MIN_POINTS, SVG below."""
+    return "webgl" if n > WEBGL_MIN_POINTS else "svg"
+
+def _grid_cells(v: np.ndarray, bins: int) -> np.ndarray:
+    lo, hi = float(np.min(v)), float(np.max(v))
+    if not hi > lo:
+        return np.zeros(len(v), dtype=np.int64)
+    return np.minimum(((v - lo) / (hi - lo) * bins).astype(np.int64), bins - 1)
+
+def _thin_points(use: pd.DataFrame, x: str, y: str, keep=(), max_points: int = SCATTER_MAX_POINTS) -> pd.DataFrame:
+    """
+    Density-preserving sample of a scatter's rows. Each occupied cell of an
+    (x, y) grid keeps a share proportional to its count (at least one point), and
+    the top rows of every `keep` column plus the x/y extremes are always kept, so
+    labeled outliers survive. Deterministic, so cached figures stay stable.
+    """
+    n = len(use)
+    if n <= max_points:
+        return use
+    bins = max(8, int(np.sqrt(max_points / 4)))
+    xv = use[x].to_numpy(dtype="float64")
+    yv = use[y].to_numpy(dtype="float64")
+    cell = _grid_cells(xv, bins) * bins + _grid_cells(yv, bins)
+    quota = np.maximum(1, np.floor(np.bincount(cell, minlength=bins * bins) * (max_points / n))).astype(np.int64)
+
+    order = np.random.default_rng(0).permutation(n)
+    cell_p = cell[order]
+    by_cell = np.argsort(cell_p, kind="stable")
+    sorted_cells = cell_p[by_cell]
+    rank = np.empty(n, dtype=np.int64)
+    rank[by_cell] = np.arange(n) - np.searchsorted(sorted_cells, sorted_cells, side="left")
+    chosen = np.zeros(n, dtype=bool)
+    chosen[order[rank < quota[cell_p]]] = True
+
+    for v in [xv, yv]:
+        chosen[[int(np.argmin(v)), int(np.argmax(v))]] = True
+    for col in keep:
+        if col and col in use.columns and pd.api.types.is_numeric_dtype(use[col]):
+            v = np.nan_to_num(use[col].to_numpy(dtype="float64"), nan=-np.inf)
+            chosen[np.argsort(-v, kind="stable")[:OUTLIERS_PER_METRIC]] = True
+    return use.iloc[np.flatnonzero(chosen)]
+
+def _sample_note(plot: pd.DataFrame, use: pd.DataFrame) -> str:
+    return "" if len(plot) == len(use) else f" ({len(plot):,} of {len(use):,} shown)"
+
+# --- Trend helper ---
+def _add_linear_trend(fig: go.Figure, x: pd.Series, y: pd.Series, name: str = "Trend") -> None:
+    try:
+        xv = pd.to_numeric(x, errors="coerce")
+        yv = pd.to_numeric(y, errors="coerce")
+        use = pd.DataFrame({"x": xv, "y": yv}).dropna()
+        if len(use) < 3:
+            return
+        z = np.polyfit(use["x"].values, use["y"].values, 1)
+        p = np.poly1d(z)
+        xs = np.linspace(use["x"].min(), use["x"].max(), 50)
+        fig.add_trace(go.Scatter(x=xs, y=p(xs), mode="lines", name=name, line=dict(dash="dot")))
+    except Exception:
+        pass
+
+# ----------------------------
+# NASCAR CHARTS
+# ----------------------------
+def nascar_salary_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
+    sal = coalesce(df, f"{site} Sal")
+    proj = coalesce(df, f"{site} Proj")
+    if not sal or not proj:
+        return go.Figure()
+    use = _plot_frame(df, [sal, proj] + [c for c in ["Driver"] if c in df.columns])
+    if use.empty:
+        return go.Figure()
+    plot = _thin_points(use, sal, proj, keep=[proj])
+    fig = px.scatter(
+        plot, x=sal, y=proj, hover_name="Driver" if "Driver" in use.columns else None,
+        title=f"NASCAR — {site} Salary vs {site} Projection{_sample_note(plot, use)}",
+        labels={sal:"Salary ($)", proj:"Projection"}, render_mode=_render_mode(len(plot))
+    )
+    _add_linear_trend(fig, use[sal], use[proj])
+    fig.update_layout(height=460)
+    return fig
+
+def nascar_qual_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
+    qual = coalesce(df, "Qual")
+    proj = coalesce(df, f"{site} Proj")
+    if not qual or not proj:
+        return go.Figure()
+    use = _plot_frame(df, [qual, proj] + [c for c in ["Driver"] if c in df.columns])
+    if use.empty:
+        return go.Figure()
+    plot = _thin_points(use, qual, proj, keep=[proj])
+    fig = px.scatter(
+        plot, x=qual, y=proj, hover_name="Driver" if "Driver" in use.columns else None,
+        title=f"NASCAR — Qualifying Position vs {site} Projection{_sample_note(plot, use)}",
+        labels={qual:"Qualifying (Start)", proj:"Projection"}, render_mode=_render_mode(len(plot))
+    )
+    _add_linear_trend(fig, use[qual], use[proj])
+    fig.update_layout(height=460)
+    return fig
+
+def nascar_opt_vs_own(df: pd.DataFrame, site: str) -> go.Figure:
+    opt = coalesce(df, f"{site} Opt%")
+    own = coalesce(df, f"{site} pOWN%")
+    if not opt or not own:
+        return go.Figure()
+    keep = [opt, own] + [c for c in ["Driver", f"{site} Proj"] if c in df.columns]
+    use = _plot_frame(df, keep)
+    if use.empty:
+        return go.Figure()
+    hdata = {own:":.1f", opt:":.1f"}
+    if f"{site} Proj" in use.columns:
+        hdata[f"{site} Proj"] = ":.1f"
+    plot = _thin_points(use, own, opt, keep=[opt, f"{site} Proj"])
+    fig = px.scatter(
+        plot, x=own, y=opt, hover_name="Driver" if "Driver" in use.columns else None,
+        hover_data=hdata,
+        title=f"NASCAR — {site} Optimal% vs {site} pOWN%{_sample_note(plot, use)}",
+        labels={own:f"{site} pOWN%", opt:f"{site} Optimal%"}, render_mode=_render_mode(len(plot)),
+    )
+    fig.update_layout(height=460)
+    return fig
+
+# ----------------------------
+# NFL PLAYER-LEVEL CHARTS
+# ----------------------------
+def nfl_salary_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
+    sal, proj = coalesce(df, f"{site} Sal"), coalesce(df, f"{site} Proj")
+    if not sal or not proj: return go.Figure()
+    extras = [c for c in ["Pos", "Player Name", "Team", "Opp"] if c in df.columns]
+    use = _plot_frame(df, [sal, proj] + extras)
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, sal, proj, keep=[proj, f"{site} Val"])
+    fig = px.scatter(
+        plot, x=sal, y=proj, color="Pos" if "Pos" in use.columns else None,
+        hover_name="Player Name" if "Player Name" in use.columns else None,
+        title=f"NFL — {site} Salary vs Projection{_sample_note(plot, use)}",
+        labels={sal:"Salary ($)", proj:"Projection"},
+        color_discrete_map=POSITION_COLORS if "Pos" in use.columns else None,
+        render_mode=_render_mode(len(plot))
+    )
+    _add_linear_trend(fig, use[sal], use[proj])
+    fig.update_layout(height=460, showlegend="Pos" in use.columns)
+    return fig
+
+def nfl_proj_vs_own(df: pd.DataFrame, site: str) -> go.Figure:
+    proj, own = coalesce(df, f"{site} Proj"), coalesce(df, f"{site} pOWN%")
+    val = coalesce(df, f"{site} Val")
+    if not proj or not own: return go.Figure()
+    keep = [proj, own] + [c for c in ["Pos", "Player Name", "Team", val] if c]
+    use = _plot_frame(df, keep)
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, proj, own, keep=[proj, val])
+    size = (plot[val] if val else pd.Series([8]*len(plot), index=plot.index)).abs().clip(1, None)
+    fig = px.scatter(
+        plot, x=proj, y=own, size=size,
+        color="Pos" if "Pos" in use.columns else None,
+        hover_name="Player Name" if "Player Name" in use.columns else None,
+        title=f"NFL — {site} Projection vs {site} pOWN%{_sample_note(plot, use)}",
+        labels={proj:"Projection", own:"pOWN%"},
+        color_discrete_map=POSITION_COLORS if "Pos" in use.columns else None,
+        render_mode=_render_mode(len(plot))
+    )
+    fig.update_traces(marker=dict(line=dict(width=0)))
+    _add_linear_trend(fig, use[proj], use[own])
+    fig.update_layout(height=460, showlegend="Pos" in use.columns)
+    return fig
+
+def nfl_val_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
+    val, proj = coalesce(df, f"{site} Val"), coalesce(df, f"{site} Proj")
+    if not val or not proj: return go.Figure()
+    use = _plot_frame(df, [val, proj] + [c for c in ["Pos", "Player Name"] if c in df.columns])
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, val, proj, keep=[proj, val])
+    fig = px.scatter(
+        plot, x=val, y=proj,
+        color="Pos" if "Pos" in use.columns else None,
+        hover_name="Player Name" if "Player Name" in use.columns else None,
+        title=f"NFL — {site} Value vs {site} Projection{_sample_note(plot, use)}",
+        labels={val:"Value", proj:"Projection"},
+        color_discrete_map=POSITION_COLORS if "Pos" in use.columns else None,
+        render_mode=_render_mode(len(plot))
+    )
+    _add_linear_trend(fig, use[val], use[proj])
+    fig.update_layout(height=460, showlegend="Pos" in use.columns)
+    return fig
+
+def nfl_pos_box(df: pd.DataFrame, site: str, metric: str = "Proj") -> go.Figure:
+    mcol = coalesce(df, f"{site} {metric}")
+    if "Pos" not in df.columns or not mcol: return go.Figure()
+    use = _plot_frame(df, ["Pos", mcol])
+    if use.empty: return go.Figure()
+    if len(use) > SCATTER_MAX_POINTS:
+        # Precomputed quartiles/fences: the payload is one box per position, not every row
+        fig = go.Figure()
+        for pos, vals in use.groupby("Pos", observed=True)[mcol]:
+            q1, med, q3 = vals.quantile([0.25, 0.5, 0.75]).tolist()
+            iqr = q3 - q1
+            fig.add_trace(go.Box(
+                x=[str(pos)], q1=[q1], median=[med], q3=[q3], name=str(pos), marker_color="#636efa",
+                lowerfence=[vals[vals >= q1 - 1.5 * iqr].min()], upperfence=[vals[vals <= q3 + 1.5 * iqr].max()],
+            ))
+        fig.update_layout(title=f"NFL — {site} {metric} by Position", xaxis_title="Pos", yaxis_title=metric, showlegend=False)
+    else:
+        fig = px.box(use, x="Pos", y=mcol, points="suspectedoutliers",
+                     title=f"NFL — {site} {metric} by Position", labels={mcol:metric})
+    fig.update_layout(height=460)
+    return fig
+
+# ----------------------------
+# MLB CHARTS (NEW)
+# ----------------------------
+def mlb_bat_order_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
+    order = coalesce(df, "BO", "Bat Order")
+    proj  = coalesce(df, f"{site} Proj")
+    if not order or not proj: return go.Figure()
+    use = _plot_frame(df, [order, proj] + [c for c in ["Player Name", "Player", "Team", "Pos"] if c in df.columns])
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, order, proj, keep=[proj])
+    jitter = (np.random.default_rng(0).random(len(plot)) - 0.5) * 0.08
+    fig = px.scatter(plot, x=pd.to_numeric(plot[order], errors="coerce")+jitter, y=proj,
+                     color="Pos" if "Pos" in use.columns else None,
+                     hover_name=coalesce(use, "Player Name", "Player"),
+                     title=f"MLB — Bat Order vs {site} Projection{_sample_note(plot, use)}",
+                     labels={order:"Bat Order", proj:"Projection"}, render_mode=_render_mode(len(plot)))
+    fig.update_layout(height=420, showlegend="Pos" in use.columns)
+    return fig
+
+def mlb_teamimp_vs_proj(df: pd.DataFrame, site: str) -> go.Figure:
+    imp  = coalesce(df, "V", "Team Imp. Tot")
+    proj = coalesce(df, f"{site} Proj")
+    if not imp or not proj: return go.Figure()
+    use = _plot_frame(df, [imp, proj] + [c for c in ["Player Name", "Player", "Team"] if c in df.columns])
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, imp, proj, keep=[proj])
+    fig = px.scatter(plot, x=imp, y=proj,
+                     hover_name=coalesce(use, "Player Name", "Player"),
+                     color="Team" if "Team" in use.columns else None,
+                     title=f"MLB — Team Implied Total vs {site} Projection{_sample_note(plot, use)}",
+                     labels={imp:"Team Implied Total", proj:"Projection"}, render_mode=_render_mode(len(plot)))
+    _add_linear_trend(fig, use[imp], use[proj])
+    fig.update_layout(height=420, showlegend="Team" in use.columns)
+    return fig
+
+def mlb_salary_vs_kproj(df: pd.DataFrame, site: str) -> go.Figure:
+    sal = coalesce(df, f"{site} Sal")
+    kp  = coalesce(df, "K", "K Proj")
+    if not sal or not kp: return go.Figure()
+    use = _plot_frame(df, [sal, kp] + [c for c in ["Player Name", "Player", "Team"] if c in df.columns])
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, sal, kp, keep=[kp])
+    fig = px.scatter(plot, x=sal, y=kp,
+                     hover_name=coalesce(use, "Player Name", "Player"),
+                     color="Team" if "Team" in use.columns else None,
+                     title=f"MLB — {site} Salary vs K Proj{_sample_note(plot, use)}",
+                     labels={sal:"Salary ($)", kp:"K Proj"}, render_mode=_render_mode(len(plot)))
+    _add_linear_trend(fig, use[sal], use[kp])
+    fig.update_layout(height=420, showlegend="Team" in use.columns)
+    return fig
+
+# ----------------------------
+# NFL STACKS CHARTS (with TOTAL)
+# ----------------------------
+def stacks_find_cols(df: pd.DataFrame, site: str):
+    """(team, proj, own, opt, salary, total, imp_tot) columns, resolved once per column set."""
+    return _stacks_roles(tuple(df.columns), site)
+
+@functools.lru_cache(maxsize=256)
+def _stacks_roles(cols: tuple, site: str):
+    team = pick_column(cols, "Team", "team", "Stack Team", "StackTeam")
+
+    # Total (overall stack projection total)
+    total = pick_column(
+        cols, "Total", "Stack Total", "Team Total", "Total Proj",
+        "Total Projection", "Sum Proj", "Sum Projection", "Total Proj"
+    )
+
+    # Implied total (Vegas)
+    imp_tot = pick_column(
+        cols, "Imp. Tot", "Imp Tot", "Implied Total", "Team Implied",
+        "Vegas Team Total", "Vegas Total", "Team Imp. Tot"
+    )
+
+    # Projection (fallbacks)
+    proj = pick_column(
+        cols,
+        "Stack Proj", "Stack Projection", "Team Stack Proj", "Team Stack Projection",
+        f"{site} Stack Proj",
+        "Total Stack Proj", "Total Stack Projection",
+        f"{site} Proj", "Proj", "Projection",
+        total
+    )
+
+    own = pick_column(
+        cols,
+        f"{site} Stack pOWN%", f"{site} pOWN%", "Stack pOWN%", "pOWN%",
+        "Ownership%", "Own%", "Ownership"
+    )
+    opt = pick_column(
+        cols,
+        f"{site} Stack Opt%", f"{site} Opt%", "Stack Opt%", "Opt%", "Optimal%", "Optimal %"
+    )
+    salary = pick_column(
+        cols,
+        "Stack Salary", f"{site} Stack Salary", f"{site} Sal", f"{site} Stack Sal",
+        "Salary", "Stack Price", "Total Salary", "Price", "Total Price",
+        f"{site} Stack Salary"
+    )
+    return team, proj, own, opt, salary, total, imp_tot
+
+def stacks_total_hist(df: pd.DataFrame) -> go.Figure:
+    total = coalesce(df, "Total", "Stack Total", "Total Proj", "Total Projection", "Sum Proj", "Total Proj")
+    if not total: return go.Figure()
+    use = _plot_frame(df, [total])
+    if use.empty: return go.Figure()
+    if len(use) > SCATTER_MAX_POINTS:
+        # Bin server-side so the payload is 30 bars, not every row
+        counts, edges = np.histogram(use[total].to_numpy(dtype="float64"), bins=30)
+        fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges), name="count"))
+        fig.update_layout(title="Stacks — Total Projection Distribution", xaxis_title="Total Projection",
+                          yaxis_title="count", bargap=0)
+    else:
+        fig = px.histogram(use, x=total, nbins=30, title="Stacks — Total Projection Distribution", labels={total:"Total Projection"})
+    fig.update_layout(height=420)
+    return fig
+
+def stacks_total_vs_salary(df: pd.DataFrame, site: str) -> go.Figure:
+    _, _, _, _, salary, total, _ = stacks_find_cols(df, site)
+    if not total or not salary: return go.Figure()
+    keep = [total, salary] + [c for c in ["Team"] if c in df.columns]
+    use = _plot_frame(df, keep)
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, salary, total, keep=[total])
+    fig = px.scatter(
+        plot, x=salary, y=total, color="Team" if "Team" in use.columns else None,
+        title=f"Stacks — {site} Stack Salary vs TOTAL Projection{_sample_note(plot, use)}",
+        labels={salary:"Stack Salary ($)", total:"Total Projection"}, render_mode=_render_mode(len(plot)),
+    )
+    _add_linear_trend(fig, use[salary], use[total])
+    fig.update_layout(height=460, showlegend="Team" in use.columns)
+    return fig
+
+def stacks_total_vs_imptot(df: pd.DataFrame) -> go.Figure:
+    total = coalesce(df, "Total", "Stack Total", "Total Proj", "Total Projection", "Sum Proj", "Total Proj")
+    imp   = coalesce(df, "Imp. Tot", "Imp Tot", "Implied Total", "Team Implied", "Vegas Team Total", "Vegas Total", "Team Imp. Tot")
+    if not total or not imp: return go.Figure()
+    use = _plot_frame(df, [total, imp] + [c for c in ["Team"] if c in df.columns])
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, imp, total, keep=[total])
+    fig = px.scatter(
+        plot, x=imp, y=total, color="Team" if "Team" in use.columns else None,
+        title=f"Stacks — TOTAL Projection vs Implied Total{_sample_note(plot, use)}",
+        labels={imp:"Implied Total", total:"Total Projection"}, render_mode=_render_mode(len(plot)),
+    )
+    _add_linear_trend(fig, use[imp], use[total])
+    fig.update_layout(height=460, showlegend="Team" in use.columns)
+    return fig
+
+def stacks_total_vs_own(df: pd.DataFrame, site: str) -> go.Figure:
+    total = coalesce(df, "Total", "Stack Total", "Total Proj", "Total Projection", "Sum Proj", "Total Proj")
+    own   = coalesce(df, f"{site} Stack pOWN%", f"{site} pOWN%", "Stack pOWN%", "pOWN%", "Own%")
+    if not total or not own: return go.Figure()
+    keep = [total, own] + [c for c in ["Team"] if c in df.columns]
+    use = _plot_frame(df, keep)
+    if use.empty: return go.Figure()
+    plot = _thin_points(use, own, total, keep=[total])
+    fig = px.scatter(
+        plot, x=own, y=total, color="Team" if "Team" in use.columns else None,
+        title=f"Stacks — TOTAL Projection vs {site} pOWN%{_sample_note(plot, use)}",
+        labels={own:f"{site} pOWN%", total:"Total Projection"}, render_mode=_render_mode(len(plot)),
+    )
+    fig.update_layout(height=460, showlegend="Team" in use.columns)
+    return fig
+
+def stacks_opt_vs_own(df: pd.DataFrame, site: str) -> go.Figure:
+    team, proj, own, opt, salary, _, _ = stacks_find_cols(df, site)
+    if not own or not opt: return go.Figure()
+    keep = [own, opt] + [c for c in [proj, team, salary] if c]
+    use = _plot_frame(df, keep)
+    if use.empty: return go.Figure()
+    hdata = {own:":.1f", opt:":.1f"}
+    if proj:   hdata[proj] = ":.1f"
+    if salary: hdata[salary] = ":,.0f"
+    plot = _thin_points(use, own, opt, keep=[opt, proj])
+    fig = px.scatter(
+        plot, x=own, y=opt, color=team if team else None,
+        hover_data=hdata,
+        title=f"Stacks — {site} Stack Optimal% vs {site} Stack pOWN%{_sample_note(plot, use)}",
+        labels={own:f"{site} pOWN%", opt:f"{site} Optimal%"}, render_mode=_render_mode(len(plot)),
+    )
+    fig.update_layout(height=460, showlegend=bool(team))
+    return fig
+
+def stacks_table(df: pd.DataFrame, site: str) -> pd.DataFrame:
+    team, proj, own, opt, salary, total, _ = stacks_find_cols(df, site)
+    cols = [c for c in [team, total or proj, own, opt, salary] if c]
+    if not cols: return pd.DataFrame()
+    out = df[cols].copy()
+    ren = {}
+    if team: ren[team] = "Team"
+    if total or proj: ren[total or proj] = "Total Proj" if total else "Proj"
+    if own:  ren[own]  = f"{site} pOWN%"
+    if opt:  ren[opt]  = f"{site} Opt%"
+    if salary: ren[salary] = "Stack Salary"
+    out = out.rename(columns=ren)
+    if f"{site} Opt%" in out.columns and f"{site} pOWN%" in out.columns:
+        out[f"{site} Lev%"] = out[f"{site} Opt%"] - out[f"{site} pOWN%"]
+    sort_col = "Total Proj" if "Total Proj" in out.columns else ("Proj" if "Proj" in out.columns else None)
+    if sort_col:
+        out = out.sort_values(sort_col, ascending=False)
+    return out
+
+# ----------------------------
+# FIGURE CACHE (analytics + summaries)
+# ----------------------------
+# Module-level, so one LRU per server process, keyed on (dataset fingerprint, sheet, mask hash, site, chart id)
+_FIGURES = FigureCache()
+
+def figure_cache() -> FigureCache:
+    return _FIGURES
+
+def mask_digest(mask: Optional[np.ndarray]) -> str:
+    """Short stable hash of a row mask ("all" when nothing is filtered)."""
+    if mask is None or mask.all():
+        return "all"
+    return hashlib.blake2b(np.packbits(mask).tobytes(), digest_size=8).hexdigest()
+
+def cached_figure(cache_key: Optional[tuple], site: Optional[str], chart_id: str, build: Callable[[], object]):
+    """`build()` through the figure cache; `cache_key` is (dataset fingerprint, sheet, mask hash) or None."""
+    if cache_key is None:
+        return build()
+    return figure_cache().get_or_build(tuple(cache_key) + (site, chart_id), build)
+
+# ----------------------------
+# NFL-ONLY POSITION SUMMARY (unchanged)
+# ----------------------------
+def nfl_position_summary(df: pd.DataFrame, site: str) -> pd.DataFrame:
+    if "Pos" not in df.columns:
+        return pd.DataFrame()
+
+    base_cols = {
+        "Sal": f"{site} Sal",
+        "Proj": f"{site} Proj",
+        "Val": f"{site} Val",
+        "Own": f"{site} pOWN%",
+    }
+    have = {k: v for k, v in base_cols.items() if v in df.columns}
+    if not have:
+        return pd.DataFrame()
+
+    have = {k: v for k, v in have.items() if pd.api.types.is_numeric_dtype(df[v])}
+    if not have:
+        return pd.DataFrame()
+
+    d = df[["Pos"] + list(have.values())]
+    g = d.groupby("Pos", observed=True).agg({v: ["count", "mean", "std"] for v in have.values()})
+    g.columns = [f"{orig}_{stat}" for orig, stat in g.columns]
+    out = g.reset_index()
+    if f"{base_cols['Proj']}_mean" in out.columns:
+        out = out.sort_values(f"{base_cols['Proj']}_mean", ascending=False, kind="stable")
+
+    cols_display = ["Pos"]
+    rows = []
+
+    for _, row in out.iterrows():
+        r = {"Pos": row["Pos"]}
+
+        if base_cols.get("Sal") and f"{base_cols['Sal']}_count" in out.columns:
+            r["Count"] = int(row[f"{base_cols['Sal']}_count"])
+            mean_sal = row.get(f"{base_cols['Sal']}_mean", pd.NA)
+            std_sal  = row.get(f"{base_cols['Sal']}_std", pd.NA)
+            r[f"{site} Sal (mean)"] = _fmt_currency0(mean_sal)
+            r[f"{site} Sal (std)"]  = _fmt_currency0(std_sal)
+            if "Count" not in cols_display:
+                cols_display.extend(["Count", f"{site} Sal (mean)", f"{site} Sal (std)"])
+
+        if base_cols.get("Proj") and f"{base_cols['Proj']}_mean" in out.columns:
+            r[f"{site} Proj (mean)"] = _fmt_number1(row[f"{base_cols['Proj']}_mean"])
+            r[f"{site} Proj (std)"]  = _fmt_number1(row[f"{base_cols['Proj']}_std"])
+            if f"{site} Proj (mean)" not in cols_display:
+                cols_display.extend([f"{site} Proj (mean)", f"{site} Proj (std)"])
+
+        if base_cols.get("Val") and f"{base_cols['Val']}_mean" in out.columns:
+            r[f"{site} Val (mean)"] = _fmt_number1(row[f"{base_cols['Val']}_mean"])
+            r[f"{site} Val (std)"]  = _fmt_number1(row[f"{base_cols['Val']}_std"])
+            if f"{site} Val (mean)" not in cols_display:
+                cols_display.extend([f"{site} Val (mean)", f"{site} Val (std)"])
+
+        if base_cols.get("Own") and f"{base_cols['Own']}_mean" in out.columns:
+            own_scale = percent_scale(df, base_cols["Own"])
+            r[f"{site} pOWN% (mean)"] = _fmt_percent1(row[f"{base_cols['Own']}_mean"], own_scale)
+            r[f"{site} pOWN% (std)"]  = _fmt_percent1(row[f"{base_cols['Own']}_std"], own_scale)
+            if f"{site} pOWN% (mean)" not in cols_display:
+                cols_display.extend([f"{site} pOWN% (mean)", f"{site} pOWN% (std)"])
+
+        rows.append(r)
+
+    return pd.DataFrame(rows, columns=cols_display)
+
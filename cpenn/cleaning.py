@@ -0,0 +1,182 @@
+"""Sheet readers and cleaners (NASCAR fast path and fallbacks, raw Excel reads)."""
+
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .headers import HEADER_SCAN_ROWS, detect_header, find_header, warn_if_low
+from .logs import ui_log
+from .trace import traced
+from .schema import (
+    _SHEET_WHITELISTS,
+    EXCLUDE_PATTERNS,
+    _blank_mask,
+    clean_columns,
+    schema_resolver,
+    sheet_kind,
+    type_frame,
+)
+from .workbook import WorkbookSession, _dedupe_headers, _is_blank, _key_index
+
+# ----------------------------
+# FAST NASCAR SHEET READER
+# ----------------------------
+def _fast_read_nascar_sheet(book: WorkbookSession, sheet_name: str,
+                            desired_columns: List[str]) -> Optional[pd.DataFrame]:
+    """
+    One bounded read of the desired columns under the detected header. Returns
+    None when the sheet is missing or none of its columns are recognized; read
+    errors propagate so the caller can fall back.
+    """
+    if sheet_name not in book.sheet_names:
+        return None
+    match = find_header(book, sheet_name, "NASCAR")
+    hit = {c: i for c, i in match.columns.items() if c in desired_columns}
+    if not hit:
+        return None
+
+    key_col = hit.get("Driver", _key_index(match.labels))
+    indices = sorted(hit.values())
+    df = book.frame(sheet_name, header=match.row, usecols=indices, key_col=key_col)
+    by_index = {i: c for c, i in hit.items()}
+    df.columns = pd.Index([by_index[i] for i in indices])
+    df = df.reindex(columns=desired_columns)
+
+    df = type_frame(df, "NASCAR", sheet_name)
+
+    if "Qual" in df.columns and "Proj Fin" in df.columns and "PD" not in df.columns:
+        try:
+            df["PD"] = df["Qual"].astype("float64") - df["Proj Fin"].astype("float64")
+        except Exception:
+            pass
+
+    return df
+
+# ----------------------------
+# SHEET RESOLUTION / RAW READERS
+# ----------------------------
+def resolve_allowed_sheets(book: WorkbookSession, desired: Optional[List[str]]) -> List[str]:
+    try:
+        return book.resolve(desired)
+    except Exception as e:
+        ui_log(f"Error resolving sheets: {str(e)}", "error")
+        return []
+
+def _read_excel_raw(book: WorkbookSession, sheet_names: List[str], header) -> Dict[str, pd.DataFrame]:
+    try:
+        out = {}
+        for sheet in sheet_names:
+            key_col = None
+            if header is not None:
+                probe = book.head(sheet, header + 1)
+                key_col = _key_index(probe[header]) if header < len(probe) else None
+            out[sheet] = book.frame(sheet, header=header, key_col=key_col)
+        return out
+    except Exception as e:
+        ui_log(f"Error reading Excel sheets: {str(e)}", "error")
+        return {}
+
+# ----------------------------
+# NASCAR CLEANER (FALLBACK)
+# ----------------------------
+@traced("clean_columns_nascar fallback")
+def clean_columns_nascar(df: pd.DataFrame, sheet_name: str) -> pd.DataFrame:
+    if df is None or df.empty:
+        return pd.DataFrame()
+    try:
+        df = pd.DataFrame(df)
+
+        match = detect_header(df.iloc[:HEADER_SCAN_ROWS].values.tolist(), "NASCAR", sheet_name)
+        warn_if_low(match, sheet_name)
+        best_idx = match.row
+
+        try:
+            header_vals = [str(x).strip() for x in df.iloc[best_idx].tolist()]
+            df = df.iloc[best_idx + 1:].copy()
+            df.columns = _dedupe_headers(header_vals)
+        except Exception:
+            return pd.DataFrame()
+
+        # positional masks: a label that repeats (e.g. after the renames below) must not be selected twice
+        valid = [bool(c) and not c.lower().startswith("unnamed") for c in df.columns]
+        if not any(valid):
+            return pd.DataFrame()
+        df = df.loc[:, valid]
+
+        renames = {
+            "Qual": "Start Pos",
+            "qual": "Start Pos",
+            "Start": "Start Pos",
+            "DK Pro": "DK Proj",
+            "FD Pro": "FD Proj",
+            "DK Proj.": "DK Proj",
+            "FD Proj.": "FD Proj",
+            "Proj Finish": "Proj Fin",
+            "ProjFin": "Proj Fin",
+            "LL": "pLL",
+            "DK Salary": "DK Sal",
+            "FD Salary": "FD Sal",
+        }
+        df = df.rename(columns={c: renames.get(c, c) for c in df.columns})
+
+        if "Driver" not in df.columns:
+            for cand in ["Player Name", "Player", "Name"]:
+                if cand in df.columns:
+                    df = df.rename(columns={cand: "Driver"})
+                    break
+
+        keep = [not any(rx.search(str(c)) for rx in EXCLUDE_PATTERNS) for c in df.columns]
+        df = df.loc[:, keep].copy()
+        df.columns = _dedupe_headers([str(c).strip() for c in df.columns])
+
+        return type_frame(df, "NASCAR", sheet_name)
+    except Exception as e:
+        ui_log(f"Error cleaning NASCAR columns: {str(e)}", "error")
+        return pd.DataFrame()
+
+# ----------------------------
+# MLB SHEET READER (single pass)
+# ----------------------------
+def _read_mlb_sheet(book: WorkbookSession, sheet_name: str) -> Optional[pd.DataFrame]:
+    """
+    Read an MLB sheet once with no header, find the header among the rows
+    already in memory, then apply the MLB aliases, the sheet's whitelist and typing.
+    """
+    try:
+        raw = book.frame(sheet_name, header=None)
+        if raw.empty:
+            return None
+        hdr = find_header(book, sheet_name, "MLB").row
+        head = raw.iloc[hdr].tolist()
+        body = raw.iloc[hdr + 1:]
+
+        # labelled, non-empty columns only; a blank helper column must not claim its label
+        blanks = {}
+        for i, label in enumerate(head):
+            if pd.isna(label) or _is_blank(label):
+                continue
+            mask = _blank_mask(body.iloc[:, i])
+            if not mask.all():
+                blanks[i] = mask
+        if not blanks:
+            return None
+        key_col = _key_index(head)
+        if key_col in blanks:
+            empty_row = blanks[key_col]
+        else:
+            empty_row = pd.concat(list(blanks.values()), axis=1).all(axis=1)
+
+        df = body.loc[~empty_row.to_numpy(), :].iloc[:, list(blanks)]
+        df.columns = _dedupe_headers([str(head[i]).strip() for i in blanks])
+        df = clean_columns(df.reset_index(drop=True))
+        df = schema_resolver("MLB", sheet_name).apply(df)
+
+        wanted = _SHEET_WHITELISTS.get(sheet_kind("MLB", sheet_name))
+        if wanted:
+            keep = [c for c in dict.fromkeys(wanted) if c in df.columns]
+            if keep:
+                df = df[keep]
+        return type_frame(df, "MLB", sheet_name)
+    except Exception as e:
+        ui_log(f"Error reading MLB sheet {sheet_name}: {str(e)}", "error")
+        return None
@@ -0,0 +1,213 @@
+"""
+Command line entry points (`python -m cpenn ...`).
+
+preprocess: headless batch preprocessing. Parses every slate workbook in a
+directory (sheets in parallel, the same pool the app uses), stores the cleaned,
+typed sheets in the Parquet sheet cache the app reads from, and optionally
+mirrors them to plain Parquet files:
+
+    python -m cpenn preprocess "Sports Models/2025 NASCAR" --out parsed/
+
+bench / synth: the benchmark suite and its synthetic workbook generator.
+"""
+
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from . import cache, loading
+from .bench import (
+    BASELINE_FILE,
+    DEFAULT_ROWS,
+    MEM_TOLERANCE,
+    TIME_TOLERANCE,
+    compare,
+    format_table,
+    load_baseline,
+    run_bench,
+    save_baseline,
+)
+from .logs import set_log_sink, ui_log
+from .synth import synth_slates
+
+WORKBOOK_EXTS = (".xlsx", ".xlsm", ".csv")
+SPORTS = ("NFL", "NASCAR", "MLB")
+
+def guess_sport(path: Path) -> str:
+    """Sheet names first (Betting Dashboard / Pitchers / Batters), then the folder name; NFL otherwise."""
+    names = ""
+    if path.suffix.lower() != ".csv":
+        try:
+            names = " ".join(loading._workbook_sheet_names(str(path))).lower()
+        except Exception:
+            names = ""
+    if "betting" in names or "dashboard" in names:
+        return "NASCAR"
+    if "pitcher" in names or "batter" in names:
+        return "MLB"
+    hint = str(path).lower()
+    for sport in ("NASCAR", "MLB"):
+        if sport.lower() in hint:
+            return sport
+    return "NFL"
+
+def find_workbooks(root: Path, recursive: bool = False) -> List[Path]:
+    pattern = "**/*" if recursive else "*"
+    return sorted(
+        p for p in root.glob(pattern)
+        if p.is_file() and p.suffix.lower() in WORKBOOK_EXTS and not p.name.startswith("~$")
+    )
+
+def _safe_name(name: str) -> str:
+    return re.sub(r"[^\w\-. ]+", "_", str(name)).strip() or "sheet"
+
+def write_parquet(out_dir: Path, label: str, data: Dict[str, pd.DataFrame]) -> List[Path]:
+    """Mirror one workbook's sheets to <out_dir>/<workbook stem>/<sheet>.parquet."""
+    target = out_dir / _safe_name(label)
+    target.mkdir(parents=True, exist_ok=True)
+    written = []
+    for sheet, frame in data.items():
+        path = target / f"{_safe_name(sheet)}.parquet"
+        frame.to_parquet(path, index=False)
+        written.append(path)
+    return written
+
+def preprocess(
+    root: Path,
+    sport: str = "auto",
+    sheets: Optional[List[str]] = None,
+    out_dir: Optional[Path] = None,
+    recursive: bool = False,
+) -> Dict[str, dict]:
+    """Preprocess every workbook under `root`; returns the per-file ingest report keyed by path."""
+    files = find_workbooks(root, recursive)
+    by_sport: Dict[str, List[dict]] = {}
+    for path in files:
+        s = guess_sport(path) if sport == "auto" else sport
+        by_sport.setdefault(s, []).append({"label": str(path), "source": str(path), "sheets": sheets})
+
+    report: Dict[str, dict] = {}
+
+    def on_file_done(label: str, data: Dict[str, pd.DataFrame], rep: dict) -> None:
+        if out_dir is not None and data:
+            try:
+                write_parquet(out_dir, Path(label).stem, data)
+            except Exception as e:
+                rep["errors"].append(f"parquet export failed: {str(e)}")
+                rep["status"] = "partial"
+        tag = "cached" if rep["cached"] else f"{rep['seconds']:.2f}s"
+        print(f"[{rep['sport']}] {Path(label).name}: {rep['status']} · {len(rep['sheets'])} sheet(s) · {tag}")
+        for err in rep["errors"]:
+            ui_log(f"{Path(label).name}: {err}", "warning")
+
+    for s, jobs in by_sport.items():
+        def done(label, data, rep, s=s):
+            rep["sport"] = s
+            on_file_done(label, data, rep)
+        report.update(loading.ingest_parallel(s, jobs, on_file_done=done))
+    return report
+
+def _stderr_sink(verbose: bool):
+    def sink(msg: str, level: str) -> None:
+        if verbose or level in ("warning", "error"):
+            print(msg, file=sys.stderr)
+    return sink
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m cpenn", description="Cpenn slate tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    pre = sub.add_parser("preprocess", help="parse a directory of slate workbooks into the Parquet sheet cache")
+    pre.add_argument("directory", type=Path)
+    pre.add_argument("--sport", choices=("auto",) + SPORTS, default="auto",
+                     help="sport for every workbook (default: guess per file)")
+    pre.add_argument("--sheets", default=None,
+                     help="comma-separated sheet names to keep (default: every sheet)")
+    pre.add_argument("--out", type=Path, default=None,
+                     help="also write <out>/<workbook>/<sheet>.parquet")
+    pre.add_argument("--workers", type=int, default=None, help="parallel sheet parsers")
+    pre.add_argument("--cache-dir", type=Path, default=None,
+                     help="sheet cache location (default: CPENN_CACHE_DIR or .cpenn_cache)")
+    pre.add_argument("-r", "--recursive", action="store_true", help="search subdirectories too")
+    pre.add_argument("-v", "--verbose", action="store_true", help="show per-sheet loader messages")
+
+    bench = sub.add_parser("bench", help="time and memory-profile each load/render stage on synthetic slates")
+    bench.add_argument("--rows", default=",".join(str(n) for n in DEFAULT_ROWS),
+                       help="comma-separated player counts per workbook (default: %(default)s)")
+    bench.add_argument("--sports", default=",".join(SPORTS), help="comma-separated sports (default: %(default)s)")
+    bench.add_argument("--repeat", type=int, default=5, help="best-of-N timing runs per stage")
+    bench.add_argument("--budget", type=float, default=5.0, help="stop repeating a stage after this many seconds")
+    bench.add_argument("--workdir", type=Path, default=None, help="where synthetic workbooks are generated and reused")
+    bench.add_argument("--baseline", type=Path, default=BASELINE_FILE, help="baseline file (default: %(default)s)")
+    bench.add_argument("--save-baseline", action="store_true", help="write the results as the new baseline")
+    bench.add_argument("--time-tolerance", type=float, default=TIME_TOLERANCE)
+    bench.add_argument("--mem-tolerance", type=float, default=MEM_TOLERANCE)
+    bench.add_argument("--json", type=Path, default=None, help="also write the raw results here")
+
+    synth = sub.add_parser("synth", help="write synthetic NFL/NASCAR/MLB slate workbooks")
+    synth.add_argument("directory", type=Path)
+    synth.add_argument("--rows", type=int, default=200)
+    synth.add_argument("--seed", type=int, default=0)
+    synth.add_argument("--sports", default=",".join(SPORTS))
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        return _bench(args)
+    if args.command == "synth":
+        for sport, path in synth_slates(args.directory, args.rows, args.seed, _csv(args.sports)).items():
+            print(f"[{sport}] {path}")
+        return 0
+
+    if not args.directory.is_dir():
+        parser.error(f"not a directory: {args.directory}")
+    if args.workers:
+        loading.INGEST_WORKERS = max(1, args.workers)
+    if args.cache_dir is not None:
+        cache.CACHE_DIR = args.cache_dir
+    sheets = [s.strip() for s in args.sheets.split(",") if s.strip()] if args.sheets else None
+
+    set_log_sink(_stderr_sink(args.verbose))
+
+    report = preprocess(args.directory, args.sport, sheets, args.out, args.recursive)
+    if not report:
+        print(f"No workbooks found in {args.directory}", file=sys.stderr)
+        return 1
+    failed = sum(1 for r in report.values() if r["status"] == "error")
+    stats = cache.cache_stats()
+    print(f"{len(report) - failed}/{len(report)} workbook(s) preprocessed · cache "
+          f"{stats['entries']} entries, {stats['bytes'] / 1024 / 1024:.1f} MB in {cache.CACHE_DIR}")
+    return 1 if failed else 0
+
+def _csv(text: str) -> List[str]:
+    return [s.strip() for s in str(text).split(",") if s.strip()]
+
+def _bench(args) -> int:
+    rows = [int(n) for n in _csv(args.rows)]
+    sports = [s.upper() for s in _csv(args.sports)]
+    results = run_bench(rows, sports, args.repeat, args.budget, args.workdir,
+                        progress=lambda line: print(line, file=sys.stderr))
+    if args.json is not None:
+        args.json.write_text(json.dumps(results, indent=1), encoding="utf-8")
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(format_table(results))
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    print(format_table(results, baseline))
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one.", file=sys.stderr)
+        return 0
+    regressions = compare(results, baseline, args.time_tolerance, args.mem_tolerance)
+    for line in regressions:
+        print(f"REGRESSION {line}", file=sys.stderr)
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+"""
+On-demand columns for wide sheets. Slates are loaded with only the columns in
+use (sheet whitelist or the non-stat columns, saved presets and the filter
+keys); the rest stay in the Parquet sheet cache and are read back when a view
+asks for them.
+"""
+
+import re
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+from .cache import ColumnPlan, cached_columns
+from .logs import ui_log
+from .schema import _SHEET_WHITELISTS, NAME_KEYS, sheet_kind
+
+# Everything the sidebar filters, search and quick stats read, so a sheet renders without a fetch
+FILTER_KEYS = [
+    "Player Name", "Driver", "Player", "Name", "Pos", "Team", "Opp",
+    "DK Sal", "FD Sal", "DK Proj", "FD Proj",
+    "Bat Order", "Bats", "Pitcher Hand", "K Proj", "IP Proj",
+]
+
+# Per-player stat lines (NFL passing/rushing/receiving and the like) load only when shown
+_STAT_RX = re.compile(
+    r"^(pa|ru|rush|rushing|pass|passing|rec|receiving|tgt|targets|carries|comp%?|int|fum)(?![a-z0-9])", re.I)
+
+def is_stat_column(col) -> bool:
+    return bool(_STAT_RX.match(str(col).strip()))
+
+def core_columns(sport: str, sheet: str, all_cols: List[str], extra: Iterable[str] = ()) -> List[str]:
+    """
+    Columns to materialize up front: the sheet's whitelist when it has one,
+    otherwise every non-stat column, plus the filter keys and `extra`. A sheet
+    none of whose columns are recognized loads whole.
+    """
+    whitelist = _SHEET_WHITELISTS.get(sheet_kind(sport, sheet))
+    wanted = set(FILTER_KEYS) | NAME_KEYS | set(extra or ())
+    if whitelist:
+        wanted |= set(whitelist)
+    else:
+        wanted |= {c for c in all_cols if not is_stat_column(c)}
+    return [c for c in all_cols if c in wanted] or list(all_cols)
+
+def column_plan(sport: str, extra: Optional[Dict[str, List[str]]] = None) -> ColumnPlan:
+    """A cache read plan: `core_columns` per sheet, with `extra` columns (e.g. saved presets) by sheet name."""
+    extra = extra or {}
+    return lambda sheet, all_cols: core_columns(sport, sheet, all_cols, extra.get(sheet, ()))
+
+def all_columns(df: pd.DataFrame) -> List[str]:
+    """Every column of the sheet, including the ones not materialized yet."""
+    lazy = df.attrs.get("lazy")
+    return list(lazy["columns"]) if lazy else list(df.columns)
+
+def missing_columns(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> List[str]:
+    lazy = df.attrs.get("lazy")
+    if not lazy:
+        return []
+    wanted = lazy["columns"] if columns is None else set(columns)
+    have = set(df.columns)
+    return [c for c in lazy["columns"] if c in wanted and c not in have]
+
+def materialize(df: pd.DataFrame, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    `df` with `columns` (all when None) read back from the sheet cache, in the
+    sheet's column order. Returns `df` itself when nothing is missing or the
+    cache entry is gone.
+    """
+    missing = missing_columns(df, columns)
+    if not missing:
+        return df
+    lazy = df.attrs["lazy"]
+    extra = cached_columns(lazy["key"], lazy["sheet"], missing)
+    if extra is None or len(extra) != len(df):
+        ui_log(f"Columns {missing} of {lazy['sheet']} are no longer cached; reload the slate to see them", "warning")
+        return df
+    extra.index = df.index
+    merged = pd.concat([df, extra], axis=1)
+    order = [c for c in lazy["columns"] if c in merged.columns]
+    out = merged[order]
+    out.attrs = dict(df.attrs)
+    if len(order) == len(lazy["columns"]):
+        out.attrs.pop("lazy", None)
+    return out
@@ -0,0 +1,210 @@
+"""
+Chunked, typed CSV ingestion for large uploads (contest standings, DK/FD
+salary exports). The header is sniffed from the first rows against the sport's
+alias vocabulary (cpenn.headers); only labelled columns are read, text columns
+as strings and known numeric columns as float64, and each chunk is typed as it
+arrives, so peak memory stays a small multiple of the final frame. pyarrow's
+streaming CSV reader is used when it is installed.
+"""
+
+import io
+import os
+import csv
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+import pandas as pd
+
+from .headers import HEADER_SCAN_ROWS, detect_header, warn_if_low
+from .logs import ui_log
+from .schema import (
+    _NA_TOKENS,
+    CATEGORY_KEYS,
+    EXCLUDE_PATTERNS,
+    NAME_KEYS,
+    _blank_mask,
+    _to_number,
+    clean_columns,
+    is_percent_col,
+    sheet_schema,
+    standardize_columns,
+    type_frame,
+)
+from .trace import span
+from .workbook import _dedupe_headers
+
+CSV_CHUNK_ROWS = int(os.environ.get("CPENN_CSV_CHUNK_ROWS", "100000"))
+# auto: pyarrow when installed, else the pandas C parser
+CSV_ENGINE = os.environ.get("CPENN_CSV_ENGINE", "auto")
+_ARROW_BLOCK_BYTES = 8 << 20
+_SNIFF_BYTES = 256 << 10
+_NA_VALUES = sorted({v for t in _NA_TOKENS if t for v in (t, t.upper(), t.title())})
+
+def _arrow_csv():
+    try:
+        import pyarrow.csv as pacsv
+        return pacsv
+    except ImportError:
+        return None
+
+def _open_binary(path_or_file):
+    if hasattr(path_or_file, "read"):
+        path_or_file.seek(0)
+        return path_or_file, False
+    return open(path_or_file, "rb"), True
+
+def _size(fh) -> int:
+    pos = fh.tell()
+    fh.seek(0, io.SEEK_END)
+    size = fh.tell()
+    fh.seek(pos)
+    return max(size, 1)
+
+def _cell(v: str):
+    """A sniffed cell: None when blank, a float when it reads as a number, else the text."""
+    s = v.strip()
+    if not s:
+        return None
+    try:
+        return float(s.replace(",", "").replace("$", "").rstrip("%"))
+    except ValueError:
+        return s
+
+def sniff_csv(fh, sport: str, name: str = "CSV") -> dict:
+    """
+    Header row, column names (all, de-duplicated), the columns worth reading and
+    their text/numeric typing, from the first rows of a binary CSV handle.
+    """
+    head = fh.read(_SNIFF_BYTES).decode("utf-8-sig", errors="replace")
+    fh.seek(0)
+    lines = head.splitlines()
+    raw = list(csv.reader(lines[:HEADER_SCAN_ROWS]))
+    with span("header detection", sheet=name) as rec:
+        match = detect_header([[_cell(v) for v in row] for row in raw], sport, "Data")
+        rec.update(header_row=match.row + 1, matched=len(match.columns), confidence=round(match.confidence, 2))
+    warn_if_low(match, name)
+
+    labels = raw[match.row] if raw else []
+    width = max((len(r) for r in raw), default=0)
+    names = _dedupe_headers([
+        (labels[i].strip() if i < len(labels) else "") or f"Unnamed: {i}" for i in range(width)
+    ])
+    use = [n for n in names if not any(rx.search(n) for rx in EXCLUDE_PATTERNS)]
+    canon = {i: c for c, i in match.columns.items()}
+    schema = sheet_schema(sport, "Data")
+    text_keys = schema["text"] | NAME_KEYS | CATEGORY_KEYS
+    text, numeric = set(), set()
+    for i, n in enumerate(names):
+        if n not in use:
+            continue
+        key = canon.get(i, n)
+        if key in text_keys or n in text_keys:
+            text.add(n)
+        elif key in schema["numeric"] or n in schema["numeric"] or is_percent_col(n):
+            numeric.add(n)
+    # average line length of the sample, to turn rows read into a progress fraction
+    row_bytes = len(head.encode("utf-8")) / max(len(lines), 1)
+    return {"row": match.row, "names": names, "use": use, "text": text, "numeric": numeric, "row_bytes": row_bytes}
+
+def _chunks_pandas(fh, info: dict, pinned: Set[str]) -> Iterator[pd.DataFrame]:
+    dtype = {n: "str" for n in info["text"]}
+    dtype.update({n: "float64" for n in pinned})
+    yield from pd.read_csv(
+        fh, header=None, names=info["names"], skiprows=info["row"] + 1, usecols=info["use"],
+        dtype=dtype, na_values=_NA_VALUES, thousands=",", encoding="utf-8-sig",
+        chunksize=CSV_CHUNK_ROWS, low_memory=True,
+    )
+
+def _chunks_arrow(pacsv, fh, info: dict, pinned: Set[str]) -> Iterator[pd.DataFrame]:
+    import pyarrow as pa
+    types = {n: pa.string() for n in info["text"]}
+    types.update({n: pa.float64() for n in pinned})
+    reader = pacsv.open_csv(
+        fh,
+        read_options=pacsv.ReadOptions(column_names=info["names"], skip_rows=info["row"] + 1,
+                                       block_size=_ARROW_BLOCK_BYTES),
+        convert_options=pacsv.ConvertOptions(include_columns=info["use"], column_types=types,
+                                             null_values=_NA_VALUES, strings_can_be_null=True),
+    )
+    for batch in reader:
+        yield batch.to_pandas()
+
+def _text_like(s: pd.Series, sample: int = 1000) -> bool:
+    """True when a sample of an unknown column has a value that is no number even without %, $ and commas."""
+    vals = s.dropna().head(sample)
+    if vals.empty:
+        return False
+    num, _ = _to_number(vals)
+    return bool(num[~_blank_mask(vals)].isna().any())
+
+def _type_columns(df: pd.DataFrame, sport: str, text: Set[str]) -> pd.DataFrame:
+    """`type_frame` for every column but the ones already known to be text (read as strings)."""
+    renamed = dict(zip(df.columns, standardize_columns(pd.DataFrame(columns=df.columns)).columns))
+    df = clean_columns(df)
+    text = {renamed.get(c, c) for c in text} & set(df.columns)
+    rest = [c for c in df.columns if c not in text]
+    if not rest:
+        df.attrs["schema"] = {"kind": sheet_schema(sport, "Data")["kind"], "percent_scale": {}}
+        return df
+    typed = type_frame(df[rest], sport, "Data")
+    if not text:
+        return typed
+    out = pd.concat([typed, df[[c for c in df.columns if c in text]]], axis=1)[list(df.columns)]
+    out.attrs = typed.attrs
+    return out
+
+def _read_typed(fh, info: dict, pinned: Set[str], engine: str, size: int,
+                on_progress: Optional[Callable[[float, str], None]]) -> tuple:
+    """Typed chunks and the percent columns that carried '%' strings."""
+    pacsv = _arrow_csv() if engine == "pyarrow" else None
+    chunks = _chunks_arrow(pacsv, fh, info, pinned) if pacsv is not None else _chunks_pandas(fh, info, pinned)
+    out: List[pd.DataFrame] = []
+    had_pct: Set[str] = set()
+    rows = 0
+    for chunk in chunks:
+        if not out:
+            known = info["text"] | info["numeric"]
+            info["text"] |= {c for c in chunk.columns
+                             if c not in known and chunk[c].dtype == object and _text_like(chunk[c])}
+        for col in info["numeric"]:
+            if col in chunk.columns and not pd.api.types.is_numeric_dtype(chunk[col]):
+                chunk[col], pct = _to_number(chunk[col])
+                if pct:
+                    had_pct.add(col)
+        out.append(chunk)
+        rows += len(chunk)
+        if on_progress:
+            on_progress(min(rows * info["row_bytes"] / size, 0.99), f"{rows:,} rows")
+    return out, had_pct
+
+def read_csv_typed(path_or_file, sport: str,
+                   on_progress: Optional[Callable[[float, str], None]] = None) -> pd.DataFrame:
+    """
+    Read a CSV into a cleaned, typed frame in chunks; `on_progress(fraction,
+    what)` fires after each chunk. Numeric columns are pinned to float64 and
+    re-read as text when a chunk has values like "$5,000".
+    """
+    name = os.path.basename(getattr(path_or_file, "name", str(path_or_file)))
+    engine = CSV_ENGINE if CSV_ENGINE != "auto" else ("pyarrow" if _arrow_csv() is not None else "c")
+    fh, owned = _open_binary(path_or_file)
+    try:
+        size = _size(fh)
+        info = sniff_csv(fh, sport, name)
+        with span("read_csv", engine=engine) as rec:
+            try:
+                chunks, had_pct = _read_typed(fh, info, info["numeric"], engine, size, on_progress)
+            except ValueError as e:
+                ui_log(f"{name}: numeric columns hold text ({str(e)[:80]}); re-reading them as text", "info")
+                fh.seek(0)
+                chunks, had_pct = _read_typed(fh, info, set(), engine, size, on_progress)
+            df = pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame(columns=info["use"])
+            del chunks
+            rec.update(rows=len(df), cols=df.shape[1], bytes=size)
+    finally:
+        if owned:
+            fh.close()
+    df = _type_columns(df, sport, info["text"])
+    scale: Dict[str, int] = df.attrs["schema"]["percent_scale"] if "schema" in df.attrs else {}
+    for col in had_pct:
+        if col in scale:
+            scale[col] = 100
+    return df
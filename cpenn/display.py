@@ -0,0 +1,253 @@
+"""Schema-driven display formatting, server-side ordering and file exports."""
+
+import io
+import os
+import re
+import tempfile
+import functools
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .columns import materialize
+from .schema import MLB_THREE_DEC_STATS, is_percent_col, percent_scale
+from .registry import FigureCache
+from .search import filter_engine, name_column
+
+# ----------------------------
+# FORMATTING HELPERS (schema-driven display pipeline)
+# ----------------------------
+# Display classes: rounding digits, NaN fill, Streamlit number format
+DISPLAY_CLASSES = {
+    "money":   {"digits": 0, "fill": 0.0, "format": "%.0f"},
+    "int":     {"digits": 0, "fill": 0.0, "format": "%d"},
+    "percent": {"digits": 1, "fill": 0.0, "format": "%.1f%%"},
+    "dec1":    {"digits": 1, "fill": 0.0, "format": "%.1f"},
+    "dec3":    {"digits": 3, "fill": None, "format": "%.3f"},
+    "raw":     {"digits": None, "fill": None, "format": "%.1f"},
+    "text":    None,
+}
+
+_DISPLAY_INT = {"win", "t3", "t5", "t10"}
+_DISPLAY_TEXT_GUARDS = (
+    "driver", "player name", "player", "name",
+    "wr1", "wr2", "wr3", "qb", "rb", "te",
+    "bringback", "bring back", "stack", "stack team",
+    "team", "opp", "wr", "wr1 name", "wr2 name", "wr3 name",
+)
+
+@functools.lru_cache(maxsize=4096)
+def display_class(col: str, numeric: bool) -> str:
+    """Display class for a column name + numeric flag (see DISPLAY_CLASSES); memoized per schema."""
+    cl = str(col).strip().lower()
+    if cl.endswith(" sal") or "salary" in cl or "price" in cl:
+        return "money" if numeric else "text"
+    if not numeric:
+        return "text"
+    if cl in _DISPLAY_INT:
+        return "int"
+    if is_percent_col(cl):
+        return "percent"
+    if cl in MLB_THREE_DEC_STATS or any(w in MLB_THREE_DEC_STATS for w in re.split(r"[^a-z0-9]+", cl)):
+        return "dec3"
+    if any(tok in cl for tok in _DISPLAY_TEXT_GUARDS):
+        return "raw"
+    return "dec1"
+
+def display_plan(df: pd.DataFrame) -> Dict[str, str]:
+    return {c: display_class(c, pd.api.types.is_numeric_dtype(df[c])) for c in df.columns}
+
+def _column_specs(plan: Dict[str, str]) -> Dict[str, dict]:
+    """Number-column settings per column (format, plus step/min for money); UI-agnostic."""
+    specs = {}
+    for col, kind in plan.items():
+        spec = DISPLAY_CLASSES.get(kind)
+        if spec is None:
+            continue
+        specs[col] = {"format": spec["format"]}
+        if kind == "money":
+            specs[col].update(step=100.0, min_value=0.0)
+    return specs
+
+def display_frame(df_in: pd.DataFrame):
+    """
+    (display frame, column specs) from one classification pass: numeric columns
+    are rounded/scaled/filled as whole NumPy arrays, text columns pass through.
+    """
+    if df_in is None or not isinstance(df_in, pd.DataFrame):
+        return pd.DataFrame(), {}
+    plan = display_plan(df_in.loc[:, ~df_in.columns.duplicated()])
+    if df_in.empty:
+        return df_in, _column_specs(plan)
+
+    cols = {}
+    for i, col in enumerate(df_in.columns):
+        kind = plan[col]
+        spec = DISPLAY_CLASSES.get(kind)
+        if spec is None or spec["digits"] is None:
+            cols[i] = df_in.iloc[:, i]
+            continue
+        vals = df_in.iloc[:, i].to_numpy(dtype="float64", na_value=np.nan)
+        vals = np.where(np.isfinite(vals), vals, np.nan)
+        if kind == "percent" and percent_scale(df_in, col) == 1:
+            vals = vals * 100.0
+        vals = np.round(vals, spec["digits"])
+        if spec["fill"] is not None:
+            vals = np.where(np.isnan(vals), spec["fill"], vals)
+        if kind in ("money", "int"):
+            cols[i] = pd.array(vals, dtype="Float64").astype("Int64")
+        else:
+            cols[i] = vals
+    out = pd.DataFrame(cols, index=df_in.index)
+    out.columns = df_in.columns
+    out.attrs = dict(df_in.attrs)
+    return out, _column_specs(plan)
+
+def column_specs(df: pd.DataFrame) -> Dict[str, dict]:
+    return _column_specs(display_plan(df))
+
+# Server-side paging: above this many rows only one sorted page goes to the browser
+PAGE_MODE_MIN_ROWS = int(os.environ.get("CPENN_PAGE_MODE_ROWS", "2000"))
+PAGE_SIZES = [50, 100, 250, 500]
+
+def sorted_positions(df: pd.DataFrame, col: Optional[str], descending: bool = False) -> np.ndarray:
+    """Row positions of `df` ordered by `col` (stable, blanks last); sheet order when `col` is None."""
+    if not col or col not in df.columns:
+        return np.arange(len(df))
+    s = df[col].reset_index(drop=True)
+    return s.sort_values(ascending=not descending, kind="stable", na_position="last").index.to_numpy()
+
+# ----------------------------
+# EXPORTS (built on click, written to disk)
+# ----------------------------
+EXPORT_FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+def _unlink(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+# Built export files stay on disk by key; only their paths are held in memory
+_EXPORTS = FigureCache(maxsize=int(os.environ.get("CPENN_EXPORT_CACHE", "8")), on_evict=_unlink)
+
+def export_cache() -> FigureCache:
+    return _EXPORTS
+
+class _ExportFile(io.FileIO):
+    """A built export opened for reading; a temporary one is deleted when closed (or collected)."""
+
+    def __init__(self, path: str, temporary: bool):
+        super().__init__(path, "rb")
+        self._temporary = temporary
+
+    def close(self) -> None:
+        super().close()
+        if self._temporary:
+            self._temporary = False
+            _unlink(self.name)
+
+def _xlsx_sheet_name(name: str, used: set) -> str:
+    base = re.sub(r"[\[\]:*?/\\]", "_", str(name))[:31] or "Sheet"
+    out, i = base, 1
+    while out.lower() in used:
+        suffix = f"_{i}"
+        out, i = base[:31 - len(suffix)] + suffix, i + 1
+    used.add(out.lower())
+    return out
+
+def write_export(frames: Iterable[Tuple[str, pd.DataFrame]], fmt: str, target) -> None:
+    """
+    CSV/Parquet of the first frame, or one Excel sheet per frame, written to
+    `target` (a path or binary buffer). `frames` may be a generator, so sheets
+    are built one at a time.
+    """
+    frames = iter(frames)
+    if fmt == "CSV":
+        next(frames)[1].to_csv(target, index=False, encoding="utf-8")
+    elif fmt == "Parquet":
+        next(frames)[1].to_parquet(target, index=False)
+    else:
+        try:
+            import xlsxwriter  # noqa: F401
+            engine = "xlsxwriter"
+        except ImportError:
+            engine = "openpyxl"
+        used: set = set()
+        with pd.ExcelWriter(target, engine=engine) as xw:
+            for name, frame in frames:
+                frame.to_excel(xw, sheet_name=_xlsx_sheet_name(name, used), index=False)
+
+def export_bytes(frames: Dict[str, pd.DataFrame], fmt: str) -> bytes:
+    """`write_export` into memory, for small frames and callers that need bytes."""
+    buf = io.BytesIO()
+    write_export(frames.items(), fmt, buf)
+    return buf.getvalue()
+
+def filter_sheet(df: pd.DataFrame, specs: List[tuple], site: str = "Both") -> pd.DataFrame:
+    """
+    `df` with the view's filter specs and site applied; specs on a column the
+    sheet lacks are dropped, and a name search goes to the sheet's own name column.
+    """
+    ncol = name_column(df)
+    kept = []
+    for kind, col, value in specs:
+        if kind == "contains":
+            col = ncol
+        if col is None or col not in df.columns:
+            continue
+        if kind == "range" and not pd.api.types.is_numeric_dtype(df[col]):
+            continue
+        kept.append((kind, col, value))
+    mask = filter_engine(df).combine(kept)
+    full = materialize(df)
+    out = full if mask is None or mask.all() else full[mask]
+    if site != "Both":
+        drop_prefix = "FD " if site == "DK" else "DK "
+        out = out.drop(columns=[c for c in out.columns if str(c).startswith(drop_prefix)])
+    return out
+
+def lazy_export(view: pd.DataFrame, order: Optional[np.ndarray], fmt: str, sheet: str,
+                extra_sheets: Dict[str, pd.DataFrame], key: Optional[tuple],
+                specs: Optional[List[tuple]] = None, site: str = "Both") -> Callable[[], io.RawIOBase]:
+    """
+    Zero-argument builder for st.download_button: the file is only written when
+    the button is clicked, to a temporary file rather than memory, and reused
+    from the export cache by `key`. For Excel the other sheets get the same
+    filters (`filter_sheet`), one sheet at a time. Everything it needs is bound
+    now, so later reruns can't change it.
+    """
+    specs = list(specs or ())
+    ext = EXPORT_FORMATS[fmt][0]
+
+    def frames():
+        yield sheet, display_frame(view if order is None else view.iloc[order])[0]
+        if fmt == "Excel":
+            for name, frame in extra_sheets.items():
+                yield name, display_frame(filter_sheet(frame, specs, site))[0]
+
+    def build() -> str:
+        fd, path = tempfile.mkstemp(prefix="cpenn-export-", suffix=f".{ext}")
+        os.close(fd)
+        try:
+            write_export(frames(), fmt, path)
+        except Exception:
+            _unlink(path)
+            raise
+        return path
+
+    def data() -> io.RawIOBase:
+        if key is None:
+            return _ExportFile(build(), temporary=True)
+        try:
+            return _ExportFile(export_cache().get_or_build(key, build), temporary=False)
+        except FileNotFoundError:
+            # evicted (or swept from the temp dir) between lookup and open
+            return _ExportFile(build(), temporary=True)
+
+    return data
@@ -0,0 +1,121 @@
+"""
+Header detection shared by every sport. The first HEADER_SCAN_ROWS rows of a
+sheet (streamed, or already in memory) are scored against the sport's token
+vocabulary — every canonical name and alias, `_norm`-folded into one set — and
+the best row becomes the header, with its canonical column index map and a
+confidence score. Low-confidence matches are reported, never silently re-read.
+"""
+
+import re
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+from .logs import ui_log
+from .schema import (
+    _MLB_ALIAS,
+    _NASCAR_ALIAS,
+    NUMERIC_KEYS,
+    TEXT_KEYS,
+    SchemaResolver,
+    _norm,
+    schema_resolver,
+)
+from .trace import span
+from .workbook import WorkbookSession
+
+HEADER_SCAN_ROWS = 10
+# Recognized labels for full confidence; below LOW_CONFIDENCE the loader warns
+HEADER_MIN_HITS = 4
+LOW_CONFIDENCE = 0.5
+
+# NFL has no alias map: the typed column names plus standardize_columns' renames
+_NFL_ALIAS = {c: [] for c in NUMERIC_KEYS | TEXT_KEYS}
+_NFL_ALIAS.update({
+    "Player Name": ["Player", "Name", "PlayerName"],
+    "Pos": ["Position", "Pos."],
+    "Opp": ["Opponent", "Opp."],
+    "Team": ["TeamName"],
+})
+_NFL_RESOLVER = SchemaResolver(_NFL_ALIAS)
+
+_ALIAS_MAPS = {"NFL": _NFL_ALIAS, "NASCAR": _NASCAR_ALIAS, "MLB": _MLB_ALIAS}
+
+def _vocabulary(alias_map: Dict[str, List[str]]) -> FrozenSet[str]:
+    return frozenset(_norm(a) for canon, aliases in alias_map.items() for a in [canon] + list(aliases))
+
+VOCABULARIES: Dict[str, FrozenSet[str]] = {sport: _vocabulary(amap) for sport, amap in _ALIAS_MAPS.items()}
+
+_SITE_RX = re.compile(r"^(dk|fd)(?![a-z])", re.I)
+
+class HeaderMatch:
+    """A detected header: 0-based `row` among the scanned rows, its `labels`, `columns` {canonical: index}, `confidence` 0..1."""
+
+    def __init__(self, row: int, labels: list, columns: Dict[str, int], hits: int, confidence: float):
+        self.row = row
+        self.labels = labels
+        self.columns = columns
+        self.hits = hits
+        self.confidence = confidence
+
+    @property
+    def low(self) -> bool:
+        return self.confidence < LOW_CONFIDENCE
+
+    def __repr__(self) -> str:
+        return f"HeaderMatch(row={self.row}, hits={self.hits}, confidence={self.confidence:.2f})"
+
+def _label(v) -> str:
+    if v is None or isinstance(v, (int, float)):  # numbers are data, never labels
+        return ""
+    return str(v).strip()
+
+def _is_number(v) -> bool:
+    return isinstance(v, (int, float)) and v == v  # NaN is a blank cell
+
+def _score(row: Sequence, vocab: FrozenSet[str]):
+    """(score, recognized labels) for one row: vocabulary hits, half credit for other DK/FD labels, minus data cells."""
+    hits = site = data = 0
+    for v in row:
+        s = _label(v)
+        if not s:
+            data += _is_number(v)
+            continue
+        if _norm(s) in vocab:
+            hits += 1
+        elif _SITE_RX.match(s):
+            site += 1
+    return hits + 0.5 * site - 0.5 * data, hits
+
+def _resolver(sport: str, sheet: Optional[str]) -> SchemaResolver:
+    sport = str(sport).upper()
+    return _NFL_RESOLVER if sport not in ("NASCAR", "MLB") else schema_resolver(sport, sheet)
+
+def detect_header(rows: Sequence[Sequence], sport: str, sheet: Optional[str] = None,
+                  scan: int = HEADER_SCAN_ROWS) -> HeaderMatch:
+    """Best header among the first `scan` rows; ties go to the earliest row, so unrecognized sheets keep row 0."""
+    vocab = VOCABULARIES.get(str(sport).upper(), VOCABULARIES["NFL"])
+    best, best_score, best_hits = 0, None, 0
+    for i, row in enumerate(rows[:scan]):
+        if not row or all(_label(v) == "" and not _is_number(v) for v in row):
+            continue
+        sc, hits = _score(row, vocab)
+        if best_score is None or sc > best_score:
+            best, best_score, best_hits = i, sc, hits
+    labels = list(rows[best]) if rows else []
+    columns = _resolver(sport, sheet).resolve(labels) if best_hits else {}
+    return HeaderMatch(best, labels, columns, best_hits, min(1.0, best_hits / HEADER_MIN_HITS))
+
+def find_header(book: WorkbookSession, sheet: str, sport: str, scan: int = HEADER_SCAN_ROWS) -> HeaderMatch:
+    """`detect_header` over a sheet's first rows (streamed unless already parsed), traced and warned on low confidence."""
+    with span("header detection", sheet=sheet) as rec:
+        match = detect_header(book.head(sheet, scan), sport, sheet, scan)
+        rec.update(header_row=match.row + 1, matched=len(match.columns), confidence=round(match.confidence, 2))
+    warn_if_low(match, sheet)
+    return match
+
+def warn_if_low(match: HeaderMatch, sheet: str) -> None:
+    if match.low:
+        ui_log(
+            f"Header of {sheet} not recognized with confidence ({match.hits} known column(s), "
+            f"{match.confidence:.0%}); using row {match.row + 1} as the header — check the sheet layout",
+            "warning",
+        )
@@ -0,0 +1,536 @@
+"""Loading entry points: cached single-source loads and parallel ingestion."""
+
+import os
+import re
+import html
+import hashlib
+import shutil
+import zipfile
+import tempfile
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from .logs import ui_log
+from .registry import DatasetRegistry
+from .schema import (
+    DESIRED_NASCAR_BETTING,
+    DESIRED_NASCAR_PROJECTIONS,
+    clean_columns,
+    type_frame,
+)
+from .workbook import WorkbookSession, _match_sheets
+from .cleaning import (
+    _fast_read_nascar_sheet,
+    _read_mlb_sheet,
+    _read_excel_raw,
+    clean_columns_nascar,
+    resolve_allowed_sheets,
+)
+from .cache import _cache_key, _cache_put, cached_sheets, lazy_view, reusable_sheets, source_fingerprint
+from .columns import column_plan
+from .csvread import read_csv_typed
+from .headers import find_header
+from .trace import Trace, current_trace, span, tracing
+
+# ----------------------------
+# DATA LOADING (CACHED)
+# ----------------------------
+def load_data_for_sport(sport: str, path_or_file, only_sheets: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+    """Serve parsed sheets from the on-disk cache; parse and store only when the source changed."""
+    try:
+        with span("fingerprint") as rec:
+            fp = source_fingerprint(path_or_file)
+            rec["bytes"] = fp["size"]
+    except Exception as e:
+        ui_log(f"Could not fingerprint source: {str(e)}", "warning")
+        return _parse_source(sport, path_or_file, only_sheets)
+
+    key = _cache_key(fp, sport, only_sheets)
+    with span("cache lookup") as rec:
+        hit = cached_sheets(fp, sport, only_sheets)
+        rec["cache"] = "hit" if hit is not None else "miss"
+    if hit is not None:
+        ui_log(f"Cache hit: {os.path.basename(fp['path'])}", "info")
+        return hit
+
+    data = _parse_source(sport, path_or_file, only_sheets)
+    with span("cache write", sheets=len(data)) as rec:
+        rec["bytes"] = _cache_put(key, data, fp, sport)
+    return data
+
+def _parse_source(sport: str, path_or_file, only_sheets: Optional[List[str]] = None,
+                  on_progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, pd.DataFrame]:
+    """Read and clean every requested sheet, then type each one exactly once."""
+    raw = _read_source(sport, path_or_file, only_sheets, on_progress)
+    # the NASCAR fast reader already types its sheets; a second pass would re-guess percent scales
+    return {sheet: df if "schema" in df.attrs else type_frame(df, sport, sheet) for sheet, df in raw.items()}
+
+def _read_source(sport: str, path_or_file, only_sheets: Optional[List[str]] = None,
+                 on_progress: Optional[Callable[[float, str], None]] = None) -> Dict[str, pd.DataFrame]:
+    try:
+        name = getattr(path_or_file, "name", str(path_or_file))
+        ext = os.path.splitext(name)[1].lower()
+
+        if ext == ".csv" or ext == "":
+            return {"Data": read_csv_typed(path_or_file, sport, on_progress)}
+
+        with WorkbookSession(path_or_file) as book:
+            sheet_names = resolve_allowed_sheets(book, only_sheets)
+            if not sheet_names:
+                ui_log(f"No sheets found in {book.name}", "warning")
+                return {}
+
+            ui_log(f"Found sheets: {sheet_names}", "info")
+            out: Dict[str, pd.DataFrame] = {}
+
+            if sport == "NASCAR":
+                for sheet in sheet_names:
+                    ui_log(f"Processing sheet: {sheet}", "info")
+                    s = sheet.strip().lower()
+                    desired = (DESIRED_NASCAR_BETTING if "betting" in s or "dashboard" in s
+                               else DESIRED_NASCAR_PROJECTIONS if "proj" in s else None)
+                    if desired is not None:
+                        try:
+                            fast_df = _fast_read_nascar_sheet(book, sheet, desired)
+                        except Exception as e:
+                            # only a failed read earns the full raw re-read below
+                            ui_log(f"Fast read failed for {sheet}, re-reading the whole sheet: {str(e)}", "warning")
+                        else:
+                            if fast_df is not None and not fast_df.empty:
+                                out[sheet] = fast_df
+                                ui_log(f"Successfully loaded {sheet} using fast reader", "success")
+                            else:
+                                ui_log(f"Sheet {sheet} has none of the expected NASCAR columns", "warning")
+                            continue
+
+                    try:
+                        raw = _read_excel_raw(book, [sheet], header=None)
+                        if not raw or sheet not in raw:
+                            ui_log(f"Could not read raw data for sheet: {sheet}", "warning")
+                            continue
+                        cleaned = clean_columns_nascar(raw[sheet], sheet)
+
+                        if "betting" in s or "dashboard" in s:
+                            if "Driver" not in cleaned.columns:
+                                for cand in ["Player Name", "Player", "Name"]:
+                                    if cand in cleaned.columns:
+                                        cleaned = cleaned.rename(columns={cand: "Driver"})
+                                        break
+                            cleaned = cleaned.rename(columns={"Proj Finish": "Proj Fin", "ProjFin": "Proj Fin"})
+                            available_betting_cols = [col for col in DESIRED_NASCAR_BETTING if col in cleaned.columns]
+                            cleaned = cleaned.reindex(columns=available_betting_cols)
+
+                        elif "proj" in s:
+                            if "Driver" not in cleaned.columns:
+                                for cand in ["Player Name", "Player", "Name"]:
+                                    if cand in cleaned.columns:
+                                        cleaned = cleaned.rename(columns={cand: "Driver"})
+                                        break
+                            cleaned = cleaned.rename(columns={"Proj Finish": "Proj Fin", "ProjFin": "Proj Fin"})
+                            available_proj_cols = [col for col in DESIRED_NASCAR_PROJECTIONS if col in cleaned.columns]
+                            cleaned = cleaned.reindex(columns=available_proj_cols)
+
+                        if not cleaned.empty:
+                            out[sheet] = cleaned
+                            ui_log(f"Successfully loaded {sheet} using fallback method", "success")
+                        else:
+                            ui_log(f"Sheet {sheet} resulted in empty DataFrame", "warning")
+                    except Exception as e:
+                        ui_log(f"Failed to process sheet {sheet}: {str(e)}", "error")
+                return out
+
+            if sport == "MLB":
+                for sheet in sheet_names:
+                    mlb_df = _read_mlb_sheet(book, sheet)
+                    if mlb_df is not None and not mlb_df.empty:
+                        out[sheet] = mlb_df
+                        ui_log(f"Successfully loaded {sheet} ({mlb_df.shape[1]} columns)", "success")
+                    else:
+                        ui_log(f"Sheet {sheet} resulted in empty DataFrame", "warning")
+                return out
+
+            # Fallback: NFL/general
+            for sheet in sheet_names:
+                header = find_header(book, sheet, sport).row
+                raw = _read_excel_raw(book, [sheet], header=header)
+                if sheet in raw:
+                    out[sheet] = clean_columns(raw[sheet])
+            return out
+
+    except Exception as e:
+        ui_log(f"Error loading data: {str(e)}", "error")
+        return {}
+
+# ----------------------------
+# PARALLEL INGESTION (process pool)
+# ----------------------------
+INGEST_WORKERS = int(os.environ.get("CPENN_INGEST_WORKERS", min(8, os.cpu_count() or 2)))
+
+_SHEET_NAME_RX = re.compile(r"<(?:\w+:)?sheet\b[^>]*?\bname=\"([^\"]*)\"")
+
+def _workbook_sheet_names(path_or_file) -> List[str]:
+    """Sheet names straight from xl/workbook.xml — no sheet or shared-string parsing."""
+    try:
+        if hasattr(path_or_file, "seek"):
+            path_or_file.seek(0)
+        with zipfile.ZipFile(path_or_file) as zf:
+            xml = zf.read("xl/workbook.xml").decode("utf-8", errors="replace")
+        names = [html.unescape(n) for n in _SHEET_NAME_RX.findall(xml)]
+        if names:
+            return names
+    except Exception:
+        pass
+    with WorkbookSession(path_or_file) as book:
+        return book.sheet_names
+
+_TAG_ATTR_RX = re.compile(r"([\w:]+)=\"([^\"]*)\"")
+_SHEET_TAG_RX = re.compile(r"<(?:\w+:)?sheet\b[^>]*>")
+_REL_TAG_RX = re.compile(r"<(?:\w+:)?Relationship\b[^>]*>")
+
+def _tag_attrs(tag: str) -> Dict[str, str]:
+    return {k.split(":")[-1]: html.unescape(v) for k, v in _TAG_ATTR_RX.findall(tag)}
+
+_SI_RX = re.compile(rb"<(?:\w+:)?si\s*/>|<(?:\w+:)?si>.*?</(?:\w+:)?si>", re.S)
+_SST_CELL_RX = re.compile(rb"(<(?:\w+:)?c\b[^>]*\bt=\"s\"[^>]*>\s*<(?:\w+:)?v>)(\d+)(?=</)")
+
+def _sheet_digest(xml: bytes, strings: List[bytes]) -> str:
+    """Hash of a worksheet part with each shared-string index replaced by the string it points at."""
+    h = hashlib.blake2b(digest_size=12)
+    pos = 0
+    for m in _SST_CELL_RX.finditer(xml):
+        h.update(xml[pos:m.start(2)])
+        i = int(m.group(2))
+        h.update(strings[i] if i < len(strings) else m.group(2))
+        pos = m.end(2)
+    h.update(xml[pos:])
+    return h.hexdigest()
+
+def sheet_digests(path_or_file) -> Dict[str, str]:
+    """
+    {sheet: digest} of each worksheet's own content. Shared-string cells are
+    hashed by the text they reference, not by their index, so editing text on
+    one sheet (which rewrites and may renumber the workbook-wide string table)
+    leaves the other sheets' digests alone. Empty when the source isn't an
+    xlsx/xlsm zip.
+    """
+    try:
+        if hasattr(path_or_file, "seek"):
+            path_or_file.seek(0)
+        with zipfile.ZipFile(path_or_file) as zf:
+            book = zf.read("xl/workbook.xml").decode("utf-8", errors="replace")
+            rels = zf.read("xl/_rels/workbook.xml.rels").decode("utf-8", errors="replace")
+            parts = {a.get("Id"): a.get("Target", "") for a in map(_tag_attrs, _REL_TAG_RX.findall(rels))}
+            try:
+                strings = _SI_RX.findall(zf.read("xl/sharedStrings.xml"))
+            except KeyError:
+                strings = []
+            out = {}
+            for attrs in map(_tag_attrs, _SHEET_TAG_RX.findall(book)):
+                target = parts.get(attrs.get("id"), "")
+                member = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+                out[attrs["name"]] = _sheet_digest(zf.read(member), strings)
+            return out
+    except Exception:
+        return {}
+
+def _source_payload(path_or_file, spill_dir: Callable[[], str]):
+    """
+    Picklable stand-in for a source: its path. An upload is written once to a
+    file under `spill_dir()`, keeping its name, so pool tasks get a path
+    rather than a copy of the bytes each.
+    """
+    if not hasattr(path_or_file, "getvalue"):
+        return str(path_or_file)
+    path = os.path.join(spill_dir(), os.path.basename(getattr(path_or_file, "name", "") or "upload.xlsx"))
+    with open(path, "wb") as fh:
+        fh.write(path_or_file.getbuffer())
+    return path
+
+def _parse_sheets_task(sport: str, source, sheets: List[Optional[str]],
+                       on_progress: Optional[Callable[[float, str], None]] = None):
+    """
+    Pool worker: parse a batch of sheets of one workbook through a single open
+    (or a whole CSV when the batch is [None]), with its timing spans. Returns
+    ([(sheet, data, error)], seconds, trace).
+    """
+    t0 = time.perf_counter()
+    what = "file" if sheets == [None] else ", ".join(sheets)
+    trace = Trace(what)
+    with tracing(trace), trace.span(f"parse {what}") as rec:
+        try:
+            data = _parse_source(sport, source, None if sheets == [None] else list(sheets), on_progress)
+            err = None
+        except Exception as e:
+            data, err = {}, str(e)
+        rec.update(rows=sum(len(df) for df in data.values()), worker=os.getpid())
+    if sheets == [None]:
+        results = [(None, data, err or (None if data else "no data parsed"))]
+    else:
+        results = [(s, {s: data[s]} if s in data else {}, None if s in data else err or "no data parsed")
+                   for s in sheets]
+    return results, time.perf_counter() - t0, trace.to_dict()
+
+def _sheet_batches(sheets: List[str], priority: Optional[List[str]], n: int) -> List[List[str]]:
+    """
+    `sheets` in priority order, split into at most `n` batches (one workbook
+    open each). A prioritized first sheet goes alone, so it arrives first.
+    """
+    ordered = _prioritized(sheets, priority)
+    head = []
+    if priority and len(ordered) > 1 and str(ordered[0]).strip().lower() in {str(p).strip().lower() for p in priority}:
+        head, ordered, n = [ordered[:1]], ordered[1:], n - 1
+    n = max(1, min(n, len(ordered)))
+    return head + [ordered[i::n] for i in range(n)]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _ingest_pool():
+    """
+    One pool per process. Workers start from a forkserver (spawn where there is
+    none), never by forking this process: the app's loader, watcher and
+    prefetch threads may hold locks a forked child would inherit held.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            import multiprocessing as mp
+            from concurrent.futures import ProcessPoolExecutor
+            ctx = mp.get_context("forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn")
+            if ctx.get_start_method() == "forkserver":
+                ctx.set_forkserver_preload(["cpenn.loading"])
+            _pool = ProcessPoolExecutor(max_workers=INGEST_WORKERS, mp_context=ctx)
+        return _pool
+
+def _reset_pool() -> None:
+    """Drop a broken pool; the next call to _ingest_pool builds a fresh one."""
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+def ingest_parallel(
+    sport: str,
+    jobs: List[dict],
+    on_file_done: Optional[Callable[[str, Dict[str, pd.DataFrame], dict], None]] = None,
+    on_progress: Optional[Callable[[float, str], None]] = None,
+    shared: Optional["DatasetRegistry"] = None,
+    on_sheet_done: Optional[Callable[[str, Optional[str], Dict[str, pd.DataFrame]], None]] = None,
+    priority: Optional[List[str]] = None,
+) -> Dict[str, dict]:
+    """
+    Load every job ({"label", "source", "sheets"}) across the process pool:
+    each workbook's sheets go out in batches, at most one per worker share and
+    one workbook open each. CSVs parse in-process. Slates already in `shared` or the disk cache resolve
+    immediately; parsed workbooks are written back to the cache. A job with a
+    "columns" entry ({sheet: extra columns}, may be empty) keeps only its
+    `column_plan` columns in memory; the rest are read back on demand
+    (cpenn.columns.materialize). On a cache miss, sheets whose content digest
+    matches an earlier cache entry of the same file are reused, not parsed.
+    Sheets named in `priority` are submitted first, on their own. `on_sheet_done(label, sheet,
+    data)` fires as each parsed sheet arrives and `on_file_done(label, data,
+    report)` as each file completes. Returns the per-file report (status,
+    sheets, errors, seconds, cached, key, reused).
+    """
+    report: Dict[str, dict] = {}
+    state: Dict[str, dict] = {}
+    futures = {}
+    pending: List[tuple] = []
+    spilled: List[str] = []
+    total = 0
+    trace = current_trace()
+    depth = trace.depth if trace is not None else 0
+    file_spans: Dict[str, dict] = {}
+
+    def finish(label: str, data: Dict[str, pd.DataFrame], errors: List[str], t0: float, cached: bool,
+               key: Optional[str] = None, reused: Optional[List[str]] = None):
+        status = "error" if not data else ("partial" if errors else "ok")
+        report[label] = {
+            "status": status, "sheets": list(data.keys()), "errors": errors,
+            "seconds": round(time.perf_counter() - t0, 3), "cached": cached, "key": key,
+            "reused": list(reused or []),
+        }
+        rec = file_spans.pop(label, None)
+        if rec is not None:
+            trace.end(rec, status=status, cache="hit" if cached else "miss", sheets=len(data),
+                      rows=sum(len(df) for df in data.values()))
+        if on_file_done:
+            on_file_done(label, data, report[label])
+
+    def complete(label: str) -> None:
+        entry = state[label]
+        frames = entry["frames"]
+        if None in entry["order"]:
+            ordered = frames
+        else:
+            ordered = {s: frames[s] for s in entry["order"] if s in frames}
+        if ordered and entry["key"]:
+            with span("cache write", depth=depth + 1, sheets=len(ordered)) as rec:
+                rec["bytes"] = _cache_put(entry["key"], ordered, entry["fp"], sport, entry["digests"])
+            # narrow to the planned columns only once the full sheets are on disk to read back from
+            if rec.get("bytes", 1) and entry["plan"] is not None and None not in entry["order"]:
+                plan = entry["plan"]
+                ordered = {s: lazy_view(df, entry["key"], s, plan(s, [str(c) for c in df.columns]))
+                           for s, df in ordered.items()}
+        finish(label, ordered, entry["errors"], entry["t0"], cached=False, key=entry["key"],
+               reused=entry["reused"])
+
+    def csv_progress(label: str) -> Optional[Callable[[float, str], None]]:
+        if on_progress is None:
+            return None
+        return lambda frac, what: on_progress((done + frac) / max(total, 1), f"{label} — {what}")
+
+    def spill_dir() -> str:
+        spilled.append(tempfile.mkdtemp(prefix="cpenn-upload-"))
+        return spilled[-1]
+
+    try:
+        pool = _ingest_pool()
+    except Exception:
+        pool = None
+    done = 0
+
+    for job in jobs:
+        label, src, wanted = job["label"], job["source"], job.get("sheets")
+        plan = column_plan(sport, job["columns"]) if job.get("columns") is not None else None
+        t0 = time.perf_counter()
+        if trace is not None:
+            file_spans[label] = trace.begin(f"load {label}", depth=depth)
+        fp = key = None
+        try:
+            with span("fingerprint", depth=depth + 1) as rec:
+                fp = source_fingerprint(src)
+                rec["bytes"] = fp["size"]
+            key = _cache_key(fp, sport, wanted)
+            with span("cache lookup", depth=depth + 1) as rec:
+                hit = shared.get(key) if shared is not None else None
+                rec["cache"] = "hit (shared)" if hit is not None else "miss"
+                if hit is None:
+                    hit = cached_sheets(fp, sport, wanted, plan)
+                    rec["cache"] = "hit (disk)" if hit is not None else "miss"
+        except Exception:
+            hit = None
+        if hit is not None:
+            finish(label, hit, [], t0, cached=True, key=key)
+            continue
+
+        try:
+            ext = os.path.splitext(getattr(src, "name", str(src)))[1].lower()
+            with span("list sheets", depth=depth + 1) as rec:
+                sheets = [None] if ext in (".csv", "") else _match_sheets(_workbook_sheet_names(src), wanted)
+                rec["sheets"] = len(sheets)
+        except Exception as e:
+            finish(label, {}, [f"open failed: {str(e)}"], t0, cached=False)
+            continue
+        if not sheets:
+            finish(label, {}, ["no sheets found"], t0, cached=False)
+            continue
+
+        # a re-saved workbook: sheets whose content digest is unchanged come from the earlier cache entry
+        digests, reused = {}, {}
+        if fp is not None and None not in sheets:
+            with span("sheet digests", depth=depth + 1) as rec:
+                digests = sheet_digests(src)
+                reused = {s: df for s, df in reusable_sheets(fp, sport, digests).items() if s in sheets}
+                rec.update(sheets=len(digests), reused=len(reused))
+        todo = [s for s in sheets if s not in reused]
+        state[label] = {"fp": fp, "key": key, "order": sheets, "frames": dict(reused), "errors": [],
+                        "left": len(todo), "t0": t0, "plan": plan, "digests": digests, "reused": list(reused)}
+        if on_sheet_done:
+            for sheet, df in reused.items():
+                on_sheet_done(label, sheet, {sheet: df})
+        if not todo:
+            complete(label)
+            continue
+        total += len(todo)
+        pending.append((label, src, todo))
+
+    # workers are shared out between the workbooks still to parse, so each is opened as few times as that allows
+    share = max(1, INGEST_WORKERS // max(1, sum(1 for _, _, todo in pending if todo != [None])))
+    csv_thread = None
+    try:
+        for label, src, todo in pending:
+            if todo == [None]:
+                # CSVs parse in this process, chunk by chunk with progress, on a side thread so
+                # workbook sheets the pool finishes meanwhile are handed over without waiting
+                if csv_thread is None:
+                    csv_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cpenn-csv")
+                task = (sport, src, todo)
+                futures[csv_thread.submit(_parse_sheets_task, *task, csv_progress(label))] = (label, task)
+                continue
+            try:
+                payload = _source_payload(src, spill_dir) if pool is not None else src
+            except Exception as e:
+                ui_log(f"Could not stage {label} for the worker pool, parsing it here: {str(e)}", "warning")
+                payload = src
+            for batch in _sheet_batches(todo, priority, share):
+                task = (sport, payload, batch)
+                fut = None
+                if pool is not None and not hasattr(payload, "read"):
+                    try:
+                        fut = pool.submit(_parse_sheets_task, *task)
+                    except (BrokenProcessPool, RuntimeError):
+                        _reset_pool()
+                        pool = None
+                futures[fut if fut is not None else _InlineResult(_parse_sheets_task(*task))] = (label, task)
+
+        for fut in _as_completed_any(futures):
+            label, task = futures[fut]
+            worker_trace = None
+            try:
+                results, _, worker_trace = fut.result()
+            except BrokenProcessPool:
+                _reset_pool()
+                results, _, worker_trace = _parse_sheets_task(*task)
+            except Exception as e:
+                results = [(sheet, {}, str(e)) for sheet in task[2]]
+            if trace is not None and worker_trace:
+                trace.merge(worker_trace, depth=depth + 1)
+            entry = state[label]
+            for sheet, data, err in results:
+                entry["frames"].update(data)
+                if on_sheet_done and data:
+                    on_sheet_done(label, sheet, data)
+                if err:
+                    entry["errors"].append(f"{sheet or 'file'}: {err}")
+                entry["left"] -= 1
+                done += 1
+                if on_progress:
+                    on_progress(done / max(total, 1), f"{label} — {sheet or 'file'}")
+            if entry["left"] == 0:
+                complete(label)
+    finally:
+        if csv_thread is not None:
+            csv_thread.shutdown(wait=False, cancel_futures=True)
+        for path in spilled:
+            shutil.rmtree(path, ignore_errors=True)
+
+    return report
+
+def _prioritized(sheets: List[Optional[str]], priority: Optional[List[str]]) -> List[Optional[str]]:
+    """`sheets` with the ones named in `priority` (case-insensitive, in that order) moved to the front."""
+    if not priority:
+        return sheets
+    rank = {str(p).strip().lower(): i for i, p in enumerate(priority)}
+    return sorted(sheets, key=lambda s: rank.get(str(s).strip().lower(), len(rank)))
+
+class _InlineResult:
+    """Future-like wrapper for a task that already ran in-process."""
+
+    def __init__(self, value):
+        self._value = value
+
+    def result(self):
+        return self._value
+
+def _as_completed_any(futures):
+    inline = [f for f in futures if isinstance(f, _InlineResult)]
+    pooled = [f for f in futures if not isinstance(f, _InlineResult)]
+    yield from inline
+    if pooled:
+        yield from as_completed(pooled)
+
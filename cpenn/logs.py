@@ -0,0 +1,38 @@
+"""Load and cleaning messages, routed to a pluggable sink (the app shows them in the page)."""
+import logging
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+_LOG = logging.getLogger("cpenn")
+_LEVELS = {"info": logging.INFO, "success": logging.INFO, "warning": logging.WARNING, "error": logging.ERROR}
+_sink: Optional[Callable[[str, str], None]] = None
+_captured: "contextvars.ContextVar[Optional[Callable[[str, str], None]]]" = contextvars.ContextVar(
+    "cpenn_log_capture", default=None)
+
+def set_log_sink(sink: Optional[Callable[[str, str], None]]) -> None:
+    """Send messages to `sink(msg, level)` instead of the `cpenn` logger (None restores logging)."""
+    global _sink
+    _sink = sink
+
+@contextmanager
+def capture_logs(sink: Callable[[str, str], None]):
+    """Route messages logged in this context (e.g. a background thread) to `sink` instead of the global sink."""
+    token = _captured.set(sink)
+    try:
+        yield sink
+    finally:
+        _captured.reset(token)
+
+def ui_log(msg: str, level: str = "info") -> None:
+    local = _captured.get()
+    if local is not None:
+        local(msg, level)
+        return
+    if _sink is not None:
+        try:
+            _sink(msg, level)
+            return
+        except Exception:
+            pass
+    _LOG.log(_LEVELS.get(level, logging.INFO), msg)
@@ -0,0 +1,146 @@
+"""
+Process-wide shared objects: the read-only dataset registry and a bounded LRU.
+Both live in module-level singletons, so every Streamlit session and rerun in
+the server process sees the same instances; the package itself never touches
+Streamlit (no st.cache_resource).
+"""
+
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+from .schema import frame_nbytes
+
+# ----------------------------
+# SHARED DATASET REGISTRY (process-wide, read-only)
+# ----------------------------
+SESSION_TTL_SECONDS = float(os.environ.get("CPENN_SESSION_TTL", "1800"))
+
+class DatasetRegistry:
+    """
+    Process-wide store of read-only slate data keyed by source fingerprint.
+    Sessions hold references (refcounted by session id, refreshed every rerun);
+    an entry is dropped as soon as no live session references it.
+    """
+
+    def __init__(self, session_ttl: float = SESSION_TTL_SECONDS):
+        self._lock = threading.RLock()
+        self._data: Dict[str, Dict[str, pd.DataFrame]] = {}
+        self._refs: Dict[str, Dict[str, float]] = {}
+        self.session_ttl = session_ttl
+
+    def get(self, key: str) -> Optional[Dict[str, pd.DataFrame]]:
+        with self._lock:
+            return self._data.get(key)
+
+    def acquire(self, key: str, session_id: str,
+                data: Optional[Dict[str, pd.DataFrame]] = None) -> Optional[Dict[str, pd.DataFrame]]:
+        """Reference `key` for a session, registering `data` if the key is new; returns the shared data."""
+        with self._lock:
+            if key not in self._data:
+                if data is None:
+                    return None
+                self._data[key] = data
+            self._refs.setdefault(key, {})[session_id] = time.time()
+            return self._data[key]
+
+    def replace_sheet(self, key: str, sheet: str, old: pd.DataFrame,
+                      new: pd.DataFrame) -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Publish `new` for `sheet` as a fresh data dict (the old one is never
+        mutated; sessions pick the new one up on their next `acquire`). Only
+        swaps when `sheet` is still `old`; returns the entry's current data
+        either way, or None when `key` is gone.
+        """
+        with self._lock:
+            data = self._data.get(key)
+            if data is None or data.get(sheet) is not old:
+                return data
+            self._data[key] = {**data, sheet: new}
+            return self._data[key]
+
+    def release(self, key: str, session_id: str) -> None:
+        with self._lock:
+            self._refs.get(key, {}).pop(session_id, None)
+            self._collect(key)
+
+    def release_session(self, session_id: str) -> None:
+        with self._lock:
+            for key in list(self._refs):
+                self.release(key, session_id)
+
+    def evict_stale(self) -> None:
+        """Drop references from sessions that stopped rerunning, then unreferenced entries."""
+        cutoff = time.time() - self.session_ttl
+        with self._lock:
+            for key in list(self._data):
+                refs = self._refs.get(key, {})
+                for sid in [sid for sid, seen in refs.items() if seen < cutoff]:
+                    del refs[sid]
+                self._collect(key)
+
+    def _collect(self, key: str) -> None:
+        if not self._refs.get(key):
+            self._refs.pop(key, None)
+            self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "sessions": len({sid for refs in self._refs.values() for sid in refs}),
+                "bytes": sum(frame_nbytes(df) for data in self._data.values() for df in data.values()),
+            }
+
+# ----------------------------
+# BOUNDED LRU (figures, exports, sort orders)
+# ----------------------------
+FIGURE_CACHE_SIZE = int(os.environ.get("CPENN_FIGURE_CACHE", "96"))
+
+class FigureCache:
+    """
+    Thread-safe LRU with an optional `on_evict(value)` hook. Module-level
+    instances hold built figures and summary tables (cpenn.charts) and export
+    file paths (cpenn.display).
+    """
+
+    def __init__(self, maxsize: int = FIGURE_CACHE_SIZE, on_evict: Optional[Callable[[object], None]] = None):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self._lock = threading.Lock()
+        self._items: "OrderedDict[tuple, object]" = OrderedDict()
+
+    def get_or_build(self, key: tuple, build: Callable[[], object]):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                return self._items[key]
+        value = build()
+        with self._lock:
+            evicted = [self._items.pop(key)] if key in self._items else []
+            self._items[key] = value
+            while len(self._items) > self.maxsize:
+                evicted.append(self._items.popitem(last=False)[1])
+        self._evict(evicted)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            evicted = list(self._items.values())
+            self._items.clear()
+        self._evict(evicted)
+
+    def _evict(self, values: list) -> None:
+        if self.on_evict is not None:
+            for value in values:
+                self.on_evict(value)
+
+_REGISTRY = DatasetRegistry()
+
+def dataset_registry() -> DatasetRegistry:
+    """The process-wide registry every session shares (a module-level singleton)."""
+    return _REGISTRY
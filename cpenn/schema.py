@@ -0,0 +1,475 @@
+"""Column vocabularies, alias resolution and load-time typing for every sport."""
+
+import re
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .trace import traced
+
+# ----------------------------
+# NASCAR TARGET COLUMN WHITELISTS
+# ----------------------------
+DESIRED_NASCAR_PROJECTIONS = [
+    "Driver",
+    "Qual",
+    "DK Sal", "FD Sal",
+    "DK Proj", "DK Val", "FD Proj", "FD Val",
+    "Proj Fin",
+    "pLL", "pFL",
+    "DK PP", "DK Dom", "FD PP", "FD Dom",
+    "DK Floor", "DK Ceiling", "FD Floor", "FD Ceiling",
+    "DK pOWN%", "FD pOWN%",
+    "DK Opt%", "FD Opt%",
+    "DK Lev%", "FD Lev%",
+    "DK Rtg", "FD Rtg"
+]
+DESIRED_NASCAR_BETTING = [
+    "Driver", "Proj Fin", "Win%", "T3%", "T5%", "T10%", "Win", "T3", "T5", "T10"
+]
+
+# ----------------------------
+# MLB TARGET COLUMN WHITELISTS (UPDATED to your headers)
+# ----------------------------
+DESIRED_MLB_PITCHERS = [
+    "V", "H", "Player", "DK Sal", "FD Sal", "Team", "Opp",
+    "IP", "ER", "K", "H", "BB", "HR", "W",
+    "DK Proj", "DK Val", "DK pOWN",
+    "FD Proj", "FD Val", "FD pOWN",
+    "DK F", "DK C", "FD F", "FD C",
+    "DK Rtg", "FD Rtg",
+]
+
+DESIRED_MLB_BATTERS = [
+    "BO", "H", "Pos", "V", "Player", "DK Sal", "FD Sal", "Team", "Opp",
+    "AB", "H", "1B", "2B", "3B", "HR", "RBI", "R", "SB", "BB", "K",
+    "DK Proj", "DK Val", "DK pOWN",
+    "FD Proj", "FD Val", "FD pOWN",
+    "DK F", "DK C", "FD F", "FD C",
+    "DK Rtg", "FD Rtg",
+]
+
+# Stacks sheet (kept flexible but aligned to your short labels)
+DESIRED_MLB_STACKS = [
+    "Team", "DK Sal", "FD Sal", "Total", "Park", "Opp", "Opp Pitcher", "H",
+    "DK Proj", "Val", "Own%", "Tstack%", "vStack%", "Lev%",
+    "FD Proj", "FD Val", "FD Own%", "FD Tstack%", "FD vStack%", "FD Lev%",
+]
+
+# ----------------------------
+# HEADER / ALIAS HANDLING
+# ----------------------------
+def _norm(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "", str(s).lower())
+
+_NASCAR_ALIAS = {
+    "Driver":      ["Driver","driver","Player Name","Player","Name"],
+    "Qual":        ["Qual","Start Pos","Start","Starting","Qualifying"],
+    "Proj Fin":    ["Proj Fin","ProjFinish","Proj Finish","Projected Finish","ProjFinish."],
+    "pLL":         ["pLL","LL","Place Laps Led","Prob LL"],
+    "pFL":         ["pFL","FL","Fast Laps Prob"],
+    "DK Sal":      ["DK Sal","DK Salary","DraftKings Salary"],
+    "DK Proj":     ["DK Proj","DK Proj.","DK Projection","DK Pro"],
+    "DK Val":      ["DK Val","DK Value"],
+    "DK pOWN%":    ["DK pOWN%","DK Own%","DK Ownership%","DK Ownership","pOWN% (DK)"],
+    "DK Opt%":     ["DK Opt%","DK Optimal%","DK Optimal"],
+    "DK Lev%":     ["DK Lev%","DK Leverage%","DK Leverage"],
+    "DK Rtg":      ["DK Rtg","DK RTG","DraftKings Rating"],
+    "DK PP":       ["DK PP","DK Pts/P$","DK Points per $"],
+    "DK Dom":      ["DK Dom","DK Dominator"],
+    "DK Floor":    ["DK Floor"],
+    "DK Ceiling":  ["DK Ceiling","DK Ceil"],
+    "FD Sal":      ["FD Sal","FD Salary","FanDuel Salary"],
+    "FD Proj":     ["FD Proj","FD Proj.","FD Projection","FD Pro"],
+    "FD Val":      ["FD Val","FD Value"],
+    "FD pOWN%":    ["FD pOWN%","FD Own%","FD Ownership%","FD Ownership","pOWN% (FD)"],
+    "FD Opt%":     ["FD Opt%","FD Optimal%","FD Optimal"],
+    "FD Lev%":     ["FD Lev%","FD Leverage%","FD Leverage"],
+    "FD Rtg":      ["FD Rtg","FD RTG","FanDuel Rating"],
+    "FD PP":       ["FD PP","FD Pts/P$","FD Points per $"],
+    "FD Dom":      ["FD Dom","FD Dominator"],
+    "FD Floor":    ["FD Floor"],
+    "FD Ceiling":  ["FD Ceiling","FD Ceil","FD Ceilig"],
+    "Win%":        ["Win%","Win %","Prob Win","P(Win)","Race Win %"],
+    "T3%":         ["T3%","Top 3 %","Prob T3","P(Top 3)","Top3%"],
+    "T5%":         ["T5%","Top 5 %","Prob T5","P(Top 5)","Top5%"],
+    "T10%":        ["T10%","Top 10 %","Prob T10","P(Top 10)","Top10%"],
+    "Win":         ["Win","Winner Odds","Race Winner","Best Win Odds","Win ML","Win Price"],
+    "T3":          ["T3","Top 3","Top 3 Odds","Best Top 3 Odds"],
+    "T5":          ["T5","Top 5","Top 5 Odds","Best Top 5 Odds"],
+    "T10":         ["T10","Top 10","Top 10 Odds","Best Top 10 Odds"],
+}
+
+# ----------------------------
+# MLB HEADER / ALIAS HANDLING (UPDATED)
+# ----------------------------
+_MLB_ALIAS = {
+    # Canonical short display labels (left) ← acceptable variants (right)
+
+    # Shared / identity
+    "Player": ["Player", "player", "Player Name", "Name"],
+    "Pos": ["Pos", "Position"],
+    "Team": ["Team", "Tm"],
+    "Opp": ["Opp", "Opponent"],
+    "BO": ["BO", "Bat Order", "Order"],
+    "H": ["H"],  # heat/conditional helper or Hits (handled by position of column)
+
+    # Implied total (column is literally 'V' in your files)
+    "V": ["V", "Imp Tot", "Imp. Tot", "Implied Total", "Team Imp. Tot", "Team Total", "Vegas Team Total", "TTTL", "IR"],
+
+    # Salaries
+    "DK Sal": ["DK Sal", "DK Salary", "DraftKings Salary", "DK Price", "DK$"],
+    "FD Sal": ["FD Sal", "FD Salary", "FanDuel Salary", "FD Price", "FD$"],
+
+    # Projections / Values
+    "DK Proj": ["DK Proj", "DK Projection", "DK Proj.", "DK Points"],
+    "FD Proj": ["FD Proj", "FD Projection", "FD Proj.", "FD Points"],
+    "DK Val":  ["DK Val", "DK Value", "Value (DK)"],
+    "FD Val":  ["FD Val", "FD Value", "Value (FD)"],
+
+    # Ownership (no % in your short labels)
+    "DK pOWN": ["DK pOWN", "DK pOWN%", "DK Own%", "DK Ownership%", "Ownership% (DK)", "pOWN% (DK)"],
+    "FD pOWN": ["FD pOWN", "FD pOWN%", "FD Own%", "FD Ownership%", "Ownership% (FD)", "pOWN% (FD)"],
+
+    # Floors/Ceilings (short)
+    "DK F": ["DK F", "DK Floor"],
+    "DK C": ["DK C", "DK Ceiling", "DK Ceil"],
+    "FD F": ["FD F", "FD Floor"],
+    "FD C": ["FD C", "FD Ceiling", "FD Ceil"],
+
+    # Ratings
+    "DK Rtg": ["DK Rtg", "DK RTG", "DraftKings Rating"],
+    "FD Rtg": ["FD Rtg", "FD RTG", "FanDuel Rating"],
+
+    # Pitcher detailed stats
+    "IP": ["IP", "IP Proj", "Innings Proj", "Projected IP"],
+    "ER": ["ER"],
+    "K":  ["K", "K Proj", "K Projection", "Proj K", "Ks Proj"],
+    "BB": ["BB"],
+    "HR": ["HR", "HR/9"],  # if you carry HR/9 separately, it’ll just be ignored here
+    "W":  ["W", "Win%", "P(Win)", "Win Prob"],
+
+    # Batter counting stats
+    "AB": ["AB"], "1B": ["1B"], "2B": ["2B"], "3B": ["3B"],
+    "RBI": ["RBI"], "R": ["R"], "SB": ["SB"],
+}
+
+class SchemaResolver:
+    """
+    An alias map compiled once: normalized alias -> candidate canonical names.
+    `resolve` maps a raw header row to canonical columns in a single pass; an
+    exact canonical label always wins over an alias that normalizes the same
+    (e.g. "Win%" vs "Win"), and each canonical column is claimed at most once.
+    """
+
+    def __init__(self, alias_map: Dict[str, List[str]], wanted=None):
+        self.canon = frozenset(alias_map) if wanted is None else frozenset(wanted)
+        self._inv: Dict[str, List[str]] = {}
+        for canon, alist in alias_map.items():
+            if canon not in self.canon:
+                continue
+            for a in [canon] + list(alist):
+                cands = self._inv.setdefault(_norm(a), [])
+                if canon not in cands:
+                    cands.append(canon)
+        for c in self.canon - set(alias_map):
+            self._inv.setdefault(_norm(c), []).append(c)
+
+    def resolve(self, headers) -> Dict[str, int]:
+        """{canonical: header position} for a raw header row."""
+        out: Dict[str, int] = {}
+        labels = [str(h).strip() if h is not None else "" for h in headers]
+        for i, s in enumerate(labels):
+            if s in self.canon and s not in out:
+                out[s] = i
+        taken = set(out.values())
+        for i, s in enumerate(labels):
+            if not s or i in taken:
+                continue
+            for canon in self._inv.get(_norm(s), ()):
+                if canon not in out:
+                    out[canon] = i
+                    break
+        return out
+
+    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Rename a frame's columns to their canonical names."""
+        if df is None or df.empty:
+            return df
+        hit = self.resolve(df.columns)
+        ren = {df.columns[i]: canon for canon, i in hit.items() if df.columns[i] != canon}
+        return df.rename(columns=ren) if ren else df
+
+# ----------------------------
+# GENERIC CLEANUP CONSTANTS
+# ----------------------------
+NUMERIC_KEYS = {
+    "DK Sal", "FD Sal", "DK Proj", "FD Proj", "DK Val", "FD Val",
+    "DK pOWN%", "FD pOWN%", "DK Opt%", "FD Opt%", "DK Lev%", "FD Lev%",
+    "DK Rtg", "FD Rtg", "DK Pro", "FD Pro",
+    "Comp%", "Pa Yards", "Pa Attempts", "Pa Comp", "Pa TD", "Int",
+    "Ru Attempts", "Ru Yards", "Ru TD", "Rec", "Rec Yards", "Rec TD",
+    "DK%", "FD%",
+    "Qual", "Start Pos", "Proj Finish", "Proj Fin", "pLL", "Fast Laps", "PD",
+    "DK PP", "FD PP", "DK Dom", "FD Dom", "DK Floor", "DK Ceiling", "FD Floor", "FD Ceilig",
+}
+
+EXCLUDE_PATTERNS = [
+    re.compile(r"^unnamed", re.I),
+    re.compile(r"opto import$", re.I),
+    re.compile(r"^_?\d+(?:\.\d+)?$"),
+]
+
+# ----------------------------
+# MLB rate stats that need 3-dec display (NEW)
+# ----------------------------
+MLB_THREE_DEC_STATS = {"ba", "avg", "obp", "slg", "ops", "woba", "xwoba"}
+
+# ----------------------------
+# GENERIC COLUMN STANDARDIZATION (NFL/general)
+# ----------------------------
+def standardize_columns(df: pd.DataFrame) -> pd.DataFrame:
+    renames: Dict[str, str] = {}
+    cols_lower = {c: str(c).strip().lower() for c in df.columns}
+    for c, lc in cols_lower.items():
+        if lc in ("player", "name", "playername", "player name"):
+            renames[c] = "Player Name"
+        elif lc in ("position", "pos."):
+            renames[c] = "Pos"
+        elif lc in ("opponent", "opp."):
+            renames[c] = "Opp"
+        elif lc == "teamname":
+            renames[c] = "Team"
+    if renames:
+        df = df.rename(columns=renames)
+    return df
+
+@traced("clean_columns")
+def clean_columns(df: pd.DataFrame) -> pd.DataFrame:
+    if df.empty:
+        return df
+    keep = [c for c in df.columns if not any(rx.search(str(c)) for rx in EXCLUDE_PATTERNS)]
+    df = df[keep].copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    df = standardize_columns(df)
+    empty_cols = [c for c in df.columns if _all_blank(df[c])]
+    if empty_cols:
+        df = df.drop(columns=empty_cols)
+    return df
+
+# ----------------------------
+# TYPED SCHEMA (numeric coercion happens once, at load)
+# ----------------------------
+TEXT_KEYS = {
+    "Driver", "Player", "Player Name", "Name", "Team", "Opp", "Pos", "Opp Pitcher", "Park",
+    "Bats", "Pitcher Hand", "QB", "RB", "WR", "WR1", "WR2", "WR3", "TE", "DST",
+    "Stack", "Stack Team", "Bringback", "Bring Back", "Game", "Matchup",
+}
+INT_KEYS = {
+    "DK Sal", "FD Sal", "Stack Salary", "Qual", "Start Pos", "BO", "Bat Order",
+    "Win", "T3", "T5", "T10",
+}
+# Ambiguous short labels (MLB "H" is a heat helper or Hits) are inferred, never forced
+_INFER_ONLY = {"H"}
+# whole words only, so e.g. "Touchdown" or "Down" never reads as ownership
+_PCT_MARKERS = ("own", "pown", "ownership", "opt", "optimal", "lev", "leverage", "tgt share")
+_PCT_RX = re.compile(r"(?<![a-z0-9])(?:%s)(?![a-z0-9])" % "|".join(map(re.escape, _PCT_MARKERS)))
+_NASCAR_NUMERIC_HINTS = ("proj", "sal", "own", "val", "finish", "laps")
+_NA_TOKENS = {"", "-", "–", "—", "n/a", "na", "nan", "none", "#n/a", "#div/0!", "#value!", "#ref!", "#num!", "#name?", "#null!"}
+
+def sheet_kind(sport: str, sheet_name: str) -> str:
+    s = str(sheet_name).strip().lower()
+    sport = str(sport).upper()
+    if sport == "NASCAR":
+        if "betting" in s or "dashboard" in s:
+            return "nascar_betting"
+        return "nascar_proj" if "proj" in s else "nascar_other"
+    if sport == "MLB":
+        if "pitch" in s:
+            return "mlb_pitchers"
+        if "batter" in s or "hit" in s:
+            return "mlb_batters"
+        return "mlb_stacks" if "stack" in s else "mlb_other"
+    if "stack" in s:
+        return "nfl_stacks"
+    return "nfl_proj" if "proj" in s else "generic"
+
+_SHEET_WHITELISTS = {
+    "nascar_proj": DESIRED_NASCAR_PROJECTIONS,
+    "nascar_betting": DESIRED_NASCAR_BETTING,
+    "mlb_pitchers": DESIRED_MLB_PITCHERS,
+    "mlb_batters": DESIRED_MLB_BATTERS,
+    "mlb_stacks": DESIRED_MLB_STACKS,
+}
+_SPORT_ALIASES = {"NASCAR": _NASCAR_ALIAS, "MLB": _MLB_ALIAS}
+
+# Compiled once at import: one resolver per sport, plus one per whitelisted sheet kind
+SCHEMA_RESOLVERS: Dict[tuple, SchemaResolver] = {
+    (sport, None): SchemaResolver(amap) for sport, amap in _SPORT_ALIASES.items()
+}
+SCHEMA_RESOLVERS.update({
+    (sport, kind): SchemaResolver(_SPORT_ALIASES[sport], wanted)
+    for kind, wanted in _SHEET_WHITELISTS.items()
+    for sport in [kind.split("_", 1)[0].upper()]
+})
+
+def schema_resolver(sport: str, sheet_name: Optional[str] = None) -> SchemaResolver:
+    sport = str(sport).upper()
+    kind = sheet_kind(sport, sheet_name) if sheet_name is not None else None
+    return SCHEMA_RESOLVERS.get((sport, kind)) or SCHEMA_RESOLVERS[(sport, None)]
+
+def is_percent_col(col) -> bool:
+    cl = str(col).lower()
+    return "%" in cl or bool(_PCT_RX.search(cl))
+
+_SCHEMAS: Dict[tuple, dict] = {}
+
+def sheet_schema(sport: str, sheet_name: str) -> dict:
+    """Numeric/int/text column sets for a sport + sheet kind, from NUMERIC_KEYS, aliases and whitelists."""
+    kind = sheet_kind(sport, sheet_name)
+    key = (str(sport).upper(), kind)
+    if key not in _SCHEMAS:
+        canon = set(_SPORT_ALIASES.get(key[0], {}).keys())
+        whitelist = set(_SHEET_WHITELISTS.get(kind, []))
+        numeric = (set(NUMERIC_KEYS) | canon | whitelist) - TEXT_KEYS - _INFER_ONLY
+        _SCHEMAS[key] = {
+            "kind": kind,
+            "numeric": frozenset(numeric),
+            "int": frozenset(INT_KEYS),
+            "text": frozenset(TEXT_KEYS),
+        }
+    return _SCHEMAS[key]
+
+def _blank_mask(s: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(s):
+        return s.isna()
+    return s.isna() | s.astype("string").str.strip().str.lower().isin(_NA_TOKENS)
+
+def _all_blank(s: pd.Series) -> bool:
+    # a filled cell near the top settles it without scanning the whole column
+    return bool(_blank_mask(s.iloc[:256]).all()) and bool(_blank_mask(s).all())
+
+def _to_number(s: pd.Series):
+    """The one string → number scrub: strips %, $ and commas. Returns (float64 series, had '%' strings)."""
+    if pd.api.types.is_bool_dtype(s):
+        return s.astype("float64"), False
+    if pd.api.types.is_numeric_dtype(s):
+        return pd.to_numeric(s, errors="coerce").astype("float64"), False
+    txt = s.astype("string").str.strip()
+    had_pct = bool(txt.str.endswith("%").fillna(False).any())
+    txt = txt.mask(txt.str.lower().isin(_NA_TOKENS))
+    num = pd.to_numeric(txt.str.replace(r"[%$,]", "", regex=True), errors="coerce")
+    return num.astype("float64"), had_pct
+
+def _maybe_int(num: pd.Series) -> pd.Series:
+    vals = num.dropna()
+    if vals.empty or not np.isfinite(vals.to_numpy()).all() or (vals % 1 != 0).any():
+        return num
+    return num.astype("Int64")
+
+@traced("numeric coercion")
+def type_frame(df: pd.DataFrame, sport: str, sheet_name: str) -> pd.DataFrame:
+    """
+    Give every column its final dtype once: schema numerics → float64 (Int64 for
+    salaries/ordinals/odds), percent columns numeric with their scale recorded in
+    df.attrs["schema"]["percent_scale"] (1 → stored as 0–1, 100 → stored as 0–100),
+    other object columns numeric if every non-blank cell parses, else plain text.
+    """
+    if df is None or df.empty:
+        return df
+    schema = sheet_schema(sport, sheet_name)
+    nascar = schema["kind"].startswith("nascar")
+    df = df.copy()
+    pct_scale: Dict[str, int] = {}
+
+    for col in df.columns:
+        s = df[col]
+        if isinstance(s, pd.DataFrame):
+            continue
+        name = str(col)
+        forced = (
+            name in schema["numeric"]
+            or (is_percent_col(name) and name not in schema["text"])
+            or (nascar and name not in schema["text"] and any(k in name.lower() for k in _NASCAR_NUMERIC_HINTS))
+        )
+        if name in schema["text"] and not pd.api.types.is_numeric_dtype(s):
+            df[col] = s.where(s.isna(), s.astype(str))
+            continue
+
+        num, had_pct = _to_number(s)
+        if not (forced or pd.api.types.is_numeric_dtype(s)):
+            nonblank = ~_blank_mask(s)
+            if not nonblank.any() or num[nonblank].isna().any():
+                df[col] = s.where(s.isna(), s.astype(str))
+                continue
+
+        if is_percent_col(name):
+            vals = num.dropna()
+            if not vals.empty:
+                pct_scale[name] = 100 if had_pct or vals.abs().max() > 1 else 1
+        df[col] = _maybe_int(num) if name in schema["int"] else num
+
+    df.attrs["schema"] = {"kind": schema["kind"], "percent_scale": pct_scale}
+    return df
+
+# ----------------------------
+# COMPACT STORAGE (optional, per session)
+# ----------------------------
+CATEGORY_KEYS = {"Team", "Opp", "Pos", "Bats", "Pitcher Hand", "Park", "Stack Team"}
+NAME_KEYS = {"Driver", "Player", "Player Name", "Name"}
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(deep=True, index=True).sum()) if isinstance(df, pd.DataFrame) else 0
+
+def _smallest_int(s: pd.Series) -> str:
+    vals = s.dropna()
+    if vals.empty:
+        return "Int8"
+    lo, hi = int(vals.min()), int(vals.max())
+    for dtype, info in (("Int8", np.iinfo(np.int8)), ("Int16", np.iinfo(np.int16)), ("Int32", np.iinfo(np.int32))):
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return "Int64"
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Low-cardinality text → category, floats → float32, nullable ints → the
+    smallest Int width that fits, player/driver names interned. Column names,
+    order and attrs are unchanged, so filters and charts work as before.
+    """
+    if df is None or df.empty:
+        return df
+    out = df.copy()
+    n = len(out)
+    for col in out.columns:
+        s = out[col]
+        if isinstance(s, pd.DataFrame):
+            continue
+        if pd.api.types.is_float_dtype(s) and s.dtype != np.float32:
+            out[col] = s.astype("float32")
+        elif isinstance(s.dtype, pd.Int64Dtype) or pd.api.types.is_integer_dtype(s):
+            out[col] = s.astype(_smallest_int(s))
+        elif s.dtype == object:
+            if col in NAME_KEYS:
+                out[col] = s.map(lambda v: sys.intern(v) if isinstance(v, str) else v)
+            elif col in CATEGORY_KEYS or s.nunique(dropna=True) <= max(1, n // 2):
+                out[col] = s.astype("category")
+    out.attrs = dict(df.attrs)
+    return out
+
+def numeric_col(df: pd.DataFrame, col: str) -> Optional[pd.Series]:
+    """Non-null values of a typed numeric column, or None if absent/non-numeric/empty."""
+    if col not in df.columns or not pd.api.types.is_numeric_dtype(df[col]):
+        return None
+    vals = df[col].dropna()
+    return vals if not vals.empty else None
+
+def percent_scale(df: pd.DataFrame, col: str) -> int:
+    """Recorded scale of a percent column (1 or 100); guessed from the data if the frame is untyped."""
+    rec = df.attrs.get("schema", {}).get("percent_scale", {})
+    if col in rec:
+        return rec[col]
+    vals = df[col].dropna() if pd.api.types.is_numeric_dtype(df[col]) else pd.Series(dtype=float)
+    return 1 if (not vals.empty and vals.abs().max() <= 1) else 100
@@ -0,0 +1,252 @@
+"""Name search index and cached boolean-mask filter engine."""
+
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .schema import _norm
+
+# ----------------------------
+# NAME SEARCH INDEX
+# ----------------------------
+_WORD_RX = re.compile(r"[a-z0-9]+")
+
+def _name_grams(key: str) -> set:
+    return {key[i:i + 3] for i in range(len(key) - 2)}
+
+def name_column(df: pd.DataFrame) -> Optional[str]:
+    for c in ("Driver", "Player Name", "Player", "Name"):
+        if c in df.columns:
+            return c
+    return None
+
+class NameIndex:
+    """
+    `_norm`-folded name lookup: trigram postings answer substring queries,
+    word prefixes answer 1-2 character queries. Every distinct name keeps the
+    (tag, row positions) it was added under, so one index can span sheets,
+    datasets and sports.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._keys: List[str] = []
+        self._locs: List[list] = []
+        self._grams: Dict[str, List[int]] = {}
+        self._free: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @staticmethod
+    def _postings(name: str, key: str) -> set:
+        grams = _name_grams(key)
+        for w in _WORD_RX.findall(name.lower()):
+            grams.update({"^" + w[:1], "^" + w[:2]})
+        return grams
+
+    def _intern(self, name: str) -> Optional[int]:
+        key = _norm(name)
+        if not key:
+            return None
+        nid = self._ids.get(key)
+        if nid is None:
+            if self._free:
+                nid = self._free.pop()
+                self._names[nid], self._keys[nid] = name, key
+            else:
+                nid = len(self._keys)
+                self._names.append(name)
+                self._keys.append(key)
+                self._locs.append([])
+            self._ids[key] = nid
+            for g in self._postings(name, key):
+                self._grams.setdefault(g, []).append(nid)
+        return nid
+
+    def add(self, names: pd.Series, tag=None) -> None:
+        """Index a name column; its rows are recorded under `tag`."""
+        codes, uniques = pd.factorize(names)
+        if not len(uniques):
+            return
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+        for u, name in enumerate(uniques):
+            nid = self._intern(str(name))
+            if nid is not None:
+                self._locs[nid].append((tag, order[bounds[u]:bounds[u + 1]]))
+
+    def remove(self, pred: Callable[[object], bool]) -> None:
+        """Forget every location whose tag matches `pred`, and any name left without one."""
+        for nid, locs in enumerate(self._locs):
+            if not locs:
+                continue
+            locs[:] = [loc for loc in locs if not pred(loc[0])]
+            if not locs:
+                self._release(nid)
+
+    def _release(self, nid: int) -> None:
+        key = self._keys[nid]
+        for g in self._postings(self._names[nid], key):
+            post = self._grams.get(g)
+            if post is None:
+                continue
+            post.remove(nid)
+            if not post:
+                del self._grams[g]
+        del self._ids[key]
+        self._names[nid] = self._keys[nid] = ""
+        self._free.append(nid)
+
+    def _match(self, query: str) -> List[int]:
+        q = _norm(query)
+        if not q:
+            return []
+        if len(q) < 3:
+            return list(self._grams.get("^" + q, ()))
+        grams = sorted(_name_grams(q), key=lambda g: len(self._grams.get(g, ())))
+        cand = set(self._grams.get(grams[0], ()))
+        for g in grams[1:]:
+            if not cand:
+                break
+            cand.intersection_update(self._grams.get(g, ()))
+        return [nid for nid in cand if q in self._keys[nid]]
+
+    def rows(self, query: str, tag=None) -> np.ndarray:
+        """Row positions under `tag` whose name matches `query`."""
+        parts = [r for nid in self._match(query) for t, r in self._locs[nid] if t == tag]
+        return np.unique(np.concatenate(parts)) if parts else np.empty(0, dtype=np.intp)
+
+    def find(self, query: str, limit: int = 500) -> List[tuple]:
+        """(name, tag, rows) for every location of every matching name, by name."""
+        out = []
+        for nid in sorted(self._match(query), key=self._keys.__getitem__):
+            for tag, rows in self._locs[nid]:
+                out.append((self._names[nid], tag, rows))
+                if len(out) >= limit:
+                    return out
+        return out
+
+# ----------------------------
+# FILTER ENGINE (cached boolean masks)
+# ----------------------------
+FILTER_NUMERIC = ("DK Sal", "DK Proj", "Bat Order", "K Proj", "IP Proj")
+FILTER_CATEGORY = ("Pos", "Team", "Bats", "Pitcher Hand")
+FILTER_TEXT = ("Driver", "Player Name")
+
+class FilterEngine:
+    """
+    NumPy arrays for a frame's filterable columns, built once, plus an LRU of
+    per-widget boolean masks keyed on (kind, column, value). Changing one widget
+    only computes that widget's mask; the rest come from the cache. Name search
+    ("contains") goes through a NameIndex, i.e. `_norm`-folded trigram lookup,
+    not a substring scan of the column.
+    """
+
+    MAX_MASKS = 128
+
+    def __init__(self, df: pd.DataFrame):
+        self.n = len(df)
+        self._df = weakref.ref(df)
+        self._lock = threading.Lock()
+        self._num: Dict[str, np.ndarray] = {}
+        self._cat: Dict[str, tuple] = {}
+        self._names: Dict[str, NameIndex] = {}
+        self._masks: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+        for col in FILTER_NUMERIC:
+            if col in df.columns and pd.api.types.is_numeric_dtype(df[col]):
+                self._numeric(col)
+        for col in FILTER_CATEGORY:
+            if col in df.columns:
+                self._category(col)
+        for col in FILTER_TEXT:
+            if col in df.columns:
+                self._name_index(col)
+
+    def _frame(self) -> pd.DataFrame:
+        df = self._df()
+        if df is None:
+            raise RuntimeError("filter engine outlived its frame")
+        return df
+
+    def _numeric(self, col: str) -> np.ndarray:
+        if col not in self._num:
+            self._num[col] = self._frame()[col].to_numpy(dtype="float64", na_value=np.nan)
+        return self._num[col]
+
+    def _category(self, col: str) -> tuple:
+        if col not in self._cat:
+            s = self._frame()[col]
+            labels = s.astype(str).where(s.notna())
+            codes, uniques = pd.factorize(labels)
+            self._cat[col] = (codes, {str(u): i for i, u in enumerate(uniques)})
+        return self._cat[col]
+
+    def _name_index(self, col: str) -> NameIndex:
+        if col not in self._names:
+            idx = NameIndex()
+            idx.add(self._frame()[col])
+            self._names[col] = idx
+        return self._names[col]
+
+    def _compute(self, kind: str, col: str, value) -> np.ndarray:
+        if kind == "range":
+            arr = self._numeric(col)
+            lo, hi = value
+            with np.errstate(invalid="ignore"):
+                return (arr >= lo) & (arr <= hi)
+        if kind == "equals":
+            codes, lookup = self._category(col)
+            code = lookup.get(str(value))
+            return np.zeros(self.n, dtype=bool) if code is None else codes == code
+        if kind == "contains":
+            out = np.zeros(self.n, dtype=bool)
+            out[self._name_index(col).rows(str(value))] = True
+            return out
+        raise ValueError(f"unknown filter kind: {kind}")
+
+    def mask(self, kind: str, col: str, value) -> np.ndarray:
+        key = (kind, col, value)
+        with self._lock:
+            hit = self._masks.get(key)
+            if hit is not None:
+                self._masks.move_to_end(key)
+                return hit
+        m = self._compute(kind, col, value)
+        m.flags.writeable = False
+        with self._lock:
+            self._masks[key] = m
+            while len(self._masks) > self.MAX_MASKS:
+                self._masks.popitem(last=False)
+        return m
+
+    def combine(self, specs: List[tuple]) -> Optional[np.ndarray]:
+        """AND of the cached masks for (kind, column, value) specs; None when nothing filters."""
+        if not specs:
+            return None
+        out = np.ones(self.n, dtype=bool)
+        for kind, col, value in specs:
+            out &= self.mask(kind, col, value)
+        return out
+
+# Module-level, keyed by frame identity; entries go with their frame (weakref.finalize)
+_ENGINES: Dict[int, FilterEngine] = {}
+
+def _filter_engines() -> Dict[int, FilterEngine]:
+    return _ENGINES
+
+def filter_engine(df: pd.DataFrame) -> FilterEngine:
+    """The FilterEngine for this exact frame object, built once and dropped with the frame."""
+    engines = _filter_engines()
+    eng = engines.get(id(df))
+    if eng is None or eng._df() is not df:
+        eng = FilterEngine(df)
+        engines[id(df)] = eng
+        weakref.finalize(df, engines.pop, id(df), None)
+    return eng
@@ -0,0 +1,213 @@
+"""
+Synthetic slate workbooks shaped like the real NFL / NASCAR / MLB models, for
+benchmarks: title rows above the header, alias header variants, blank and
+Unnamed columns, "$5,400" / "12.5%" strings mixed with numbers, and thousands
+of formatted-but-empty rows after the data.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .schema import _MLB_ALIAS, _NASCAR_ALIAS, _norm
+
+SYNTH_SPORTS = ("NFL", "NASCAR", "MLB")
+# Part of generated file names; bump when layouts change so cached workbooks are rebuilt
+SYNTH_VERSION = 1
+TRAILING_BLANK_ROWS = 3000
+
+_TEAMS = ["KC", "PHI", "DAL", "NYG", "BUF", "SF", "MIA", "DET", "BAL", "CIN", "GB", "LAR"]
+_MLB_TEAMS = ["NYY", "BOS", "LAD", "SEA", "HOU", "ATL", "CHC", "SD", "TOR", "PHI"]
+
+def pick_headers(canon: List[str], alias_map: Dict[str, List[str]], rng: np.random.Generator) -> List[str]:
+    """A random alias variant per canonical column, never colliding (after _norm) with another column."""
+    reserved = {_norm(c) for c in canon}
+    used, out = set(), []
+    for c in canon:
+        options = [v for v in alias_map.get(c, [c])
+                   if _norm(v) not in used and (_norm(v) == _norm(c) or _norm(v) not in reserved)]
+        pick = options[rng.integers(len(options))] if options else c
+        used.add(_norm(pick))
+        out.append(pick)
+    return out
+
+def _money(vals: np.ndarray, rng: np.random.Generator, share: float = 0.3) -> list:
+    as_str = rng.random(len(vals)) < share
+    return [f"${int(v):,}" if s else int(v) for v, s in zip(vals, as_str)]
+
+def _pct(vals: np.ndarray, rng: np.random.Generator, share: float = 0.4) -> list:
+    """Fractions (0–1); some columns arrive as '12.5%' strings the way pasted sheets do."""
+    if rng.random() < share:
+        return [f"{v * 100:.1f}%" for v in vals]
+    return np.round(vals, 4).tolist()
+
+def _round(vals: np.ndarray, nd: int = 2) -> list:
+    return np.round(vals, nd).tolist()
+
+def _sheet(wb, title: str, header: List[str], columns: List[list], offset: int = 0,
+           title_text: Optional[str] = None, trailing: int = TRAILING_BLANK_ROWS, calc_cols: int = 4) -> None:
+    ws = wb.create_sheet(title)
+    for i in range(offset):
+        ws.append([title_text if i == 0 else None])
+    ws.append(header)
+    for row in zip(*columns):
+        ws.append(list(row))
+    # formula rows below the data: key cells blank, calculated cells evaluate to 0
+    blank = [None] * (len(header) - calc_cols) + [0] * calc_cols if calc_cols else [None] * len(header)
+    for _ in range(trailing):
+        ws.append(blank)
+
+def _nfl(wb, rows: int, rng: np.random.Generator) -> None:
+    n = rows
+    header = ["Player", "Pos", "Team", "Opp", "DK Sal", "FD Sal", "DK Proj", "FD Proj", "DK Val", "FD Val",
+              "DK pOWN%", "FD pOWN%", "Pa Yards", "Ru Yards", "Rec Yards", None, "Opto Import"]
+    dk_sal = rng.integers(3000, 9500, n) // 100 * 100
+    fd_sal = rng.integers(4000, 10500, n) // 100 * 100
+    dk_proj = rng.gamma(2.0, 6.0, n)
+    fd_proj = dk_proj * rng.uniform(0.9, 1.1, n)
+    cols = [
+        [f"Player {i}" for i in range(n)],
+        rng.choice(["QB", "RB", "WR", "TE", "DST"], n).tolist(),
+        rng.choice(_TEAMS, n).tolist(),
+        rng.choice(_TEAMS, n).tolist(),
+        _money(dk_sal, rng), _money(fd_sal, rng),
+        _round(dk_proj), _round(fd_proj),
+        _round(dk_proj / dk_sal * 1000), _round(fd_proj / fd_sal * 1000),
+        _pct(rng.beta(1.2, 12, n), rng), _pct(rng.beta(1.2, 12, n), rng),
+        rng.integers(0, 350, n).tolist(), rng.integers(0, 120, n).tolist(), rng.integers(0, 140, n).tolist(),
+        [None] * n,
+        [f"Player {i}:{i}" for i in range(n)],
+    ]
+    _sheet(wb, "Projections", header, cols)
+
+    m = max(10, n // 4)
+    total = rng.gamma(3.0, 20.0, m)
+    _sheet(wb, "Stacks", ["Team", "QB", "WR1", "WR2", "Total", "Imp. Tot", "DK Stack pOWN%", "DK Stack Opt%", "Stack Salary"], [
+        rng.choice(_TEAMS, m).tolist(),
+        [f"QB {i}" for i in range(m)], [f"WR {i}" for i in range(m)], [f"WR {i + m}" for i in range(m)],
+        _round(total), _round(rng.uniform(17, 31, m), 1),
+        _pct(rng.beta(1.2, 20, m), rng), _pct(rng.beta(1.2, 20, m), rng),
+        _money(rng.integers(15000, 26000, m), rng),
+    ], trailing=min(TRAILING_BLANK_ROWS, 200), calc_cols=0)
+
+def _nascar(wb, rows: int, rng: np.random.Generator) -> None:
+    n = rows
+    canon = ["Driver", "Qual", "DK Sal", "FD Sal", "DK Proj", "FD Proj", "DK Val", "FD Val", "Proj Fin",
+             "pLL", "pFL", "DK pOWN%", "FD pOWN%", "DK Opt%", "FD Opt%", "DK Lev%", "FD Lev%",
+             "DK Floor", "DK Ceiling", "FD Floor", "FD Ceiling"]
+    header = pick_headers(canon, _NASCAR_ALIAS, rng) + [None, "Unnamed: 22", "Notes"]
+    dk_sal = rng.integers(5000, 11500, n) // 100 * 100
+    fd_sal = rng.integers(4000, 14500, n) // 100 * 100
+    dk_proj = rng.gamma(3.0, 12.0, n)
+    fd_proj = dk_proj * rng.uniform(0.8, 1.2, n)
+    fin = rng.integers(1, 41, n)
+    cols = [
+        [f"Driver {i}" for i in range(n)],
+        rng.integers(1, 41, n).tolist(),
+        _money(dk_sal, rng), _money(fd_sal, rng),
+        _round(dk_proj), _round(fd_proj),
+        _round(dk_proj / dk_sal * 1000), _round(fd_proj / fd_sal * 1000),
+        fin.tolist(),
+        _round(rng.random(n), 3), _round(rng.random(n), 3),
+        _pct(rng.beta(1.5, 8, n), rng), _pct(rng.beta(1.5, 8, n), rng),
+        _pct(rng.beta(1.2, 10, n), rng), _pct(rng.beta(1.2, 10, n), rng),
+        _pct(rng.normal(0, 0.05, n), rng), _pct(rng.normal(0, 0.05, n), rng),
+        _round(dk_proj * 0.6), _round(dk_proj * 1.5), _round(fd_proj * 0.6), _round(fd_proj * 1.5),
+        [None] * n, [None] * n,
+        ["" if i % 7 else "watch" for i in range(n)],
+    ]
+    offset = int(rng.integers(1, 4))
+    _sheet(wb, "Projections", header, cols, offset=offset, title_text="Race info · synthetic", calc_cols=5)
+
+    bet = ["Driver", "Proj Fin", "Win%", "T3%", "T5%", "T10%", "Win", "T3", "T5", "T10"]
+    win = rng.beta(1, 25, n)
+    _sheet(wb, "Betting Dashboard", pick_headers(bet, _NASCAR_ALIAS, rng), [
+        [f"Driver {i}" for i in range(n)], fin.tolist(),
+        _pct(win, rng), _pct(np.minimum(win * 3, 1), rng),
+        _pct(np.minimum(win * 5, 1), rng), _pct(np.minimum(win * 10, 1), rng),
+        rng.integers(300, 20000, n).tolist(), rng.integers(100, 6000, n).tolist(),
+        rng.integers(50, 3000, n).tolist(), rng.integers(-200, 1500, n).tolist(),
+    ], offset=int(rng.integers(0, 2)), title_text="Betting Dashboard", trailing=min(TRAILING_BLANK_ROWS, 200), calc_cols=2)
+
+def _mlb(wb, rows: int, rng: np.random.Generator) -> None:
+    m = max(10, rows // 10)
+    pitch = ["V", "H", "Player", "DK Sal", "FD Sal", "Team", "Opp", "IP", "ER", "K", "BB", "HR", "W",
+             "DK Proj", "DK Val", "DK pOWN", "FD Proj", "FD Val", "FD pOWN", "DK F", "DK C", "FD F", "FD C",
+             "DK Rtg", "FD Rtg"]
+    dk = rng.gamma(4.0, 4.5, m)
+    fd = dk * rng.uniform(1.6, 2.2, m)
+    sal = rng.integers(5000, 12000, m) // 100 * 100
+    _sheet(wb, "Pitcher Projections", pick_headers(pitch, _MLB_ALIAS, rng), [
+        _round(rng.uniform(3, 6, m), 1), [None] * m,
+        [f"Pitcher {i}" for i in range(m)],
+        _money(sal, rng), _money(rng.integers(6000, 12500, m) // 100 * 100, rng),
+        rng.choice(_MLB_TEAMS, m).tolist(), rng.choice(_MLB_TEAMS, m).tolist(),
+        _round(rng.uniform(4, 7, m), 1), _round(rng.uniform(1, 4, m)), _round(rng.uniform(3, 9, m)),
+        _round(rng.uniform(1, 3, m)), _round(rng.uniform(0.3, 1.4, m)), _round(rng.uniform(0.2, 0.6, m)),
+        _round(dk), _round(dk / sal * 1000), _pct(rng.beta(1.5, 8, m), rng),
+        _round(fd), _round(fd / sal * 1000), _pct(rng.beta(1.5, 8, m), rng),
+        _round(dk * 0.5), _round(dk * 1.6), _round(fd * 0.5), _round(fd * 1.6),
+        rng.integers(20, 100, m).tolist(), rng.integers(20, 100, m).tolist(),
+    ], offset=1, title_text="Pitchers", trailing=min(TRAILING_BLANK_ROWS, 500))
+
+    n = rows
+    bat = ["BO", "H", "Pos", "V", "Player", "DK Sal", "FD Sal", "Team", "Opp", "AB", "1B", "2B", "3B",
+           "HR", "RBI", "R", "SB", "BB", "K", "DK Proj", "DK Val", "DK pOWN", "FD Proj", "FD Val", "FD pOWN",
+           "DK F", "DK C", "FD F", "FD C", "DK Rtg", "FD Rtg"]
+    dk = rng.gamma(2.5, 3.2, n)
+    fd = dk * rng.uniform(1.5, 2.0, n)
+    sal = rng.integers(2000, 6500, n) // 100 * 100
+    _sheet(wb, "Batter Projections", pick_headers(bat, _MLB_ALIAS, rng), [
+        (np.arange(n) % 9 + 1).tolist(), [None] * n,
+        rng.choice(["C", "1B", "2B", "3B", "SS", "OF"], n).tolist(), _round(rng.uniform(3, 6, n), 1),
+        [f"Batter {i}" for i in range(n)],
+        _money(sal, rng), _money(rng.integers(2000, 4700, n) // 100 * 100, rng),
+        rng.choice(_MLB_TEAMS, n).tolist(), rng.choice(_MLB_TEAMS, n).tolist(),
+        _round(rng.uniform(3, 5, n)), _round(rng.uniform(0.4, 1, n)), _round(rng.uniform(0.1, 0.4, n)),
+        _round(rng.uniform(0, 0.05, n), 3), _round(rng.uniform(0, 0.3, n)), _round(rng.uniform(0.2, 0.8, n)),
+        _round(rng.uniform(0.2, 0.8, n)), _round(rng.uniform(0, 0.3, n)), _round(rng.uniform(0.2, 0.6, n)),
+        _round(rng.uniform(0.5, 1.4, n)),
+        _round(dk), _round(dk / sal * 1000), _pct(rng.beta(1.2, 12, n), rng),
+        _round(fd), _round(fd / sal * 1000), _pct(rng.beta(1.2, 12, n), rng),
+        _round(dk * 0.3), _round(dk * 2.2), _round(fd * 0.3), _round(fd * 2.2),
+        rng.integers(20, 100, n).tolist(), rng.integers(20, 100, n).tolist(),
+    ], offset=1, title_text="Batters")
+
+    k = max(10, rows // 20)
+    _sheet(wb, "Top Stacks", ["Team", "DK Sal", "FD Sal", "Total", "Park", "Opp", "Opp Pitcher", "H",
+                              "DK Proj", "Val", "Own%", "Tstack%", "vStack%", "Lev%"], [
+        rng.choice(_MLB_TEAMS, k).tolist(),
+        _money(rng.integers(20000, 32000, k), rng), _money(rng.integers(15000, 22000, k), rng),
+        _round(rng.uniform(3, 7, k)), rng.choice(_MLB_TEAMS, k).tolist(), rng.choice(_MLB_TEAMS, k).tolist(),
+        [f"Pitcher {i}" for i in range(k)], [None] * k,
+        _round(rng.gamma(6, 8, k)), _round(rng.uniform(1, 2.5, k)),
+        _pct(rng.beta(1.2, 20, k), rng), _pct(rng.beta(1.2, 20, k), rng),
+        _pct(rng.beta(1.2, 20, k), rng), _pct(rng.normal(0, 0.03, k), rng),
+    ], trailing=min(TRAILING_BLANK_ROWS, 200), calc_cols=0)
+
+_BUILDERS = {"NFL": _nfl, "NASCAR": _nascar, "MLB": _mlb}
+
+def synth_workbook(path, sport: str, rows: int = 200, seed: int = 0) -> Path:
+    """Write a synthetic `sport` slate with `rows` players to `path` (.xlsx or .xlsm)."""
+    from openpyxl import Workbook
+    sport = str(sport).upper()
+    if sport not in _BUILDERS:
+        raise ValueError(f"unknown sport: {sport}")
+    rng = np.random.default_rng(seed)
+    wb = Workbook(write_only=True)
+    _BUILDERS[sport](wb, max(1, int(rows)), rng)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    wb.save(path)
+    return path
+
+def synth_slates(out_dir, rows: int = 200, seed: int = 0, sports=SYNTH_SPORTS) -> Dict[str, Path]:
+    """One workbook per sport in `out_dir` (reused when already generated with the same rows/seed)."""
+    out_dir = Path(out_dir)
+    out = {}
+    for sport in sports:
+        ext = ".xlsm" if sport == "NASCAR" else ".xlsx"
+        path = out_dir / f"synth{SYNTH_VERSION}_{sport.lower()}_{rows}_{seed}{ext}"
+        out[sport] = path if path.exists() else synth_workbook(path, sport, rows, seed)
+    return out
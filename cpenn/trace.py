@@ -0,0 +1,149 @@
+"""
+Timing spans for loads and renders. A Trace collects nested spans (name,
+start/duration in ms, depth, plus attributes such as cache hits, rows, columns
+and bytes); `span()` records into the active trace and costs nothing when no
+trace is active. Pool workers trace into their own Trace and the parent merges
+it on the shared wall clock.
+"""
+
+import json
+import time
+import functools
+import contextvars
+from contextlib import contextmanager
+from typing import List, Optional
+
+class Trace:
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.wall0 = time.time()
+        self._t0 = time.perf_counter()
+        self._depth = 0
+        self.spans: List[dict] = []
+
+    def now_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000.0
+
+    def begin(self, name: str, depth: Optional[int] = None, **attrs) -> dict:
+        """Open a span by hand (for callback-driven code); close it with `end`."""
+        rec = {"name": name, "start_ms": round(self.now_ms(), 3), "ms": None,
+               "depth": self._depth if depth is None else depth}
+        rec.update(attrs)
+        self.spans.append(rec)
+        return rec
+
+    def end(self, rec: dict, **attrs) -> dict:
+        rec["ms"] = round(self.now_ms() - rec["start_ms"], 3)
+        rec.update(attrs)
+        return rec
+
+    @property
+    def depth(self) -> int:
+        return self._depth
+
+    @contextmanager
+    def span(self, name: str, depth: Optional[int] = None, **attrs):
+        saved = self._depth
+        if depth is not None:
+            self._depth = depth
+        rec = self.begin(name, **attrs)
+        self._depth += 1
+        try:
+            yield rec
+        except Exception as e:
+            rec["error"] = str(e)
+            raise
+        finally:
+            self._depth = saved
+            self.end(rec)
+
+    def merge(self, other: dict, depth: int = 0, **attrs) -> None:
+        """Fold in a worker's `to_dict()`, shifted onto this trace's clock and nested under `depth`."""
+        offset = (other["wall0"] - self.wall0) * 1000.0
+        for s in other.get("spans", []):
+            rec = dict(s)
+            rec["start_ms"] = round(s["start_ms"] + offset, 3)
+            rec["depth"] = s["depth"] + depth
+            rec.update(attrs)
+            self.spans.append(rec)
+
+    @property
+    def total_ms(self) -> float:
+        ends = [s["start_ms"] + (s["ms"] or 0.0) for s in self.spans]
+        return round(max(ends, default=0.0), 3)
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "attrs": self.attrs,
+            "wall0": self.wall0,
+            "started": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.wall0)),
+            "total_ms": self.total_ms,
+            "spans": sorted(self.spans, key=lambda s: s["start_ms"]),
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=1, default=str)
+
+_CURRENT: "contextvars.ContextVar[Optional[Trace]]" = contextvars.ContextVar("cpenn_trace", default=None)
+
+def current_trace() -> Optional[Trace]:
+    return _CURRENT.get()
+
+@contextmanager
+def tracing(trace: Optional[Trace]):
+    """Make `trace` the target of `span()` calls in this context."""
+    token = _CURRENT.set(trace)
+    try:
+        yield trace
+    finally:
+        _CURRENT.reset(token)
+
+@contextmanager
+def span(name: str, depth: Optional[int] = None, **attrs):
+    """Record a span in the active trace; yields the record (a throwaway dict when not tracing)."""
+    trace = _CURRENT.get()
+    if trace is None:
+        yield {}
+        return
+    with trace.span(name, depth=depth, **attrs) as rec:
+        yield rec
+
+WATERFALL_WIDTH = 40
+_SPAN_FIELDS = ("name", "start_ms", "ms", "depth", "error")
+
+def waterfall_rows(trace: dict, width: int = WATERFALL_WIDTH) -> List[dict]:
+    """One row per span: indented stage, start/duration, a text bar placed on the trace's timeline, attributes."""
+    total = trace.get("total_ms") or 0.0
+    scale = width / total if total > 0 else 0.0
+    rows = []
+    for s in trace.get("spans", []):
+        ms = s.get("ms") or 0.0
+        lead = int(round(s["start_ms"] * scale))
+        bar = max(1, int(round(ms * scale))) if ms > 0 else 0
+        extras = {k: v for k, v in s.items() if k not in _SPAN_FIELDS}
+        rows.append({
+            "Stage": "\u2003" * s.get("depth", 0) + ("↳ " if s.get("depth") else "") + s["name"],
+            "Start (ms)": round(s["start_ms"], 1),
+            "Duration (ms)": round(ms, 1),
+            "Timeline": "·" * lead + "█" * bar,
+            "Details": ", ".join(f"{k}={v}" for k, v in extras.items()) + (f" error={s['error']}" if s.get("error") else ""),
+        })
+    return rows
+
+def traced(name: str):
+    """Decorator: run the function inside `span(name)`, noting rows/cols when it returns a frame."""
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _CURRENT.get() is None:
+                return fn(*args, **kwargs)
+            with span(name) as rec:
+                out = fn(*args, **kwargs)
+                shape = getattr(out, "shape", None)
+                if shape is not None and len(shape) == 2:
+                    rec.update(rows=shape[0], cols=shape[1])
+            return out
+        return wrapper
+    return deco
@@ -0,0 +1,97 @@
+"""
+Slate file watcher. One polling thread stats the workbooks sessions have
+loaded; once a saved file has settled (same size and mtime on two polls) it is
+resubmitted to the background loader, where `ingest_parallel` re-parses only
+the sheets whose content digest changed. Sessions pick the reload up through
+`reloads()`; while files are idle the thread only stats them.
+"""
+
+import os
+import time
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .background import BackgroundLoader, LoadTicket, background_loader
+
+# The watcher thread has no page to write to; the reload tickets carry the load messages
+_LOG = logging.getLogger("cpenn")
+
+WATCH_POLL_SECONDS = float(os.environ.get("CPENN_WATCH_POLL", "1.0"))
+
+def _stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+        return (stat.st_size, stat.st_mtime_ns)
+    except OSError:
+        return None
+
+class SlateWatcher:
+    """Watched slates keyed by (sport, source, sheets); the latest reload ticket of each is kept for late sessions."""
+
+    def __init__(self, loader: BackgroundLoader, poll: float = WATCH_POLL_SECONDS):
+        self.loader = loader
+        self.poll = poll
+        self._lock = threading.Lock()
+        self._watched: Dict[tuple, dict] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def _ident(sport: str, job: dict) -> tuple:
+        return (sport, os.path.abspath(str(job["source"])), tuple(job.get("sheets") or ()))
+
+    def watch(self, sport: str, job: dict) -> None:
+        """Start watching a loaded slate (a no-op if it already is; the job is refreshed, e.g. for new presets)."""
+        ident = self._ident(sport, job)
+        with self._lock:
+            w = self._watched.get(ident)
+            if w is None:
+                stamp = _stamp(ident[1])
+                self._watched[ident] = {"sport": sport, "job": job, "stamp": stamp, "pending": None, "ticket": None}
+            else:
+                w["job"] = job
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._loop, name="cpenn-watch", daemon=True)
+                self._thread.start()
+
+    def reloads(self, sport: str) -> List[LoadTicket]:
+        """Latest reload ticket of every watched slate of `sport` that changed since it was first loaded."""
+        with self._lock:
+            return [w["ticket"] for ident, w in self._watched.items() if ident[0] == sport and w["ticket"] is not None]
+
+    def _check(self) -> None:
+        with self._lock:
+            watched = list(self._watched.values())
+        for w in watched:
+            path = self._ident(w["sport"], w["job"])[1]
+            stamp = _stamp(path)
+            if stamp is None or stamp == w["stamp"]:
+                w["pending"] = None
+                continue
+            if stamp != w["pending"]:
+                w["pending"] = stamp  # still being written; wait for it to settle
+                continue
+            w["stamp"], w["pending"] = stamp, None
+            _LOG.info("%s changed on disk; reloading its changed sheets", os.path.basename(path))
+            ticket = self.loader.submit(w["sport"], w["job"])
+            with self._lock:
+                w["ticket"] = ticket
+
+    def _loop(self) -> None:
+        while True:
+            time.sleep(self.poll)
+            try:
+                self._check()
+            except Exception as e:
+                _LOG.warning("Slate watcher error: %s", e)
+
+_WATCHER: Optional[SlateWatcher] = None
+_watcher_lock = threading.Lock()
+
+def slate_watcher() -> SlateWatcher:
+    """The process-wide watcher, reloading through the shared background loader."""
+    global _WATCHER
+    with _watcher_lock:
+        if _WATCHER is None:
+            _WATCHER = SlateWatcher(background_loader())
+        return _WATCHER
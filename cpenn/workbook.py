@@ -0,0 +1,194 @@
+"""Single-open workbook reader with bounded, streaming row access."""
+
+import os
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+from .schema import _norm
+from .trace import span
+
+# ----------------------------
+# WORKBOOK SESSION (one open per load)
+# ----------------------------
+def _as_sheet_list(desired) -> List[str]:
+    if isinstance(desired, str):
+        return [desired]
+    if hasattr(desired, "tolist"):
+        return list(desired.tolist())
+    if isinstance(desired, (list, tuple, set)):
+        return list(desired)
+    return [str(desired)]
+
+def _match_sheets(actual: List[str], desired) -> List[str]:
+    if desired is None:
+        return actual
+    desired_list = _as_sheet_list(desired)
+    if len(desired_list) == 0:
+        return actual
+    matched = []
+    desired_lower = [str(s).strip().lower() for s in desired_list]
+    actual_lower_map = {s.strip().lower(): s for s in actual}
+    for d_lower in desired_lower:
+        if d_lower in actual_lower_map:
+            matched.append(actual_lower_map[d_lower])
+    if not matched:
+        for d_lower in desired_lower:
+            for actual_sheet in actual:
+                if d_lower in actual_sheet.strip().lower() or actual_sheet.strip().lower() in d_lower:
+                    if actual_sheet not in matched:
+                        matched.append(actual_sheet)
+    if not matched:
+        matched = actual
+    return matched
+
+def _dedupe_headers(cols: List[str]) -> List[str]:
+    """pandas-style de-dupe: repeated names become 'X.1', 'X.2', ..., skipping names already taken."""
+    out, used, seen = [], set(), {}
+    for c in cols:
+        name = c
+        while name in used:
+            seen[c] = seen.get(c, 0) + 1
+            name = f"{c}.{seen[c]}"
+        used.add(name)
+        out.append(name)
+    return out
+
+# Consecutive rows with blank key cells that mark the real end of a sheet's data
+BLANK_RUN_LIMIT = 25
+
+_NAME_KEYS = {"driver", "player", "playername", "name"}
+
+def _is_blank(v) -> bool:
+    return v is None or (isinstance(v, str) and not v.strip())
+
+def _key_index(header_vals) -> Optional[int]:
+    """Absolute index of the first Driver/Player/Name-like header cell."""
+    for i, v in enumerate(header_vals or []):
+        if v is not None and _norm(v) in _NAME_KEYS:
+            return i
+    return None
+
+def _source_size(path_or_file) -> Optional[int]:
+    try:
+        if hasattr(path_or_file, "getbuffer"):
+            return path_or_file.getbuffer().nbytes
+        return os.path.getsize(path_or_file)
+    except (OSError, TypeError, ValueError):
+        return None
+
+class WorkbookSession:
+    """
+    Opens a workbook once (openpyxl read-only) and serves sheet names, header
+    probes and data rows from that single handle. Each sheet's XML is parsed
+    at most once per session; header probes stream only the first rows.
+    """
+
+    def __init__(self, path_or_file):
+        from openpyxl import load_workbook
+        self.name = getattr(path_or_file, "name", str(path_or_file))
+        size = _source_size(path_or_file)
+        if hasattr(path_or_file, "seek"):
+            path_or_file.seek(0)
+        with span("open workbook", bytes=size):
+            self._wb = load_workbook(path_or_file, read_only=True, data_only=True)
+        self.sheet_names: List[str] = list(self._wb.sheetnames)
+        self._rows: Dict[str, List[tuple]] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        try:
+            self._wb.close()
+        except Exception:
+            pass
+
+    def resolve(self, desired) -> List[str]:
+        return _match_sheets(self.sheet_names, desired)
+
+    def head(self, sheet: str, n: int = 10) -> List[tuple]:
+        """First `n` rows of a sheet; streamed unless the sheet is already parsed."""
+        if sheet in self._rows:
+            return self._rows[sheet][:n]
+        ws = self._wb[sheet]
+        return [tuple(r) for r in ws.iter_rows(min_row=1, max_row=n, values_only=True)]
+
+    def iter_bounded(self, sheet: str, start_row: int = 1,
+                     usecols: Optional[List[int]] = None,
+                     key_cols: Optional[List[int]] = None,
+                     max_blank_run: int = BLANK_RUN_LIMIT):
+        """
+        Stream rows from `start_row` (1-based), yielding only `usecols`, and stop
+        once `max_blank_run` consecutive rows have blank key cells (all cells when
+        `key_cols` is None). Interior blank rows are kept, trailing ones dropped.
+        """
+        ws = self._wb[sheet]
+        pending, run = [], 0
+        for r in ws.iter_rows(min_row=start_row, values_only=True):
+            picked = tuple(r) if usecols is None else tuple(r[i] if i < len(r) else None for i in usecols)
+            keys = picked if key_cols is None else [r[i] if i < len(r) else None for i in key_cols]
+            if all(_is_blank(v) for v in keys):
+                run += 1
+                if run >= max_blank_run:
+                    break
+                pending.append(picked)
+                continue
+            if pending:
+                yield from pending
+                pending = []
+            run = 0
+            yield picked
+
+    def rows(self, sheet: str) -> List[tuple]:
+        """All rows up to the real end of data, parsed once and kept."""
+        if sheet not in self._rows:
+            self._rows[sheet] = list(self.iter_bounded(sheet))
+        return self._rows[sheet]
+
+    def frame(self, sheet: str, header: Optional[int] = 0,
+              usecols: Optional[List[int]] = None,
+              key_col: Optional[int] = None,
+              max_blank_run: int = BLANK_RUN_LIMIT) -> pd.DataFrame:
+        """
+        DataFrame equivalent of pd.read_excel(sheet_name=sheet, header=header, usecols=usecols),
+        bounded at the real end of data. With `key_col` (absolute column index) the
+        read stops after a run of blank key cells, e.g. an empty Driver/Player column.
+        """
+        with span("read rows", sheet=sheet) as rec:
+            df = self._frame(sheet, header, usecols, key_col, max_blank_run)
+            rec.update(rows=len(df), cols=df.shape[1])
+        return df
+
+    def _frame(self, sheet: str, header: Optional[int], usecols: Optional[List[int]],
+               key_col: Optional[int], max_blank_run: int) -> pd.DataFrame:
+        if header is None:
+            rows = self.rows(sheet)
+            width = max((len(r) for r in rows), default=0)
+            idx = list(usecols) if usecols is not None else list(range(width))
+            data = [[r[i] if i < len(r) else None for i in idx] for r in rows]
+            return pd.DataFrame(data, columns=range(len(idx))).infer_objects()
+
+        probe = self.head(sheet, header + 1)
+        if header >= len(probe):
+            return pd.DataFrame()
+        head = probe[header]
+        idx = list(usecols) if usecols is not None else list(range(len(head)))
+        cols = _dedupe_headers([
+            f"Unnamed: {i}" if _is_blank(head[i] if i < len(head) else None)
+            else (head[i] if isinstance(head[i], str) else str(head[i]))
+            for i in idx
+        ])
+        if sheet in self._rows and key_col is None:
+            data = [[r[i] if i < len(r) else None for i in idx] for r in self._rows[sheet][header + 1:]]
+        else:
+            data = list(self.iter_bounded(
+                sheet, start_row=header + 2, usecols=idx,
+                key_cols=None if key_col is None else [key_col],
+                max_blank_run=max_blank_run,
+            ))
+        return pd.DataFrame(data, columns=cols).infer_objects()
+
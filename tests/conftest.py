@@ -0,0 +1,15 @@
+import pytest
+
+from cpenn import cache
+from cpenn.synth import synth_slates
+
+@pytest.fixture(scope="session")
+def slates(tmp_path_factory):
+    """Small synthetic NFL / NASCAR / MLB workbooks, built once per run."""
+    return synth_slates(tmp_path_factory.mktemp("slates"), rows=40, seed=1)
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """A private, empty sheet cache for the test."""
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    return cache.CACHE_DIR
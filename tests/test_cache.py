@@ -0,0 +1,41 @@
+import multiprocessing as mp
+
+import pandas as pd
+
+from cpenn import cache
+
+def _fp(name):
+    return {"path": f"/slates/{name}.xlsx", "size": 1, "mtime": 0, "digest": name}
+
+def _put_many(cache_dir, worker, n):
+    cache.CACHE_DIR = cache_dir
+    for i in range(n):
+        fp = _fp(f"w{worker}-{i}")
+        cache._cache_put(cache._cache_key(fp, "NFL", None), {"Data": pd.DataFrame({"a": [i]})}, fp, "NFL")
+
+def test_put_and_get_roundtrip(cache_dir):
+    fp = _fp("one")
+    key = cache._cache_key(fp, "NFL", None)
+    frame = pd.DataFrame({"Player Name": ["A", "B"], "DK Proj": [1.5, 2.0]})
+    assert cache._cache_put(key, {"Projections": frame}, fp, "NFL") > 0
+    hit = cache.cached_sheets(fp, "NFL", None)
+    pd.testing.assert_frame_equal(hit["Projections"], frame)
+    assert cache.cache_stats()["entries"] == 1
+
+def test_concurrent_writers_keep_every_entry(cache_dir):
+    procs = [mp.Process(target=_put_many, args=(cache_dir, w, 10)) for w in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(60)
+    assert all(p.exitcode == 0 for p in procs)
+    entries = cache._read_cache_index()["entries"]
+    assert len(entries) == 40
+    assert all((cache_dir / key / "meta.json").exists() for key in entries)
+
+def test_clear_keeps_lock_file(cache_dir):
+    fp = _fp("gone")
+    cache._cache_put(cache._cache_key(fp, "NFL", None), {"Data": pd.DataFrame({"a": [1]})}, fp, "NFL")
+    assert cache.clear_sheet_cache() > 0
+    assert [p.name for p in cache_dir.iterdir()] == ["index.lock"]
+    assert cache.cached_sheets(fp, "NFL", None) is None
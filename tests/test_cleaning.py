@@ -0,0 +1,44 @@
+import pandas as pd
+from openpyxl import Workbook
+
+from cpenn.cleaning import _read_mlb_sheet, clean_columns_nascar
+from cpenn.workbook import WorkbookSession
+
+def test_read_mlb_sheet_from_synth(slates):
+    with WorkbookSession(slates["MLB"]) as book:
+        batters = _read_mlb_sheet(book, "Batter Projections")
+        stacks = _read_mlb_sheet(book, "Top Stacks")
+    assert len(batters) == 40
+    assert {"Player", "BO", "DK Sal", "DK Proj"} <= set(batters.columns)
+    assert batters["Player"].notna().all()
+    assert pd.api.types.is_numeric_dtype(batters["DK Sal"])
+    assert not batters.columns.duplicated().any()
+    assert stacks.attrs["schema"]["kind"] == "mlb_stacks"
+
+def test_read_mlb_sheet_dedupes_repeated_labels(tmp_path):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Bullpen"
+    ws.append(["MLB Main Slate"])
+    ws.append(["Player", "Team", "DK Sal", "DK Proj", "H", "H", "Notes"])
+    ws.append(["A", "NYY", 5000, 8.5, 1.1, 0.9, None])
+    ws.append(["B", "BOS", 4200, 7.0, 0.8, 1.3, None])
+    for _ in range(30):
+        ws.append([None, None, None, None, 0, 0, None])
+    wb.save(tmp_path / "mlb.xlsx")
+    with WorkbookSession(tmp_path / "mlb.xlsx") as book:
+        df = _read_mlb_sheet(book, "Bullpen")
+    # an empty column gives up its label; a repeated one is kept as H.1, like read_excel
+    assert df.columns.tolist() == ["Player", "Team", "DK Sal", "DK Proj", "H", "H.1"]
+    assert df["H.1"].tolist() == [0.9, 1.3]
+
+def test_nascar_fallback_keeps_one_column_per_label():
+    raw = pd.DataFrame([
+        ["Cup Series", None, None, None, None],
+        ["Driver", "Start", "Qual", "DK Salary", "DK Proj"],
+        ["A", 3, 4, "$9,000", 50.5],
+        ["B", 10, 9, 7600, 41.0],
+    ])
+    df = clean_columns_nascar(raw, "Projections")
+    assert df.columns.tolist() == ["Driver", "Start Pos", "Start Pos.1", "DK Sal", "DK Proj"]
+    assert df["DK Sal"].tolist() == [9000, 7600]
@@ -0,0 +1,53 @@
+import io
+
+import pandas as pd
+import pytest
+
+from cpenn import csvread
+from cpenn.csvread import read_csv_typed, sniff_csv
+
+_CSV = """DraftKings Week 1 export
+generated 2026-09-07,,,,
+Player Name,Pos,Team,DK Sal,DK Proj,DK pOWN%
+Joe Burrow,QB,CIN,"$7,000",21.4,12.5%
+Ja'Marr Chase,WR,CIN,8200,19.9,30%
+D.J. Moore,WR,CHI,"$5,000",,4%
+"""
+
+@pytest.fixture(params=["c", "pyarrow"])
+def engine(request, monkeypatch):
+    if request.param == "pyarrow":
+        pytest.importorskip("pyarrow")
+    monkeypatch.setattr(csvread, "CSV_ENGINE", request.param)
+    return request.param
+
+def _upload(text, name="export.csv"):
+    buf = io.BytesIO(text.encode("utf-8"))
+    buf.name = name
+    return buf
+
+def test_sniff_skips_preamble():
+    info = sniff_csv(_upload(_CSV), "NFL")
+    assert info["row"] == 2
+    assert {"Player Name", "Pos", "Team"} <= info["text"]
+    assert {"DK Sal", "DK Proj", "DK pOWN%"} <= info["numeric"]
+
+def test_reads_money_text_and_percent_strings(engine):
+    df = read_csv_typed(_upload(_CSV), "NFL")
+    assert df["Player Name"].tolist() == ["Joe Burrow", "Ja'Marr Chase", "D.J. Moore"]
+    assert df["DK Sal"].tolist() == [7000, 8200, 5000]
+    assert df["DK Proj"].isna().tolist() == [False, False, True]
+    assert df["DK pOWN%"].tolist() == [12.5, 30.0, 4.0]
+    assert df.attrs["schema"]["percent_scale"] == {"DK pOWN%": 100}
+
+def test_chunked_read_reports_progress(tmp_path, engine, monkeypatch):
+    rows = "".join(f"Player {i},RB,KC,{4000 + i},{i / 10},{i / 1000}\n" for i in range(250))
+    path = tmp_path / "big.csv"
+    path.write_text("Player Name,Pos,Team,DK Sal,DK Proj,DK pOWN%\n" + rows)
+    monkeypatch.setattr(csvread, "CSV_CHUNK_ROWS", 60)
+    seen = []
+    df = read_csv_typed(path, "NFL", on_progress=lambda frac, what: seen.append(frac))
+    assert len(df) == 250 and df["DK Sal"].iloc[-1] == 4249
+    assert pd.api.types.is_numeric_dtype(df["DK pOWN%"])
+    assert df.attrs["schema"]["percent_scale"] == {"DK pOWN%": 1}
+    assert seen and seen == sorted(seen)
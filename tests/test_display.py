@@ -0,0 +1,40 @@
+import pandas as pd
+
+from cpenn.display import display_class, display_frame
+from cpenn.loading import load_data_for_sport
+from cpenn.schema import type_frame
+
+def test_display_classes():
+    assert display_class("DK Sal", True) == "money"
+    assert display_class("Win", True) == "int"
+    assert display_class("DK pOWN%", True) == "percent"
+    assert display_class("AVG", True) == "dec3"
+    assert display_class("DK Proj", True) == "dec1"
+    assert display_class("Driver", False) == "text"
+
+def test_odds_and_salaries_display_as_ints(slates):
+    betting = load_data_for_sport("NASCAR", slates["NASCAR"])["Betting Dashboard"]
+    out, specs = display_frame(betting)
+    for col in ("Win", "T3", "T5", "T10"):
+        assert str(out[col].dtype) == "Int64"
+        assert specs[col]["format"] == "%d"
+    assert out["Driver"].equals(betting["Driver"])
+
+def test_percent_is_scaled_once():
+    typed = type_frame(pd.DataFrame({
+        "Player Name": ["A", "B"],
+        "DK pOWN%": ["12.5%", "3%"],
+        "FD pOWN%": [0.125, 0.03],
+        "DK Sal": ["$5,000", None],
+    }), "NFL", "Projections")
+    out, specs = display_frame(typed)
+    assert out["DK pOWN%"].tolist() == [12.5, 3.0]
+    assert out["FD pOWN%"].tolist() == [12.5, 3.0]
+    assert out["DK Sal"].tolist() == [5000, 0]
+    assert specs["DK pOWN%"]["format"] == "%.1f%%"
+
+def test_display_frame_keeps_duplicate_labels():
+    df = pd.DataFrame([[1.04, 2.26]], columns=["H", "H"])
+    out, _ = display_frame(df)
+    assert out.columns.tolist() == ["H", "H"]
+    assert out.iloc[0].tolist() == [1.0, 2.3]
@@ -0,0 +1,27 @@
+import pytest
+
+from cpenn.headers import detect_header, find_header
+from cpenn.workbook import WorkbookSession
+
+@pytest.mark.parametrize("sport, sheet, row, canon", [
+    ("NFL", "Projections", 0, {"Player", "DK Sal", "DK Proj", "DK pOWN%"}),
+    ("NFL", "Stacks", 0, {"Team", "QB", "WR1"}),
+    ("NASCAR", "Projections", 1, {"Driver", "DK Sal", "DK Proj", "DK Opt%"}),
+    ("NASCAR", "Betting Dashboard", 1, {"Driver", "Proj Fin", "T10"}),
+    ("MLB", "Pitcher Projections", 1, {"Player", "DK Sal", "DK Proj"}),
+    ("MLB", "Batter Projections", 1, {"Player", "BO", "DK Sal"}),
+])
+def test_detects_synth_headers(slates, sport, sheet, row, canon):
+    with WorkbookSession(slates[sport]) as book:
+        match = find_header(book, sheet, sport)
+    assert match.row == row
+    assert not match.low
+    assert canon <= set(match.columns)
+
+def test_unrecognized_rows_keep_row_zero():
+    match = detect_header([["a", "b"], ["c", "d"]], "NFL")
+    assert match.row == 0 and match.low and match.columns == {}
+
+def test_numbers_are_never_labels():
+    rows = [["Week 1 Main Slate"], [1, 2, 3, 4], ["Player", "Pos", "DK Sal", "DK Proj"]]
+    assert detect_header(rows, "NFL").row == 2
@@ -0,0 +1,54 @@
+import zipfile
+
+import pandas as pd
+
+from cpenn.loading import ingest_parallel, sheet_digests
+
+def _write_slate(path, names):
+    """A two-sheet NFL slate saved with a shared-string table, as Excel saves it."""
+    proj = pd.DataFrame({
+        "Player Name": names, "Pos": ["QB", "RB", "WR", "TE"], "Team": ["KC", "PHI", "DAL", "NYG"],
+        "DK Sal": [7000, 6000, 5000, 4000], "DK Proj": [20.5, 15.0, 12.25, 8.0],
+    })
+    stacks = pd.DataFrame({"Team": ["KC", "PHI"], "QB": ["QB A", "QB B"], "WR1": ["WR A", "WR B"], "Total": [48.5, 44.0]})
+    with pd.ExcelWriter(path, engine="xlsxwriter") as xw:
+        proj.to_excel(xw, sheet_name="Projections", index=False)
+        stacks.to_excel(xw, sheet_name="Stacks", index=False)
+    return path
+
+def _stacks_crc(path):
+    with zipfile.ZipFile(path) as zf:
+        return zf.getinfo("xl/worksheets/sheet2.xml").CRC
+
+_NAMES = ["Player A", "Player B", "Player C", "Player D"]
+# one string fewer on Projections renumbers every shared-string index Stacks points at
+_EDITED = ["Aaron New", "Aaron New", "Player C", "Player D"]
+
+def test_digests_survive_edits_to_other_sheets(tmp_path):
+    path = _write_slate(tmp_path / "nfl.xlsx", _NAMES)
+    before = sheet_digests(path)
+    stacks_crc = _stacks_crc(path)
+    _write_slate(path, _EDITED)
+    with zipfile.ZipFile(path) as zf:
+        assert "xl/sharedStrings.xml" in zf.namelist()
+    after = sheet_digests(path)
+    assert _stacks_crc(tmp_path / "nfl.xlsx") != stacks_crc
+    assert set(before) == {"Projections", "Stacks"}
+    assert after["Stacks"] == before["Stacks"]
+    assert after["Projections"] != before["Projections"]
+
+def test_resave_reuses_unchanged_sheets(tmp_path, cache_dir):
+    path = _write_slate(tmp_path / "nfl.xlsx", _NAMES)
+    first = ingest_parallel("NFL", [{"label": "nfl", "source": path}])["nfl"]
+    assert first["status"] == "ok" and not first["cached"]
+
+    _write_slate(path, _EDITED)
+    second = ingest_parallel("NFL", [{"label": "nfl", "source": path}])["nfl"]
+    assert second["status"] == "ok" and not second["cached"]
+    assert second["reused"] == ["Stacks"]
+    assert set(second["sheets"]) == {"Projections", "Stacks"}
+
+def test_digests_empty_for_non_zip(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("a,b\n1,2\n")
+    assert sheet_digests(path) == {}
@@ -0,0 +1,33 @@
+import pandas as pd
+
+from cpenn.schema import is_percent_col, percent_scale, type_frame
+
+def test_type_frame_parses_money_and_percent_strings():
+    df = pd.DataFrame({
+        "Player Name": ["A", "B", "C"],
+        "DK Sal": ["$5,000", 6200, "$7,400"],
+        "DK Proj": ["12.5", 9.0, None],
+        "DK pOWN%": ["12.5%", "3%", "40%"],
+    })
+    out = type_frame(df, "NFL", "Projections")
+    assert out["DK Sal"].tolist() == [5000, 6200, 7400]
+    assert out["DK Proj"].dtype == "float64"
+    assert out["DK pOWN%"].tolist() == [12.5, 3.0, 40.0]
+    assert out.attrs["schema"]["percent_scale"] == {"DK pOWN%": 100}
+
+def test_type_frame_records_fraction_percents():
+    out = type_frame(pd.DataFrame({"DK pOWN%": [0.125, 0.03, None]}), "NFL", "Projections")
+    assert percent_scale(out, "DK pOWN%") == 1
+
+def test_type_frame_keeps_mixed_columns_as_text():
+    out = type_frame(pd.DataFrame({"Notes": ["1", "late swap", None], "Extra": ["1", "2", ""]}), "NFL", "Projections")
+    assert out["Notes"].tolist()[:2] == ["1", "late swap"]
+    assert pd.api.types.is_numeric_dtype(out["Extra"])
+
+def test_percent_scale_guessed_for_untyped_frames():
+    assert percent_scale(pd.DataFrame({"Own%": [0.2, 0.5]}), "Own%") == 1
+    assert percent_scale(pd.DataFrame({"Own%": [20.0, 50.0]}), "Own%") == 100
+
+def test_percent_markers_match_whole_words():
+    assert is_percent_col("DK Own") and is_percent_col("Lev") and is_percent_col("T3%")
+    assert not is_percent_col("Town") and not is_percent_col("Level") and not is_percent_col("Owner")
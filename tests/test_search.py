@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+from cpenn.search import NameIndex, filter_engine
+
+_NAMES = pd.Series(["D.J. Moore", "DJ Chark", "Ja'Marr Chase", "Joe Burrow", "D.J. Moore"])
+
+def test_find_folds_punctuation_and_case():
+    idx = NameIndex()
+    idx.add(_NAMES, tag="nfl")
+    hits = idx.find("dj moore")
+    assert [(n, t) for n, t, _ in hits] == [("D.J. Moore", "nfl")]
+    assert hits[0][2].tolist() == [0, 4]
+    assert {n for n, _, _ in idx.find("jamarr")} == {"Ja'Marr Chase"}
+
+def test_short_queries_match_word_prefixes():
+    idx = NameIndex()
+    idx.add(_NAMES, tag="nfl")
+    assert {n for n, _, _ in idx.find("ch")} == {"DJ Chark", "Ja'Marr Chase"}
+    assert idx.rows("jo", tag="nfl").tolist() == [3]
+
+def test_rows_are_per_tag():
+    idx = NameIndex()
+    idx.add(_NAMES, tag="a")
+    idx.add(pd.Series(["Joe Burrow"]), tag="b")
+    assert idx.rows("burrow", tag="a").tolist() == [3]
+    assert idx.rows("burrow", tag="b").tolist() == [0]
+
+def test_remove_forgets_names_without_locations():
+    idx = NameIndex()
+    for week in range(20):
+        idx.remove(lambda tag: True)
+        idx.add(pd.Series([f"Player {week}", "Joe Burrow"]), tag=week)
+    assert len(idx) == 2
+    assert idx.find("player 3") == []
+    assert [(n, t) for n, t, _ in idx.find("player 19")] == [("Player 19", 19)]
+    assert len(idx._keys) == 2
+
+def test_combine_ands_cached_masks():
+    df = pd.DataFrame({
+        "Player Name": ["D.J. Moore", "Joe Burrow", "Ja'Marr Chase", "Tee Higgins"],
+        "Team": ["CHI", "CIN", "CIN", "CIN"],
+        "DK Sal": [6000.0, 7000.0, 8200.0, np.nan],
+    })
+    eng = filter_engine(df)
+    assert eng.combine([]) is None
+    specs = [("equals", "Team", "CIN"), ("range", "DK Sal", (6500.0, 9000.0))]
+    assert eng.combine(specs).tolist() == [False, True, True, False]
+    assert eng.combine(specs + [("contains", "Player Name", "chase")]).tolist() == [False, False, True, False]
+    assert eng.mask("equals", "Team", "CIN") is eng.mask("equals", "Team", "CIN")
+    assert filter_engine(df) is eng
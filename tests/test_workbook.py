@@ -0,0 +1,35 @@
+from openpyxl import Workbook
+
+from cpenn.workbook import WorkbookSession, _dedupe_headers
+
+def _write(path, rows):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Data"
+    for r in rows:
+        ws.append(r)
+    wb.save(path)
+    return path
+
+def test_iter_bounded_stops_at_blank_run(tmp_path):
+    rows = [["Player", "DK Proj", "Calc"], ["A", 1.0, 0], [None, None, 0], ["B", 2.0, 0]]
+    rows += [[None, None, 0]] * 40 + [["Stray", 9.0, 0]]
+    with WorkbookSession(_write(tmp_path / "wb.xlsx", rows)) as book:
+        got = list(book.iter_bounded("Data", start_row=2, key_cols=[0], max_blank_run=25))
+    # the interior blank row stays, the trailing formula rows and the stray row past them do not
+    assert [r[0] for r in got] == ["A", None, "B"]
+
+def test_iter_bounded_without_key_cols_needs_all_blank(tmp_path):
+    rows = [["Player", "Calc"], ["A", 0]] + [[None, 0]] * 30
+    with WorkbookSession(_write(tmp_path / "wb.xlsx", rows)) as book:
+        assert len(list(book.iter_bounded("Data", max_blank_run=5))) == 32
+
+def test_synth_sheets_end_at_the_data(slates):
+    with WorkbookSession(slates["NFL"]) as book:
+        df = book.frame("Projections", header=0, key_col=0)
+    assert len(df) == 40
+    assert df["Player"].notna().all()
+
+def test_dedupe_headers_skips_taken_names():
+    assert _dedupe_headers(["X", "X.1", "X"]) == ["X", "X.1", "X.2"]
+    assert _dedupe_headers(["H", "H", "H"]) == ["H", "H.1", "H.2"]